@@ -0,0 +1,90 @@
+"""
+Binary heap vs hierarchical timing wheel for the BLOCKED queue.
+
+Drives both structures with the access pattern of an I/O-heavy run:
+the clock advances one dispatch at a time, every dispatch blocks a
+process for a short, clustered wait, and due processes are released
+each step. Also times fcfs_view end to end with each option.
+
+    python benchmarks/bench_blocked_queue.py [--events 500000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.blocked_queue import BLOCKED_QUEUES  # noqa: E402
+
+
+def waits(n, seed):
+    # Most waits are short and land on a few popular values.
+    rng = random.Random(seed)
+    clusters = [2, 3, 5, 8, 13]
+    return [rng.choice(clusters) if rng.random() < 0.9 else rng.randint(1, 5000)
+            for _ in range(n)]
+
+
+def drive(kind, delays, live):
+    q = BLOCKED_QUEUES[kind]()
+    for p in range(live):
+        q.push(delays[p], p)
+
+    released = 0
+    now = 0
+    start = time.perf_counter()
+    for d in delays[live:]:
+        now += 1
+        for p in q.pop_due(now):
+            released += 1
+        q.push(now + d, released)
+    elapsed = time.perf_counter() - start
+    return elapsed, released
+
+
+def engine(kind, processes):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "osscheduler.settings_api")
+    import django
+    django.setup()
+    from django.test import RequestFactory
+    from osscheduler.views import fcfs_view
+
+    body = json.dumps({"processes": processes, "blocked_queue": kind})
+    request = RequestFactory().post("/api/fcfs/", body, content_type="application/json")
+    start = time.perf_counter()
+    fcfs_view(request)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--live", type=int, default=10_000)
+    parser.add_argument("--processes", type=int, default=5_000)
+    args = parser.parse_args()
+
+    delays = waits(args.events, seed=1)
+    print(f"queue ops: {args.events} pushes, {args.live} blocked at any time")
+    for kind in BLOCKED_QUEUES:
+        elapsed, released = drive(kind, delays, args.live)
+        print(f"  {kind:<6} {elapsed * 1000:9.1f} ms  "
+              f"{elapsed / args.events * 1e9:7.0f} ns/event  ({released} released)")
+
+    rng = random.Random(2)
+    processes = [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, args.processes),
+        "bursts": [v for _ in range(5) for v in (rng.randint(1, 4), rng.choice([2, 3, 5, 8]))] + [1],
+    } for i in range(args.processes)]
+
+    print(f"fcfs_view: {args.processes} processes, 6 CPU / 5 I/O bursts each")
+    for kind in BLOCKED_QUEUES:
+        print(f"  {kind:<6} {engine(kind, processes) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+CFS engine on large thread counts: wall time and slices dispatched.
+First posts a small table to /api/cfs/ and checks the response, vruntime
+traces included.
+
+    python benchmarks/bench_cfs.py [--processes 100000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.cfs import run_cfs  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def check_view():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "osscheduler.settings_api")
+    import django
+    from django.test import Client
+
+    django.setup()
+    body = json.dumps({"processes": [
+        {"pid": "P1", "arrival": 0, "bursts": [4, 3, 2]},
+        {"pid": "P2", "arrival": 1, "bursts": [5], "nice": 2},
+    ]})
+    response = Client().post("/api/cfs/", body, content_type="application/json")
+    assert response.status_code == 200, response.content
+    assert response.json()["vruntime"], "no vruntime traces"
+    print("/api/cfs/ ok")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    check_view()
+    rng = random.Random(0)
+    n = args.processes
+    workloads = {
+        "staggered": [{
+            "pid": f"P{i}",
+            "arrival": rng.randint(0, n),
+            "bursts": [rng.randint(1, 20)],
+            "nice": rng.randint(-5, 5),
+        } for i in range(n)],
+        "all at 0": [{
+            "pid": f"P{i}",
+            "arrival": 0,
+            "bursts": [rng.randint(1, 20)],
+        } for i in range(n)],
+        "with I/O": [{
+            "pid": f"P{i}",
+            "arrival": rng.randint(0, n),
+            "bursts": [rng.randint(1, 8), rng.randint(1, 30), rng.randint(1, 8)],
+        } for i in range(n)],
+    }
+
+    print(f"{n} threads")
+    for name, processes in workloads.items():
+        (gantt, _, _, total_time), ms = timed(run_cfs, processes)
+        cpu = sum(sum(p["bursts"][::2]) for p in processes)
+        print(f"  {name:<10} {ms:9.1f} ms   {len(gantt):8} slices for {cpu} CPU units   "
+              f"({ms * 1000 / len(gantt):.1f} us/slice)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compressed runs on repetitive workloads: K distinct profiles, each
+repeated C times. The plain engine scales with K * C processes, the
+class engine with K classes and the batches they are dispatched in,
+plus one queue operation per I/O burst of a member. Both times include
+building the process table.
+
+    python benchmarks/bench_classes.py [--profiles 10 100] [--copies 100 1000 10000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.classes import run_classes, summarize_classes  # noqa: E402
+from osscheduler.engine import run_nonpreemptive, summarize  # noqa: E402
+from osscheduler.process_table import ProcessTable  # noqa: E402
+
+
+def workload(profiles, copies, io=0.3, seed=0):
+    rng = random.Random(seed)
+    processes = []
+    for k in range(profiles):
+        arrival = rng.randint(0, 1000)
+        bursts = [rng.randint(1, 20)]
+        if rng.random() < io:
+            bursts += [rng.randint(1, 50), rng.randint(1, 20)]
+        priority = rng.randint(0, 5)
+        for _ in range(copies):
+            processes.append({"pid": f"P{len(processes) + 1}", "arrival": arrival,
+                              "bursts": bursts, "priority": priority})
+    return processes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--copies", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--policy", default="sjf")
+    parser.add_argument("--io", type=float, default=0.3, help="share of profiles doing I/O")
+    args = parser.parse_args()
+
+    for profiles in args.profiles:
+        for copies in args.copies:
+            processes = workload(profiles, copies, args.io)
+            plain, plain_ms = timed(lambda: summarize(
+                *run_nonpreemptive(ProcessTable(processes), 0, args.policy)))
+            packed, packed_ms = timed(lambda: summarize_classes(
+                *run_classes(ProcessTable(processes), 0, args.policy)))
+            print(f"{profiles:>4} profiles x {copies:>6}   plain {plain_ms:9.1f} ms   "
+                  f"compressed {packed_ms:8.1f} ms   {plain_ms / packed_ms:6.1f}x   "
+                  f"wt {plain['average']['wt']:.2f} / {packed['average']['wt']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Unlimited parallel I/O vs finite devices (FIFO and SSTF) on workloads
+with many I/O bursts.
+
+    python benchmarks/bench_devices.py [--processes 200000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import run_nonpreemptive, summarize  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=200_000)
+    parser.add_argument("--io-rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    processes = []
+    for i in range(n):
+        bursts = [rng.randint(1, 2)]
+        for _ in range(args.io_rounds):
+            bursts += [rng.randint(4, 20), rng.randint(1, 2)]
+        processes.append({
+            "pid": f"P{i}",
+            "arrival": rng.randint(0, 3 * n),
+            "bursts": bursts,
+            "device": rng.choice(["disk0", "disk1", "nvme"]),
+            "track": rng.randint(0, 1023),
+        })
+
+    configs = {
+        "unlimited": None,
+        "fifo": [
+            {"name": "disk0", "capacity": 1},
+            {"name": "disk1", "capacity": 1},
+            {"name": "nvme", "capacity": 4},
+        ],
+        "sstf": [
+            {"name": "disk0", "capacity": 1, "discipline": "sstf"},
+            {"name": "disk1", "capacity": 1, "discipline": "sstf"},
+            {"name": "nvme", "capacity": 4, "discipline": "sstf"},
+        ],
+    }
+
+    print(f"{n} processes, {n * args.io_rounds} I/O bursts")
+    for name, devices in configs.items():
+        run, ms = timed(run_nonpreemptive, processes, 0, "fcfs", "heap", devices)
+        result = summarize(*run)
+        line = (f"  {name:<10} {ms:9.1f} ms   total_time {result['system']['total_time']:>9}   "
+                f"throughput {result['system']['throughput']:.4f}")
+        for d in result.get("devices", []):
+            line += f"   {d['name']} util {d['utilization']:.2f} q {d['avg_queue']:.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
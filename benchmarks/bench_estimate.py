@@ -0,0 +1,52 @@
+"""
+Analytic estimates against simulated runs: the estimate should take a
+few milliseconds at any size and land near the simulated averages, for
+a stable and an overloaded CPU.
+
+    python benchmarks/bench_estimate.py [--processes 10000 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import simulate  # noqa: E402
+from osscheduler.estimate import POLICIES, deviation, estimate  # noqa: E402
+from osscheduler.workload import synthesize  # noqa: E402
+
+
+SPEC = {
+    "cpu_burst": {"dist": "exponential", "mean": 5},
+    "priority_mix": {"0": 0.3, "1": 0.7},
+}
+
+RATES = (0.12, 0.3)             # utilisation about 0.6 and 1.5
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.processes:
+        for rate in RATES:
+            generate = {**SPEC, "arrival_rate": rate, "processes": n, "seed": 1}
+            print(f"{n} processes, arrival rate {rate}")
+            for policy in POLICIES:
+                table = synthesize(generate)
+                start = time.perf_counter()
+                guess = estimate(policy, table)
+                estimate_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                run = simulate(policy, table, metrics=True)
+                simulate_ms = (time.perf_counter() - start) * 1000
+                wt = deviation(guess, run)["wt"]
+                print(f"  {policy:<9} {guess['model']:<6} {estimate_ms:7.1f} ms vs {simulate_ms:8.1f} ms   "
+                      f"wt {guess['average']['wt']:10.2f} vs {run['average']['wt']:10.2f}   "
+                      f"({wt['relative']:+.1%}, within bounds: {wt['within_bounds']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Vectorised no-I/O fast path vs the general event loop.
+
+    python benchmarks/bench_fastpath.py [--processes 1000000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from osscheduler.engine import run_nonpreemptive, summarize  # noqa: E402
+from osscheduler.fastpath import try_fast_path  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def schedule_only(processes):
+    # The closed form without building the response lists
+    arrival = np.array([p["arrival"] for p in processes])
+    bursts = np.array([b for (b,) in (p["bursts"] for p in processes)])
+    order = np.argsort(arrival, kind="stable")
+    arrival, bursts = arrival[order], bursts[order]
+    offset = np.zeros(len(order), dtype=np.int64)
+    np.cumsum(bursts[:-1], out=offset[1:])
+    return np.maximum.accumulate(np.maximum(arrival - offset, 0)) + offset
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=1_000_000)
+    parser.add_argument("--skip-general", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    workloads = {
+        "fcfs": [{"pid": f"P{i}", "arrival": rng.randint(0, n), "bursts": [rng.randint(1, 5)]}
+                 for i in range(n)],
+        "sjf": [{"pid": f"P{i}", "arrival": 0, "bursts": [rng.randint(1, 50)]}
+                for i in range(n)],
+    }
+
+    print(f"{n} processes, single CPU burst")
+    for policy, processes in workloads.items():
+        _, core_ms = timed(schedule_only, processes)
+        fast, fast_ms = timed(try_fast_path, processes, 0, policy)
+        line = f"  {policy:<5} schedule {core_ms:8.1f} ms   fast path {fast_ms:8.1f} ms"
+        if not args.skip_general:
+            general, general_ms = timed(
+                lambda: summarize(*run_nonpreemptive(processes, 0, policy))
+            )
+            line += f"   general {general_ms:8.1f} ms   match={fast == general}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
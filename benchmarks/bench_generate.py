@@ -0,0 +1,62 @@
+"""
+Uploading a process table vs generating it on the server.
+
+"upload" is what a request with "processes" costs before scheduling:
+parse the JSON body and build the ProcessTable. "generate" is the same
+table from a "generate" spec of a few bytes.
+
+    python benchmarks/bench_generate.py [--processes 1000000] [--io-ratio 0.3]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.process_table import ProcessTable  # noqa: E402
+from osscheduler.workload import synthesize  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=1_000_000)
+    parser.add_argument("--io-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = {"processes": args.processes, "seed": args.seed,
+            "io_ratio": args.io_ratio, "io_rounds": 2}
+    table = synthesize(spec)
+    body = json.dumps({"processes": [{
+        "pid": table.pid[h],
+        "arrival": table.arrival[h],
+        "priority": table.priority[h],
+        "bursts": table.bursts[table.cursor[h]:table.burst_end[h]].tolist(),
+    } for h in range(table.n)]})
+    spec_body = json.dumps({"generate": spec})
+
+    def upload():
+        return ProcessTable(json.loads(body)["processes"])
+
+    def generate():
+        return synthesize(json.loads(spec_body)["generate"])
+
+    _, upload_ms = timed(upload)
+    _, generate_ms = timed(generate)
+
+    print(f"{args.processes} processes, io_ratio {args.io_ratio}")
+    print(f"{'':<10}{'body bytes':>14}{'ms':>10}")
+    print(f"{'upload':<10}{len(body):>14}{upload_ms:>10.1f}")
+    print(f"{'generate':<10}{len(spec_body):>14}{generate_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Preemptive READY queue: heapq with a re-push every tick vs the indexed
+heap updating the running process in place.
+
+    python benchmarks/bench_indexed_heap.py [--processes 2000]
+"""
+import argparse
+import heapq
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import run_preemptive  # noqa: E402
+from osscheduler.indexed_heap import IndexedHeap  # noqa: E402
+
+
+def churn_heapq(remaining):
+    # The old loop: pop the top, run one tick, push it back with a new tie
+    ready = [(r, h, h) for h, r in enumerate(remaining)]
+    heapq.heapify(ready)
+    tie = len(remaining)
+    entries = len(ready)
+    while ready:
+        r, _, h = heapq.heappop(ready)
+        if r > 1:
+            heapq.heappush(ready, (r - 1, tie, h))
+            tie += 1
+            entries += 1
+    return entries
+
+
+def churn_indexed(remaining):
+    ready = IndexedHeap(len(remaining))
+    for h, r in enumerate(remaining):
+        ready.push(h, (r, h))
+    tie = len(remaining)
+    entries = len(ready)
+    while ready:
+        h = ready.peek()
+        r = ready.peek_key()[0]
+        if r > 1:
+            ready.decrease_key(h, (r - 1, tie))
+            tie += 1
+        else:
+            ready.pop()
+    return entries
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    remaining = [rng.randint(1, 50) for _ in range(n)]
+
+    old_entries, old_ms = timed(churn_heapq, remaining)
+    new_entries, new_ms = timed(churn_indexed, remaining)
+    print(f"{n} processes, {sum(remaining)} ticks")
+    print(f"  heapq re-push   {old_ms:8.1f} ms   {old_entries} entries created")
+    print(f"  indexed update  {new_ms:8.1f} ms   {new_entries} entries created")
+
+    processes = [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, n),
+        "priority": rng.randint(0, 9),
+        "bursts": [rng.randint(1, 20)],
+    } for i in range(n)]
+    for policy in ("srtf", "lrtf", "prtf"):
+        _, ms = timed(run_preemptive, processes, policy)
+        print(f"  run_preemptive {policy:<5} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+What a stored workload saves per run: the upload path (JSON parse,
+ProcessTable build, arrival sort) against a cold library load
+(decompress + decode) and a warm one (fresh() of the cached table).
+
+    python benchmarks/bench_library.py [--processes 500000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "osscheduler.settings_api")
+
+import django  # noqa: E402
+
+django.setup()
+
+from osscheduler import library  # noqa: E402
+from osscheduler.process_table import ProcessTable  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    processes = [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, n),
+        "bursts": [rng.randint(1, 20), rng.randint(1, 30), rng.randint(1, 20)],
+        "priority": rng.randint(0, 9),
+    } for i in range(n)]
+    body = json.dumps({"processes": processes})
+
+    _, blob, _ = library.encode(processes)
+    data = zlib.compress(blob, library.LEVEL)
+    template = library.decode(blob)
+
+    def upload():
+        table = ProcessTable(json.loads(body)["processes"])
+        table.by_arrival()
+        return table
+
+    def cold():
+        table = library.decode(zlib.decompress(data)).fresh()
+        table.by_arrival()
+        return table
+
+    def warm():
+        table = template.fresh()
+        table.by_arrival()
+        return table
+
+    print(f"{n} processes: {len(body)} bytes as JSON, {len(data)} bytes stored")
+    for name, fn in (("upload", upload), ("cold", cold), ("warm", warm)):
+        _, ms = timed(fn)
+        print(f"  {name:<8}{ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Full responses vs mode=metrics on a generated workload.
+
+Measures schedule + response body + JSON encoding, then the peak traced
+memory of the same run in a second pass (the workload itself excluded).
+
+    python benchmarks/bench_metrics.py [--processes 200000] [--policy srtf]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import run_policy, summarize, summarize_metrics, with_metrics  # noqa: E402
+from osscheduler.workload import synthesize  # noqa: E402
+
+
+def run(spec, policy, metrics):
+    table = synthesize(spec)
+    if metrics:
+        table = with_metrics(table)
+    start = time.perf_counter()
+    result = run_policy(policy, table)
+    body = summarize_metrics(*result) if metrics else summarize(*result)
+    size = len(json.dumps(body))
+    return (time.perf_counter() - start) * 1000, size
+
+
+def peak(spec, policy, metrics):
+    table = synthesize(spec)
+    if metrics:
+        table = with_metrics(table)
+    tracemalloc.start()
+    result = run_policy(policy, table)
+    body = summarize_metrics(*result) if metrics else summarize(*result)
+    json.dumps(body)
+    used = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return used / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=200_000)
+    parser.add_argument("--policy", default="srtf")
+    parser.add_argument("--io-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    spec = {"processes": args.processes, "seed": 0, "io_ratio": args.io_ratio, "io_rounds": 2}
+    print(f"{args.policy}, {args.processes} processes")
+    print(f"{'mode':<10}{'ms':>10}{'peak MiB':>10}{'body bytes':>14}")
+    for mode in ("full", "metrics"):
+        ms, size = run(spec, args.policy, mode == "metrics")
+        mib = peak(spec, args.policy, mode == "metrics")
+        print(f"{mode:<10}{ms:>10.0f}{mib:>10.1f}{size:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Multilevel queue engine on growing process counts: wall time per dispatch
+should stay flat (O(log n)) as n grows, under both arbitrations.
+
+Interactive processes (rr, short bursts with I/O) share the CPU with
+batch jobs (fcfs, long bursts), weighted 80/20.
+
+    python benchmarks/bench_multilevel.py [--processes 10000 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.multilevel import run_multilevel  # noqa: E402
+
+
+QUEUES = [
+    {"name": "interactive", "policy": "rr", "quantum": 2, "weight": 80},
+    {"name": "batch", "policy": "fcfs", "weight": 20},
+]
+
+
+def workload(n, seed=0):
+    rng = random.Random(seed)
+    processes = []
+    for i in range(n):
+        if rng.random() < 0.5:
+            processes.append({
+                "pid": f"I{i}",
+                "arrival": rng.randint(0, 4 * n),
+                "bursts": [rng.randint(1, 4), rng.randint(1, 20), rng.randint(1, 4)],
+                "queue": "interactive",
+            })
+        else:
+            processes.append({
+                "pid": f"B{i}",
+                "arrival": rng.randint(0, 4 * n),
+                "bursts": [rng.randint(5, 30)],
+                "queue": "batch",
+            })
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.processes:
+        processes = workload(n)
+        print(f"{n} processes")
+        for arbitration in ("priority", "weighted"):
+            start = time.perf_counter()
+            gantt, _, _, _ = run_multilevel(processes, QUEUES, arbitration)
+            ms = (time.perf_counter() - start) * 1000
+            print(f"  {arbitration:<9} {ms:9.1f} ms   {len(gantt):8} slices   "
+                  f"({ms * 1000 / len(gantt):.1f} us/slice)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Branch and bound for the optimal non-preemptive order: time to prove the
+optimum as processes are added, with one worker and with a pool, and how
+far the best heuristic was from it. It first checks the search against
+every dispatch order of small random tables, zero bursts and zero
+context switches included, replayed with Problem.replay.
+
+    python benchmarks/bench_optimal.py [--processes 6 8 10 12] [--workers 1 4] [--budget 60]
+                                       [--check 300]
+"""
+import argparse
+from itertools import permutations
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import _table  # noqa: E402
+from osscheduler.optimal import Problem, optimise  # noqa: E402
+
+
+def workload(n, io=0.4, seed=0):
+    rng = random.Random(seed)
+    processes = []
+    for i in range(n):
+        bursts = [rng.randint(1, 12)]
+        while rng.random() < io and len(bursts) < 5:
+            bursts += [rng.randint(1, 10), rng.randint(1, 12)]
+        processes.append({"pid": f"P{i + 1}", "arrival": rng.randint(0, 2 * n), "bursts": bursts})
+    return processes
+
+
+def brute_force(problem):
+    # Lowest sum of completions over every order of the CPU bursts
+    bursts = [h for h in range(problem.n) for _ in range(0, len(problem.bursts[h]), 2)]
+    return min(sum(problem.replay(order)[0]) for order in set(permutations(bursts)))
+
+
+def check(trials, seed=0):
+    rng = random.Random(seed)
+    for _ in range(trials):
+        context_switch = rng.choice([0, 0, 1, 2])
+        processes = []
+        for i in range(rng.randint(1, 4)):
+            bursts = [rng.randint(0, 6)]
+            for _ in range(rng.randint(0, 1)):
+                bursts += [rng.randint(0, 5), rng.randint(0, 6)]
+            processes.append({"pid": f"P{i + 1}", "arrival": rng.randint(0, 8), "bursts": bursts})
+        result = optimise(processes, context_switch, objective="tat", policies=["fcfs", "sjf"])
+        problem = Problem(_table(processes, "fcfs", context_switch), context_switch)
+        best = problem.averages_of(brute_force(problem))["tat"]
+        assert result["optimal"], processes
+        assert abs(result["best"]["average"]["tat"] - best) < 1e-9, (processes, context_switch)
+        assert abs(result["lower_bound"]["tat"] - best) < 1e-9, (processes, context_switch)
+    print(f"{trials} tables match a brute-force search")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, nargs="+", default=[6, 8, 10, 12])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--budget", type=float, default=60)
+    parser.add_argument("--context-switch", type=int, default=1)
+    parser.add_argument("--check", type=int, default=300, help="brute-force checks first")
+    args = parser.parse_args()
+
+    check(args.check)
+
+    for n in args.processes:
+        processes = workload(n)
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = optimise(processes, args.context_switch, time_budget=args.budget,
+                              workers=workers)
+            ms = (time.perf_counter() - start) * 1000
+            search = result["search"]
+            best = min(result["heuristics"].items(), key=lambda item: item[1]["gap"])
+            print(f"{n:>3} processes  {search['workers']} worker(s)  {ms:9.1f} ms  "
+                  f"{'optimal' if result['optimal'] else 'budget '}  nodes {search['nodes']:>9}  "
+                  f"wt {result['best']['average']['wt']:.2f} (bound {result['lower_bound']['wt']:.2f})  "
+                  f"{best[0]} +{best[1]['gap']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
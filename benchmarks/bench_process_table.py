@@ -0,0 +1,117 @@
+"""
+Per-process dicts vs the struct-of-arrays ProcessTable.
+
+Measures the memory held per process for engine state, the cost of the
+field reads and writes done on every dispatch, and a full engine run.
+
+    python benchmarks/bench_process_table.py [--processes 200000]
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.engine import run_nonpreemptive  # noqa: E402
+from osscheduler.process_table import ProcessTable  # noqa: E402
+
+
+def as_dicts(processes):
+    # The per-process state the engines used to keep
+    return [{
+        "pid": p["pid"],
+        "arrival": p["arrival"],
+        "bursts": p["bursts"],
+        "priority": p.get("priority"),
+        "index": 0,
+        "burst_time": 0,
+        "completion_time": None,
+        "response_time": None
+    } for p in processes]
+
+
+def allocated(build, processes):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = build(processes)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del state
+    return after - before
+
+
+def peak(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def dispatch_dicts(state):
+    # Field traffic of one dispatch per process
+    for p in state:
+        cpu = p["bursts"][p["index"]]
+        if p["response_time"] is None:
+            p["response_time"] = 0 - p["arrival"]
+        p["burst_time"] += cpu
+        p["index"] += 1
+        p["completion_time"] = cpu
+
+
+def dispatch_table(t):
+    bursts, cursor, burst_time = t.bursts, t.cursor, t.burst_time
+    arrival, started, response, completion = t.arrival, t.started, t.response, t.completion
+    for h in range(t.n):
+        c = cursor[h]
+        cpu = bursts[c]
+        if not started[h]:
+            started[h] = 1
+            response[h] = 0 - arrival[h]
+        burst_time[h] += cpu
+        cursor[h] = c + 1
+        completion[h] = cpu
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    processes = [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, n),
+        "priority": rng.randint(0, 9),
+        "bursts": [rng.randint(1, 9) for _ in range(rng.choice([1, 3, 5]))],
+    } for i in range(n)]
+
+    dict_bytes = allocated(as_dicts, processes)
+    table_bytes = allocated(ProcessTable, processes)
+    print(f"{n} processes")
+    print(f"  state per process: dicts {dict_bytes / n:7.1f} B   "
+          f"table {table_bytes / n:7.1f} B   ({dict_bytes / table_bytes:.1f}x)")
+
+    dict_ms = timed(dispatch_dicts, as_dicts(processes))
+    table_ms = timed(dispatch_table, ProcessTable(processes))
+    print(f"  dispatch field access: dicts {dict_ms:7.1f} ms   table {table_ms:7.1f} ms")
+
+    for policy in ("fcfs", "sjf", "priority"):
+        ms = timed(run_nonpreemptive, processes, 0, policy)
+        print(f"  run_nonpreemptive {policy:<8} {ms:8.1f} ms   "
+              f"peak {peak(run_nonpreemptive, processes, 0, policy) / n:6.1f} B/process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Cold-start and per-request overhead of the full and the API-only profile.
+
+Each measurement runs in a fresh interpreter so that module caches from
+one profile do not leak into the other.
+
+    python benchmarks/bench_profiles.py [--runs 10] [--requests 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    "full": ("osscheduler.settings", "osscheduler.wsgi"),
+    "api": ("osscheduler.settings_api", "osscheduler.wsgi_api"),
+}
+
+PAYLOAD = json.dumps({
+    "context_switch": 0,
+    "processes": [
+        {"pid": "P1", "arrival": 0, "bursts": [5, 3, 4]},
+        {"pid": "P2", "arrival": 1, "bursts": [3]},
+        {"pid": "P3", "arrival": 2, "bursts": [2, 2, 1]},
+    ],
+})
+
+
+def child(profile, requests):
+    settings_module, wsgi_module = PROFILES[profile]
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+
+    start = time.perf_counter()
+    __import__(wsgi_module)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    from django.test import Client
+
+    client = Client()
+    start = time.perf_counter()
+    client.post("/api/fcfs/", PAYLOAD, content_type="application/json")
+    first_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.post("/api/fcfs/", PAYLOAD, content_type="application/json")
+        samples.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "import_ms": import_ms,
+        "first_request_ms": first_ms,
+        "request_us": statistics.median(samples) * 1e6,
+        "modules": len(sys.modules),
+    }))
+
+
+def run(profile, requests):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", profile, "--requests", str(requests)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", choices=PROFILES)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        child(args.child, args.requests)
+        return
+
+    results = {}
+    for profile in PROFILES:
+        runs = [run(profile, args.requests) for _ in range(args.runs)]
+        results[profile] = {
+            key: statistics.median(r[key] for r in runs) for key in runs[0]
+        }
+
+    print(f"{'profile':<8} {'import ms':>10} {'1st req ms':>11} {'req us':>9} {'modules':>8}")
+    for profile, r in results.items():
+        print(f"{profile:<8} {r['import_ms']:>10.1f} {r['first_request_ms']:>11.1f} "
+              f"{r['request_us']:>9.1f} {r['modules']:>8.0f}")
+
+    full, api = results["full"], results["api"]
+    print(f"\ncold start (import + first request): "
+          f"{full['import_ms'] + full['first_request_ms']:.1f} ms -> "
+          f"{api['import_ms'] + api['first_request_ms']:.1f} ms")
+    print(f"per-request overhead: {full['request_us']:.1f} us -> {api['request_us']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Lottery winner selection: linear scan over ticket holders vs the Fenwick
+tree, and full lottery / stride runs with many runnable processes.
+
+    python benchmarks/bench_proportional.py [--processes 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.fenwick import Fenwick  # noqa: E402
+from osscheduler.proportional import fairness, run_lottery, run_stride  # noqa: E402
+
+
+def scan_draws(tickets, draws, rng):
+    total = sum(tickets)
+    for _ in range(draws):
+        r = rng.randrange(total)
+        for h, n in enumerate(tickets):
+            r -= n
+            if r < 0:
+                break
+
+
+def fenwick_draws(tickets, draws, rng):
+    tree = Fenwick(len(tickets))
+    for h, n in enumerate(tickets):
+        tree.add(h, n)
+    for _ in range(draws):
+        tree.find(rng.randrange(tree.total))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=100_000)
+    parser.add_argument("--draws", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.processes
+    tickets = [rng.randint(1, 500) for _ in range(n)]
+
+    _, scan_ms = timed(scan_draws, tickets, args.draws, random.Random(1))
+    _, tree_ms = timed(fenwick_draws, tickets, args.draws, random.Random(1))
+    print(f"{n} runnable processes, {args.draws} draws")
+    print(f"  linear scan {scan_ms / args.draws:9.4f} ms/draw   "
+          f"fenwick {tree_ms / args.draws:9.4f} ms/draw (incl. build)")
+
+    processes = [{
+        "pid": f"P{i}",
+        "arrival": 0,
+        "bursts": [rng.randint(1, 10)],
+        "tickets": tickets[i],
+    } for i in range(n)]
+    for name, fn in (("lottery", run_lottery), ("stride", run_stride)):
+        _, ms = timed(fn, processes)
+        print(f"  {name:<8} {ms:8.1f} ms for {sum(p['bursts'][0] for p in processes)} quanta")
+
+    # Fair share only means something when every process stays runnable
+    # for many quanta
+    long_running = [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, 1000),
+        "bursts": [5000],
+        "tickets": rng.randint(1, 500),
+    } for i in range(100)]
+    print("100 processes x 5000 quanta")
+    for name, fn in (("lottery", run_lottery), ("stride", run_stride)):
+        run = fn(long_running)
+        report = fairness(run[1], run[2])
+        print(f"  {name:<8} jain {report['jain_index']:.4f}   "
+              f"max deviation {report['max_deviation']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
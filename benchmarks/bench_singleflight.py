@@ -0,0 +1,78 @@
+"""
+Bursts of identical concurrent requests with and without single-flight
+coalescing.
+
+Each burst fires --clients threads at one endpoint with the same payload
+at the same moment and reports the wall time of the burst and how many
+requests actually ran a simulation.
+
+    python benchmarks/bench_singleflight.py [--clients 16] [--processes 3000] [--bursts 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "osscheduler.settings_api")
+
+
+def burst(client, path, body, clients):
+    barrier = threading.Barrier(clients)
+    shared = []
+
+    def fire():
+        barrier.wait()
+        response = client.post(path, body, content_type="application/json")
+        assert response.status_code == 200, response.content[:200]
+        shared.append(response.has_header("X-Single-Flight"))
+
+    threads = [threading.Thread(target=fire) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, clients - sum(shared)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=3000)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--endpoint", default="srtf")
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    from django.test import Client, override_settings
+
+    rng = random.Random(0)
+    body = json.dumps({"processes": [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, args.processes),
+        "priority": rng.randint(0, 9),
+        "bursts": [rng.randint(1, 9) for _ in range(3)],
+    } for i in range(args.processes)]})
+    path = f"/api/{args.endpoint}/"
+    client = Client()
+
+    print(f"{args.clients} identical {args.endpoint} requests, {args.processes} processes")
+    print(f"{'mode':<10}{'burst ms':>12}{'simulations':>14}")
+    for mode in ("off", "thread"):
+        with override_settings(SINGLEFLIGHT=mode):
+            burst(client, path, body, args.clients)         # warm up
+            results = [burst(client, path, body, args.clients) for _ in range(args.bursts)]
+        best = min(elapsed for elapsed, _ in results)
+        runs = sum(ran for _, ran in results) / len(results)
+        print(f"{mode:<10}{best * 1000:>12.1f}{runs:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Open-system steady-state runs on growing horizons: wall time should grow
+linearly with the simulated time while peak memory stays flat, since
+completed processes are retired as they finish.
+
+The FCFS run is an M/G/1 queue, so its WT is also compared with the
+Pollaczek-Khinchine mean wait for the same (rounded) burst distribution.
+
+    python benchmarks/bench_steady.py [--horizons 100000 1000000 4000000]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler.steady import run_open  # noqa: E402
+from osscheduler.workload import sample  # noqa: E402
+
+
+SPEC = {"arrival_rate": 0.15, "cpu_burst": {"dist": "exponential", "mean": 5}}
+
+BATCH = 10_000
+
+
+def pollaczek_khinchine(spec):
+    bursts = sample(np.random.default_rng(0), spec["cpu_burst"], 1_000_000).astype(float)
+    rate = spec["arrival_rate"]
+    return rate * (bursts ** 2).mean() / (2 * (1 - rate * bursts.mean()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--horizons", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    args = parser.parse_args()
+
+    print(f"M/G/1 mean wait {pollaczek_khinchine(SPEC):.3f}")
+    for horizon in args.horizons:
+        start = time.perf_counter()
+        result = run_open(SPEC, "fcfs", batch=BATCH, horizon=horizon)
+        ms = (time.perf_counter() - start) * 1000
+        # Again under tracemalloc, which slows the run down several times
+        tracemalloc.start()
+        run_open(SPEC, "fcfs", batch=BATCH, horizon=horizon)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        wt = result["steady_state"]["wt"]
+        print(f"  horizon {horizon:>10}   {ms:9.1f} ms   {peak / 2 ** 20:6.1f} MiB peak   "
+              f"{result['processes']['arrived']:>9} processes   "
+              f"wt {wt['mean']:.3f} [{wt['ci_low']:.3f}, {wt['ci_high']:.3f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Gantt tiles on a large schedule: pyramid build and save time, then the
+time and JSON size of one full-limit window at every level.
+
+    python benchmarks/bench_tiles.py [--processes 200000] [--policy srtf]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler import tiles  # noqa: E402
+from osscheduler.engine import run_policy  # noqa: E402
+from osscheduler.workload import synthesize  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=200_000)
+    parser.add_argument("--policy", default="srtf")
+    args = parser.parse_args()
+
+    spec = {"processes": args.processes, "seed": 0, "io_ratio": 0.3, "io_rounds": 2}
+    gantt, table, _, total_time = run_policy(args.policy, synthesize(spec))
+    full = len(json.dumps(gantt.to_list(table.pid)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        pyramid, build_ms = timed(tiles.build, gantt, table.pid, total_time)
+        meta, save_ms = timed(tiles.save, directory, pyramid)
+        path = tiles.path_of(directory, meta["id"])
+
+        print(f"{args.policy}, {args.processes} processes: {len(gantt)} slices, "
+              f"{full} bytes as a full gantt")
+        print(f"build {build_ms:.0f} ms, save {save_ms:.0f} ms")
+        print(f"{'level':>6}{'width':>10}{'count':>10}{'ms':>8}{'bytes':>10}")
+        for level in meta["levels"]:
+            width = level["width"]
+            if width is None:
+                window = (total_time // 2, total_time // 2 + tiles.TILE_LIMIT // 4)
+            else:
+                window = (0, width * min(tiles.TILE_LIMIT, level["count"]))
+            result, ms = timed(tiles.tile, path, level["level"], *window)
+            print(f"{level['level']:>6}{str(width):>10}{level['count']:>10}"
+                  f"{ms:>8.1f}{len(json.dumps(result)):>10}")
+
+
+if __name__ == "__main__":
+    main()
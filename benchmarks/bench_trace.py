@@ -0,0 +1,77 @@
+"""
+Trace export on ever longer schedules of the same processes: more I/O
+rounds per process mean more slices, and a trace that grows with them,
+while the memory used to write it should not. Peak memory is measured
+on top of the prepared table, for the trace and, for comparison, a full
+run that keeps its Gantt chart. Both also hold what the engine needs per
+process (its arrival order and READY queue), which does not depend on
+the length of the schedule.
+
+    python benchmarks/bench_trace.py [--processes 20000] [--rounds 1 10 100] [--policy sjf]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from osscheduler import trace  # noqa: E402
+from osscheduler.engine import run_policy  # noqa: E402
+from osscheduler.workload import synthesize  # noqa: E402
+
+
+class Counter:
+    """Writer that only counts the bytes it is given."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+
+def spec(n, rounds):
+    # About 60% utilisation whatever the number of rounds
+    return {"processes": n, "seed": 1, "arrival_rate": 0.6 / (4 * (rounds + 1)),
+            "cpu_burst": {"dist": "exponential", "mean": 4},
+            "io_burst": {"dist": "exponential", "mean": 6}, "io_ratio": 1.0, "io_rounds": rounds}
+
+
+def peak(fn):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    result = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--policy", default="sjf")
+    args = parser.parse_args()
+
+    for rounds in args.rounds:
+        workload = spec(args.processes, rounds)
+        out = Counter()
+        table = trace.prepare(args.policy, synthesize(workload))
+        start = time.perf_counter()
+        summary = trace.run_trace(args.policy, table, out)
+        ms = (time.perf_counter() - start) * 1000
+
+        # Again under tracemalloc, which slows the runs down several times
+        table = trace.prepare(args.policy, synthesize(workload))
+        traced = peak(lambda: trace.run_trace(args.policy, table, Counter()))
+        table = synthesize(workload)
+        full = peak(lambda: run_policy(args.policy, table))
+        print(f"{rounds:>4} I/O rounds   {summary['slices']:>9} slices   {ms:9.1f} ms   "
+              f"{out.bytes / 2 ** 20:8.1f} MiB of trace   "
+              f"peak {traced / 2 ** 20:6.1f} MiB traced / {full / 2 ** 20:6.1f} MiB with Gantt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+End-to-end HTTP load test of the scheduler API.
+
+Starts the app on localhost under one worker model, drives a weighted mix
+of endpoints and payload sizes from concurrent keep-alive clients, and
+reports throughput and p50/p95/p99 latency per endpoint and size.
+
+    python benchmarks/loadtest.py --server sync --workers 4
+    python benchmarks/loadtest.py --server gthread --workers 2 --threads 8
+    python benchmarks/loadtest.py --server asgi --workers 2       # needs uvicorn
+    python benchmarks/loadtest.py --url http://host:8000 ...      # existing server
+
+    --mix fcfs:3,srtf:1,montecarlo:0   endpoint weights
+    --sizes small:5,medium:1,large:0   payload size weights
+
+Results are written to benchmarks/results/ as JSON (see --out).
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    # profile: (settings, wsgi module, asgi module)
+    "full": ("osscheduler.settings", "osscheduler.wsgi", "osscheduler.asgi"),
+    "api": ("osscheduler.settings_api", "osscheduler.wsgi_api", "osscheduler.asgi_api"),
+}
+
+SIZES = {"small": 5, "medium": 50, "large": 500}
+
+ENDPOINTS = (
+    "fcfs", "sjf", "ljf", "priority", "srtf", "lrtf", "prtf",
+    "lottery", "stride", "cfs", "edf", "rm", "montecarlo",
+)
+
+
+# =========================
+# PAYLOADS
+# =========================
+def processes(rng, n):
+    return [{
+        "pid": f"P{i}",
+        "arrival": rng.randint(0, n),
+        "priority": rng.randint(0, 9),
+        "bursts": [rng.randint(1, 9) for _ in range(rng.choice([1, 3, 5]))],
+    } for i in range(n)]
+
+
+def payload(endpoint, size, rng):
+    n = SIZES[size]
+    if endpoint in ("edf", "rm"):
+        # Harmonic-ish periods scaled with n, about 70% utilisation
+        periods = [rng.choice([10, 20, 40, 50, 100]) * n for _ in range(n)]
+        return {"tasks": [{"pid": f"T{i}", "period": p, "wcet": max(1, 7 * p // (10 * n))}
+                          for i, p in enumerate(periods)]}
+    if endpoint == "montecarlo":
+        return {"policies": ["fcfs", "sjf"], "runs": 10, "processes": n, "seed": rng.randint(0, 99)}
+    return {"processes": processes(rng, n)}
+
+
+def parse_weights(spec, choices):
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition(":")
+        if name not in choices:
+            raise SystemExit(f"unknown {name!r}, expected one of {', '.join(choices)}")
+        weights[name] = float(weight or 1)
+    return {k: v for k, v in weights.items() if v > 0}
+
+
+# =========================
+# SERVER
+# =========================
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(args, port):
+    settings, wsgi, asgi = PROFILES[args.profile]
+    bind = f"127.0.0.1:{port}"
+    if args.server == "asgi":
+        return settings, [
+            sys.executable, "-m", "uvicorn", f"{asgi}:application",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ]
+    cmd = [
+        sys.executable, "-m", "gunicorn", f"{wsgi}:application",
+        "--bind", bind, "--workers", str(args.workers),
+        "--worker-class", args.server, "--log-level", "warning",
+    ]
+    if args.server == "gthread":
+        cmd += ["--threads", str(args.threads)]
+    if args.preload:
+        cmd.append("--preload")
+    return settings, cmd
+
+
+def start_server(args):
+    runner = "uvicorn" if args.server == "asgi" else "gunicorn"
+    if importlib.util.find_spec(runner) is None:
+        raise SystemExit(f"--server {args.server} needs {runner}: pip install {runner}")
+
+    port = free_port()
+    settings, cmd = server_command(args, port)
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings, PYTHONPATH=str(ROOT))
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+
+    body = json.dumps(payload("fcfs", "small", random.Random(0)))
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with {proc.returncode}: {' '.join(cmd)}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("POST", "/api/fcfs/", body, {"Content-Type": "application/json"})
+            if conn.getresponse().status == 200:
+                conn.close()
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("server did not become ready")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# =========================
+# CLIENT
+# =========================
+def client(url, plan, stop_at, record, timeout):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    headers = {"Content-Type": "application/json"}
+    for endpoint, size, body in plan:
+        if time.monotonic() >= stop_at:
+            break
+        start = time.perf_counter()
+        try:
+            conn.request("POST", f"/api/{endpoint}/", body, headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+            status = 0
+        record(endpoint, size, time.perf_counter() - start, status)
+    conn.close()
+
+
+def drive(url, args, endpoints, sizes, duration, seed):
+    rng = random.Random(seed)
+    bodies = {(e, s): [json.dumps(payload(e, s, rng)) for _ in range(args.variants)]
+              for e in endpoints for s in sizes}
+
+    def plan(k):
+        r = random.Random(seed * 1000 + k)
+        names, weights = list(endpoints), list(endpoints.values())
+        size_names, size_weights = list(sizes), list(sizes.values())
+        while True:
+            e = r.choices(names, weights)[0]
+            s = r.choices(size_names, size_weights)[0]
+            yield e, s, r.choice(bodies[(e, s)])
+
+    samples = []
+    lock = threading.Lock()
+
+    def record(*sample):
+        with lock:
+            samples.append(sample)
+
+    stop_at = time.monotonic() + duration
+    threads = [threading.Thread(target=client, args=(url, plan(k), stop_at, record, args.timeout))
+               for k in range(args.concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - start
+
+
+# =========================
+# REPORT
+# =========================
+def percentile(sorted_values, q):
+    # Nearest-rank
+    if not sorted_values:
+        return None
+    k = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[k - 1]
+
+
+def summarize(samples, elapsed):
+    groups = {}
+    for endpoint, size, latency, status in samples:
+        groups.setdefault((endpoint, size), []).append((latency, status))
+    groups[("all", "all")] = [(latency, status) for _, _, latency, status in samples]
+
+    rows = []
+    for (endpoint, size), values in sorted(groups.items()):
+        ok = sorted(latency * 1000 for latency, status in values if status == 200)
+        rows.append({
+            "endpoint": endpoint,
+            "size": size,
+            "requests": len(values),
+            "errors": len(values) - len(ok),
+            "throughput": len(values) / elapsed,
+            "p50_ms": percentile(ok, 50),
+            "p95_ms": percentile(ok, 95),
+            "p99_ms": percentile(ok, 99),
+            "max_ms": ok[-1] if ok else None,
+        })
+    return rows
+
+
+def print_rows(rows):
+    def ms(v):
+        return f"{v:8.2f}" if v is not None else "       -"
+
+    print(f"{'endpoint':<12}{'size':<8}{'req':>8}{'err':>6}{'req/s':>10}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}")
+    for r in rows:
+        print(f"{r['endpoint']:<12}{r['size']:<8}{r['requests']:>8}{r['errors']:>6}"
+              f"{r['throughput']:>10.1f}{ms(r['p50_ms'])}{ms(r['p95_ms'])}{ms(r['p99_ms'])}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server", choices=("sync", "gthread", "asgi"), default="sync")
+    parser.add_argument("--profile", choices=PROFILES, default="api")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="per worker, gthread only")
+    parser.add_argument("--preload", action="store_true")
+    parser.add_argument("--url", help="drive an already running server instead")
+    parser.add_argument("--mix", default="fcfs:3,sjf:1,srtf:2,priority:1")
+    parser.add_argument("--sizes", default="small:6,medium:3,large:1")
+    parser.add_argument("--variants", type=int, default=8, help="distinct payloads per endpoint and size")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--startup-timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="result file (default benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    endpoints = parse_weights(args.mix, ENDPOINTS)
+    sizes = parse_weights(args.sizes, SIZES)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args)
+
+    try:
+        if args.warmup > 0:
+            drive(url, args, endpoints, sizes, args.warmup, args.seed + 1)
+        samples, elapsed = drive(url, args, endpoints, sizes, args.duration, args.seed)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    rows = summarize(samples, elapsed)
+    print(f"{args.server} x{args.workers}"
+          + (f" ({args.threads} threads)" if args.server == "gthread" else "")
+          + f", {args.concurrency} clients, {elapsed:.1f} s")
+    print_rows(rows)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out = Path(args.out) if args.out else ROOT / "benchmarks" / "results" / f"loadtest-{stamp}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    out.write_text(json.dumps({
+        "config": config,
+        "url": args.url,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "elapsed": elapsed,
+        "results": rows,
+    }, indent=2))
+    print(f"saved {out.relative_to(ROOT) if out.is_relative_to(ROOT) else out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
 #!/usr/bin/env bash
 pip install -r requirements.txt
+python manage.py migrate --noinput
 python manage.py collectstatic --noinput
+python manage.py prerender
@@ -0,0 +1,143 @@
+"""
+Running TAT / WT / RT statistics for metrics-only runs.
+
+OnlineMetrics stands in for an engine's `completed` list: the engine
+appends each handle as the process completes, and instead of keeping it,
+OnlineMetrics folds it into per-metric aggregates a batch at a time:
+
+  * count, exact total, min and max;
+  * mean and variance, merged batch by batch with Welford's update in
+    Chan et al.'s pairwise form;
+  * a DDSketch-style log histogram for quantiles: bucket i counts values
+    in (gamma^(i-1), gamma^i], so every quantile it reports is within
+    RELATIVE_ACCURACY of a value actually observed at that rank.
+
+Memory is one batch of handles plus at most a few thousand buckets per
+metric, however many processes complete.
+"""
+from array import array
+import math
+
+import numpy as np
+
+
+BATCH = 4096
+
+RELATIVE_ACCURACY = 0.01
+
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class Sketch:
+
+    def __init__(self, accuracy=RELATIVE_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0                  # values <= 0
+
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add_batch(self, values):
+        n = len(values)
+        if not n:
+            return
+
+        # Welford / Chan: merge the batch's mean and squared deviations
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        if values.dtype.kind == "f":
+            # in completion order, so the mean matches summarize() exactly
+            running = self.total
+            for v in values.tolist():
+                running += v
+            self.total = running
+        else:
+            self.total += values.sum().item()
+        low, high = values.min().item(), values.max().item()
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+        positive = values[values > 0]
+        self.zeros += n - len(positive)
+        keys, counts = np.unique(
+            np.ceil(np.log(positive) / self.log_gamma).astype(np.int64), return_counts=True
+        )
+        buckets = self.buckets
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0) + count
+
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return min(self.max, 0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return round(min(max(estimate, self.min), self.max), 6)
+        return self.max
+
+    def report(self):
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        stats = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "std": math.sqrt(variance),
+            "min": self.min if self.count else 0,
+            "max": self.max if self.count else 0,
+        }
+        for name, q in QUANTILES:
+            stats[name] = self.quantile(q)
+        return stats
+
+
+class OnlineMetrics:
+    """Drop-in `completed` for the engines in metrics mode."""
+
+    def __init__(self, table, batch=BATCH):
+        self.table = table
+        self.batch = batch
+        self.pending = array("q")
+        self.dtype = np.int64 if table.typecode == "q" else np.float64
+        self.tat, self.wt, self.rt = Sketch(), Sketch(), Sketch()
+
+    def __len__(self):
+        return self.tat.count + len(self.pending)
+
+    def append(self, h):
+        self.pending.append(h)
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        t, dtype = self.table, self.dtype
+        handles = np.array(self.pending, dtype=np.int64)
+        arrival = np.frombuffer(t.arrival, dtype=dtype)[handles]
+        tat = np.frombuffer(t.completion, dtype=dtype)[handles] - arrival
+        wt = tat - np.frombuffer(t.burst_time, dtype=dtype)[handles]
+        rt = np.frombuffer(t.response, dtype=dtype)[handles]
+        self.tat.add_batch(tat)
+        self.wt.add_batch(wt)
+        self.rt.add_batch(rt)
+        del self.pending[:]
+
+    def report(self):
+        self.flush()
+        return {"tat": self.tat.report(), "wt": self.wt.report(), "rt": self.rt.report()}
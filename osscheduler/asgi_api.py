@@ -0,0 +1,16 @@
+"""
+ASGI config for the API-only server profile.
+
+See wsgi_api.py.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'osscheduler.settings_api')
+
+application = get_asgi_application()
+
+if os.environ.get('OSSCHEDULER_PRELOAD') == '1':
+    import osscheduler.views  # noqa: E402,F401
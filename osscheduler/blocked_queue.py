@@ -0,0 +1,207 @@
+"""
+BLOCKED queues: processes waiting for an I/O completion.
+
+Both implementations expose the same five operations used by the
+engines in engine.py:
+
+    push(when, p)      p becomes ready again at time `when`
+    submit(now, d, p)  p starts an I/O burst of length d at `now`
+    next_time()        earliest pending unblock time
+    pop_due(now)       every p with when <= now, in (when, push order)
+    len(queue)         number of blocked processes
+
+and are selected per request with "blocked_queue": "heap" | "wheel".
+"""
+import heapq
+
+
+# =========================
+# BINARY HEAP
+# =========================
+class BlockedHeap:
+
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, when, p):
+        heapq.heappush(self.heap, (when, self.seq, p))
+        self.seq += 1
+
+    def submit(self, now, duration, p):
+        self.push(now + duration, p)
+
+    def next_time(self):
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+
+# =========================
+# HASHED HIERARCHICAL TIMING WHEEL
+# =========================
+class TimingWheel:
+    """
+    Level L has 2**bits slots, each 2**(bits*L) time units wide. An event
+    lives on the lowest level whose slot range still shares a prefix with
+    the wheel's clock, so level 0 holds exact times and higher levels are
+    cascaded down as the clock reaches them. A bitmap per level finds the
+    next occupied slot without scanning, and everything unblocking at the
+    same instant sits in one bucket that is released as a batch.
+
+    Times must be integers; events past the top level wait in a heap.
+    """
+
+    def __init__(self, bits=6, levels=4):
+        self.bits = bits
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.levels = levels
+        self.slots = [[[] for _ in range(self.size)] for _ in range(levels)]
+        self.occupied = [0] * levels      # bitmap of non-empty slots
+        self.overflow = []                # heap of events beyond the top level
+        self.now = 0
+        self.count = 0
+        self.seq = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, when, p):
+        if type(when) is not int:
+            if when != int(when):
+                raise ValueError("timing wheel needs integer unblock times")
+            when = int(when)
+
+        entry = (when, self.seq, p)
+        self.seq += 1
+        self.count += 1
+
+        # Fast path: same level-0 block as the clock
+        if when >> self.bits == self.now >> self.bits and when >= self.now:
+            slot = when & self.mask
+            self.slots[0][slot].append(entry)
+            self.occupied[0] |= 1 << slot
+        else:
+            self._insert(entry)
+
+    def submit(self, now, duration, p):
+        self.push(now + duration, p)
+
+    def next_time(self):
+        if not self.count:
+            return None
+        level, slot = self._peek()
+        if level == 0:
+            return (self.now & ~self.mask) | slot
+        if level is None:
+            return self.overflow[0][0]
+        return min(entry[0] for entry in self.slots[level][slot])
+
+    def pop_due(self, now):
+        due = []
+
+        while self.count:
+            level, slot = self._peek()
+
+            if level == 0:
+                t = (self.now & ~self.mask) | slot
+                if t > now:
+                    break
+                self.now = t              # same level-0 block, nothing to cascade
+                bucket = self.slots[0][slot]
+                self.slots[0][slot] = []
+                self.occupied[0] &= ~(1 << slot)
+                self.count -= len(bucket)
+                if len(bucket) > 1:
+                    bucket.sort()         # (when, seq) is unique, p never compared
+                due.extend([entry[2] for entry in bucket])
+
+            elif level is None:
+                t = self.overflow[0][0]
+                if t > now:
+                    break
+                self._advance(t)
+
+            else:
+                shift = self.bits * level
+                block = ((self.now >> (shift + self.bits)) << (shift + self.bits)) | (slot << shift)
+                if block > now:
+                    break
+                self._advance(block)
+
+        if now > self.now:
+            self._advance(now)
+        return due
+
+    # -------------------------
+    # INTERNALS
+    # -------------------------
+    def _insert(self, entry):
+        t = max(entry[0], self.now)
+        bits = self.bits
+        for level in range(self.levels):
+            shift = bits * (level + 1)
+            if t >> shift == self.now >> shift:
+                slot = (t >> (bits * level)) & self.mask
+                self.slots[level][slot].append(entry)
+                self.occupied[level] |= 1 << slot
+                return
+        heapq.heappush(self.overflow, entry)
+
+    def _peek(self):
+        # Every level keeps only slots at or after the clock's own slot
+        # (strictly after, above level 0), so the first occupied slot on
+        # the lowest non-empty level holds the earliest event.
+        for level in range(self.levels):
+            cursor = (self.now >> (self.bits * level)) & self.mask
+            if level:
+                cursor += 1
+            pending = self.occupied[level] >> cursor
+            if pending:
+                return level, cursor + ((pending & -pending).bit_length() - 1)
+        return None, None
+
+    def _advance(self, t):
+        bits = self.bits
+        same_block = t >> bits == self.now >> bits
+        self.now = t
+        if same_block:
+            return
+        top = bits * self.levels
+
+        while self.overflow and self.overflow[0][0] >> top == t >> top:
+            self._insert(heapq.heappop(self.overflow))
+
+        # Buckets the clock has moved into belong on lower levels now.
+        for level in range(self.levels - 1, 0, -1):
+            slot = (t >> (bits * level)) & self.mask
+            if self.occupied[level] >> slot & 1:
+                bucket = self.slots[level][slot]
+                self.slots[level][slot] = []
+                self.occupied[level] &= ~(1 << slot)
+                for entry in bucket:
+                    self._insert(entry)
+
+
+BLOCKED_QUEUES = {
+    "heap": BlockedHeap,
+    "wheel": TimingWheel,
+}
+
+
+def make_blocked_queue(kind):
+    try:
+        return BLOCKED_QUEUES[kind]()
+    except KeyError:
+        raise ValueError(
+            f"unknown blocked_queue {kind!r}, expected one of {sorted(BLOCKED_QUEUES)}"
+        ) from None
@@ -0,0 +1,186 @@
+"""
+CFS-style fair scheduler.
+
+Every runnable process accumulates virtual runtime: CPU time scaled by
+NICE_0_WEIGHT / weight(nice), using the kernel's nice-to-weight table.
+The process with the smallest vruntime runs next, for its share of the
+scheduling period:
+
+    period = target_latency                  if nr_running <= latency / min_granularity
+             nr_running * min_granularity    otherwise
+    slice  = max(min_granularity, period * weight / total_weight)
+
+The run queue is an IndexedHeap keyed by (vruntime, tie): taking the
+leftmost task and reinserting it are O(log n), which is all the kernel's
+red-black tree is used for here. The engine jumps from event to event
+(slice end, burst end, arrival, I/O completion) rather than stepping
+ticks. An arrival or wakeup preempts the running process when the
+newcomer is behind it by more than wakeup_granularity, scaled to the
+newcomer's weight. New processes start at min_vruntime; sleepers come
+back no further than target_latency / 2 behind it.
+"""
+from array import array
+
+from .engine import _blocked, _sinks, _table
+from .indexed_heap import IndexedHeap
+
+
+NICE_0_WEIGHT = 1024
+
+# sched_prio_to_weight, nice -20 .. 19
+NICE_TO_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+
+
+def _weights(processes):
+    weights = []
+    for p in processes:
+        nice = p.get("nice", 0)
+        if type(nice) is not int or not -20 <= nice <= 19:
+            raise ValueError(f"{p['pid']}: nice must be an integer from -20 to 19")
+        weights.append(NICE_TO_WEIGHT[nice + 20])
+    return weights
+
+
+def run_cfs(processes, target_latency=6, min_granularity=1, wakeup_granularity=1,
+            blocked_queue="heap", devices=None, trace=True):
+    if not 0 < min_granularity <= target_latency or wakeup_granularity < 0:
+        raise ValueError("need 0 < min_granularity <= target_latency and wakeup_granularity >= 0")
+
+    t = _table(processes, "cfs")
+    weight = _weights(t.records)
+    integral = t.typecode == "q"
+    nr_latency = target_latency // min_granularity
+
+    bursts, cursor, burst_end = t.bursts, t.cursor, t.burst_end
+    vruntime = t.vruntime = array("d", bytes(8 * t.n))
+    left = array(t.typecode, bytes(8 * t.n))        # rest of the current CPU burst
+
+    # vruntime after every slice: (handle, time, vruntime) columns
+    t.trace = (array("q"), array(t.typecode), array("d"))
+
+    time = 0
+    gantt, completed = _sinks(t)
+    new = t.by_arrival()
+    arrived = 0
+    rq = IndexedHeap(t.n)
+    tie = 0
+    total_weight = 0            # runnable processes, including the running one
+    min_vruntime = 0.0
+    blocked = _blocked(t, blocked_queue, devices)
+
+    def next_event():
+        times = []
+        if arrived < len(new):
+            times.append(t.arrival[new[arrived]])
+        if blocked:
+            times.append(blocked.next_time())
+        return min(times) if times else None
+
+    def admit():
+        # NEW → RUNNABLE at min_vruntime, BLOCKED → RUNNABLE with sleeper credit
+        nonlocal arrived, tie, total_weight
+        woken = []
+        while arrived < len(new) and t.arrival[new[arrived]] <= time:
+            h = new[arrived]
+            vruntime[h] = min_vruntime
+            woken.append(h)
+            arrived += 1
+        for h in blocked.pop_due(time):
+            vruntime[h] = max(vruntime[h], min_vruntime - target_latency / 2)
+            woken.append(h)
+        for h in woken:
+            left[h] = bursts[cursor[h]]
+            rq.push(h, (vruntime[h], tie))
+            tie += 1
+            total_weight += weight[h]
+        return woken
+
+    while arrived < len(new) or rq or blocked:
+
+        admit()
+
+        if not rq:
+            next_time = next_event()
+            gantt.add(-1, time, next_time)
+            time = next_time
+            continue
+
+        h = rq.pop()
+        w = weight[h]
+        nr = len(rq) + 1
+        period = target_latency if nr <= nr_latency else nr * min_granularity
+        slice_ = max(min_granularity, period * w / total_weight)
+        if integral:
+            slice_ = max(1, int(slice_))
+        # A slice that covers the rest of the burst ends it exactly, so
+        # float times cannot leave a sliver of the burst that never runs
+        finishing = left[h] <= slice_
+        end = time + (left[h] if finishing else slice_)
+
+        if not t.started[h]:
+            t.started[h] = 1
+            t.response[h] = time - t.arrival[h]
+
+        # Run to the end of the slice unless an arrival or wakeup preempts
+        preempted = False
+        while not preempted:
+            event = next_event()
+            stop = end if event is None or event >= end else event
+
+            ran = stop - time
+            gantt.extend(h, time, stop)
+            vruntime[h] += ran * NICE_0_WEIGHT / w
+            t.burst_time[h] += ran
+            left[h] -= ran
+            time = stop
+            leftmost = rq.peek_key()[0] if rq else vruntime[h]
+            min_vruntime = max(min_vruntime, min(vruntime[h], leftmost))
+
+            if stop == end:
+                if finishing:
+                    left[h] = 0
+                break
+
+            for e in admit():
+                gran = wakeup_granularity * NICE_0_WEIGHT / weight[e]
+                preempted |= vruntime[h] - vruntime[e] > gran
+
+        if trace:
+            t.trace[0].append(h)
+            t.trace[1].append(time)
+            t.trace[2].append(vruntime[h])
+
+        if left[h]:
+            rq.push(h, (vruntime[h], tie))
+            tie += 1
+            continue
+
+        total_weight -= w
+        c = cursor[h]
+        if c + 1 < burst_end[h]:
+            blocked.submit(time, bursts[c + 1], h)
+            cursor[h] = c + 2
+        else:
+            cursor[h] = c + 1
+            t.completion[h] = time
+            completed.append(h)
+
+    return gantt, t, completed, time
+
+
+def vruntime_traces(table, completed):
+    """{pid: [[time, vruntime], ...]} for the completed processes."""
+    points = {h: [] for h in completed}
+    for h, time, v in zip(*table.trace):
+        if h in points:
+            points[h].append([time, round(v, 6)])
+    return {table.pid[h]: points[h] for h in completed}
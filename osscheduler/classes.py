@@ -0,0 +1,389 @@
+"""
+Equivalence classes of identical processes for the non-preemptive engine.
+
+Processes with the same arrival time, bursts and priority (and device,
+when the request has devices) are interchangeable under FCFS, SJF, LJF
+and priority: they enter READY together with the same key. classify()
+collapses them into one class, and run_classes() keeps one READY entry
+per class with its members still waiting, instead of one per process.
+
+When a class reaches the head of READY, its members run back to back
+until something that goes before them comes in (a smaller key; never,
+under FCFS), so a whole run of them is one step: their start times form
+an arithmetic series and their response and turnaround sums are
+computed in closed form. What comes in meanwhile is queued after the
+run in the order run_nonpreemptive() would have queued it. With devices
+I/O completions cannot be foreseen, and a run stops at the next one.
+
+A member that goes to I/O leaves its class and comes back alone, behind
+its twins when they came back just before it, so I/O still costs one
+queue operation per burst. Ties between different processes that arrive
+at the same time are broken by class (in the order of each class's
+first process) and then by request order, where run_nonpreemptive()
+uses request order alone. Per-process rows are only built with
+expand=True.
+"""
+from array import array
+from collections import deque
+import heapq
+import math
+
+import numpy as np
+
+from .engine import _blocked, _table
+from .process_table import Gantt
+
+
+POLICIES = ("fcfs", "sjf", "ljf", "priority")
+
+
+def classify(t, devices=False):
+    """(class of every handle, members of every class) with classes in arrival order."""
+    n = t.n
+    floats = t.typecode == "d" or (t.priority is not None and t.priority.typecode == "d")
+    dtype = np.float64 if floats else np.int64
+    start = np.frombuffer(t.cursor, dtype=np.int64)
+    counts = np.frombuffer(t.burst_end, dtype=np.int64) - start
+    bursts = np.frombuffer(t.bursts, dtype=np.int64 if t.typecode == "q" else np.float64)
+
+    width = int(counts.max()) if n else 0
+    columns = [np.frombuffer(t.arrival, dtype=bursts.dtype), counts]
+    if t.priority is not None:
+        columns.append(np.frombuffer(t.priority, dtype=np.int64 if t.priority.typecode == "q" else np.float64))
+    if devices:
+        names = {}
+        columns.append(np.array([names.setdefault(r.get("device"), len(names)) for r in t.records]))
+        columns.append(np.array([r.get("track", 0) for r in t.records]))
+    rows = np.zeros((n, len(columns) + width), dtype=dtype)
+    for i, column in enumerate(columns):
+        rows[:, i] = column
+    used = np.arange(width) < counts[:, None]
+    rows[:, len(columns):][used] = bursts[(start[:, None] + np.arange(width))[used]]
+
+    # Sort the rows column by column (arrival first) and cut where they change
+    order = np.lexsort(rows.T[::-1])
+    ordered = rows[order]
+    cuts = np.flatnonzero(np.any(ordered[1:] != ordered[:-1], axis=1)) + 1
+    groups = np.split(order, cuts) if n else []
+
+    # Number the classes by (arrival, first member), the order they enter READY
+    firsts = np.array([g[0] for g in groups], dtype=np.int64)
+    rank = np.lexsort((firsts, rows[firsts, 0])) if n else firsts
+    members = [groups[i] for i in rank.tolist()]
+    inverse = np.empty(n, dtype=np.int64)
+    for c, g in enumerate(members):
+        inverse[g] = c
+    return inverse, members
+
+
+class BatchGantt(Gantt):
+    """Gantt whose slices run `count` members of a class back to back."""
+
+    def __init__(self, typecode="q"):
+        super().__init__(typecode)
+        self.count = array("q")
+        self.cls = array("q")
+
+    def add(self, h, start, end, count=0, c=-1):
+        super().add(h, start, end)
+        self.count.append(count)
+        self.cls.append(c)
+
+    def to_list(self, pids):
+        return [{
+            "pid": pids[h] if h >= 0 else "IDLE",
+            "class": c if c >= 0 else None,
+            "processes": m,
+            "start": s,
+            "end": e,
+        } for h, c, m, s, e in zip(self.proc, self.cls, self.count, self.start, self.end)]
+
+
+# =========================
+# CLASS ENGINE
+# =========================
+def run_classes(processes, context_switch=0, policy="fcfs", blocked_queue="heap",
+                devices=None, expand=False):
+    """
+    Non-preemptive engine over classes of identical processes.
+
+    Returns (gantt, table, classes, total_time), where classes has the
+    members, per-class sums and, with expand, per-handle completion and
+    response columns.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {list(POLICIES)}")
+    t = _table(processes, policy, context_switch)
+    _, members = classify(t, devices is not None)
+    k = len(members)
+    bursts, burst_end = t.bursts, t.burst_end
+    cs = context_switch
+
+    rep = [int(m[0]) for m in members]
+    arrival = [t.arrival[h] for h in rep]
+    begin = [t.cursor[h] for h in rep]
+    cpu = [t.cpu_total(h) for h in rep]
+    tat_sum, rt_sum, done = [0] * k, [0] * k, [0] * k
+    completion = response = None
+    if expand:
+        dtype = np.int64 if t.typecode == "q" else np.float64
+        completion, response = np.zeros(t.n, dtype=dtype), np.zeros(t.n, dtype=dtype)
+
+    def key(c, cur):
+        if policy == "sjf":
+            return bursts[cur]
+        if policy == "ljf":
+            return -bursts[cur]
+        return t.priority[rep[c]]
+
+    fifo = policy == "fcfs"
+    ready = deque() if fifo else []
+    tie = 0
+    last = {}                   # key -> group queued last with it, which a returning twin can join
+    # Without devices I/O times are known, so the loop looks ahead of the
+    # queue; a timing wheel cannot give back what it has passed, so a heap
+    ahead = devices is None
+    blocked = _blocked(t, "heap" if ahead else blocked_queue, devices)
+    early = deque()             # (time, handle) taken from BLOCKED before they are due
+    waking = {}                 # handle -> (class, cursor) of members doing I/O
+    gantt = BatchGantt(t.typecode)
+
+    def push(group):
+        nonlocal tie
+        if fifo:
+            ready.append(group)
+            last[None] = group
+        else:
+            queued = key(group[3], group[2])
+            heapq.heappush(ready, (queued, tie, group))
+            tie += 1
+            last[queued] = group
+
+    def wake(h):
+        # Back from I/O: behind its twin if nothing has been queued after
+        # it with the same key
+        c, cur = waking.pop(h)
+        twin = last.get(None if fifo else key(c, cur))
+        if twin is not None and twin[4] and twin[3] == c and twin[2] == cur and twin[1] < len(twin[0]):
+            twin[0].append(h)
+        else:
+            push([[h], 0, cur, c, True])
+
+    def next_wake():
+        if early:
+            return early[0][0]
+        return blocked.next_time() if blocked else None
+
+    def take_wake():
+        if not early:
+            when = blocked.next_time()
+            early.extend((when, h) for h in blocked.pop_due(when))
+        return early.popleft()
+
+    time = 0
+    arrived = 0                 # classes that have left NEW
+
+    while arrived < k or ready or blocked or early:
+
+        # NEW → READY, then BLOCKED → READY; a group is
+        # [members, next member, cursor, class, started]
+        while arrived < k and arrival[arrived] <= time:
+            push([members[arrived], 0, begin[arrived], arrived, False])
+            arrived += 1
+        while early and early[0][0] <= time:
+            wake(early.popleft()[1])
+        for h in blocked.pop_due(time):
+            wake(h)
+
+        if ready:
+            group = ready[0] if fifo else ready[0][2]
+            hs, i, cur, c, started = group
+            burst = bursts[cur]
+            step = burst + cs
+            io = cur + 1 < burst_end[rep[c]]
+            back = burst + bursts[cur + 1] if io else 0
+            m = len(hs) - i
+            first = time
+            staged = []
+
+            if not ahead:
+                # Members run back to back until the next arrival or I/O
+                # completion, which could put someone else first
+                horizon = []
+                if arrived < k:
+                    horizon.append(arrival[arrived])
+                if blocked:
+                    horizon.append(blocked.next_time())
+                if io:
+                    horizon.append(time + back)
+                if horizon and step > 0:
+                    m = min(m, max(1, math.ceil((min(horizon) - time) / step)))
+
+            elif m > 1 and step > 0:
+                # Members run back to back until something that goes before
+                # them in READY comes in. Everything else that comes in
+                # meanwhile is queued after the run, in the order it would
+                # have been queued between the members' dispatches.
+                head = None if fifo else key(c, cur)
+
+                def slot(when):     # the dispatch that would admit it
+                    return math.ceil((when - first) / step)
+
+                if io and not fifo and key(c, cur + 2) < head:
+                    m = min(m, slot(first + back))
+                j = arrived
+                while j < k and arrival[j] <= first + (m - 1) * step:
+                    if not fifo and key(j, begin[j]) < head:
+                        m = slot(arrival[j])
+                        break
+                    j += 1
+                taken = []
+                while (when := next_wake()) is not None and when <= first + (m - 1) * step:
+                    when, h = take_wake()
+                    if not fifo and key(*waking[h]) < head:
+                        early.appendleft((when, h))
+                        m = slot(when)
+                        break
+                    taken.append((when, h))
+
+                limit = first + (m - 1) * step
+                while arrived < k and arrival[arrived] <= limit:
+                    staged.append((slot(arrival[arrived]), 0, arrival[arrived], 0, arrived, arrived))
+                    arrived += 1
+                while taken and taken[-1][0] > limit:
+                    early.appendleft(taken.pop())
+                staged.extend((slot(when), 1, when, 0, x, h) for x, (when, h) in enumerate(taken))
+
+            # Member j starts at first + j * step; sums over j < m in closed form
+            end = first + (m - 1) * step + burst
+            series = step * (m * (m - 1) // 2)
+            gantt.add(int(hs[i]), first, end, m, c)
+            if not started:
+                rt_sum[c] += m * (first - arrival[c]) + series
+                if expand:
+                    response[hs[i:i + m]] = first + step * np.arange(m) - arrival[c]
+
+            batch = hs[i:i + m]
+            if io:
+                for j, h in enumerate(batch):
+                    h = int(h)
+                    waking[h] = (c, cur + 2)
+                    when = first + j * step + back
+                    if ahead and when <= end - burst:
+                        staged.append((math.ceil((when - first) / step), 1, when, 1, j, h))
+                    else:
+                        blocked.submit(first + j * step + burst, bursts[cur + 1], h)
+            else:
+                done[c] += m
+                tat_sum[c] += m * (first + burst - arrival[c]) + series
+                if expand:
+                    completion[batch] = first + burst + step * np.arange(m)
+
+            group[1] = i + m
+            if group[1] == len(hs):
+                if fifo:
+                    ready.popleft()
+                else:
+                    heapq.heappop(ready)
+
+            # Arrivals before I/O completions at every dispatch, as above
+            for _, kind, _, _, _, x in sorted(staged):
+                if kind:
+                    wake(x)
+                else:
+                    push([members[x], 0, begin[x], x, False])
+
+            pending = arrived < k or ready or blocked or early
+            time = end + cs if pending else end
+
+        else:
+            # CPU IDLE handling
+            next_times = []
+            if arrived < k:
+                next_times.append(arrival[arrived])
+            if blocked or early:
+                next_times.append(next_wake())
+
+            if next_times:
+                next_time = min(next_times)
+                gantt.add(-1, time, next_time)
+                time = next_time
+
+    classes = {
+        "members": members,
+        "arrival": arrival,
+        "cpu": cpu,
+        "tat": tat_sum,
+        "rt": rt_sum,
+        "done": done,
+        "completion": completion,
+        "response": response,
+    }
+    return gantt, t, classes, time
+
+
+def summarize_classes(gantt, table, classes, total_time):
+    """Response body of run_classes(): per-class averages, per-process rows if expanded."""
+    n = table.n
+    pids = table.pid
+    rows = []
+    total_tat = total_wt = total_rt = 0
+    for c, hs in enumerate(classes["members"]):
+        count = len(hs)
+        tat, rt = classes["tat"][c], classes["rt"][c]
+        wt = tat - classes["cpu"][c] * count
+        total_tat += tat
+        total_wt += wt
+        total_rt += rt
+        h = int(hs[0])
+        rows.append({
+            "class": c,
+            "pid": pids[h],
+            "processes": count,
+            "arrival": classes["arrival"][c],
+            "bursts": table.bursts[table.cursor[h]:table.burst_end[h]].tolist(),
+            "average": {"tat": tat / count, "wt": wt / count, "rt": rt / count},
+        })
+
+    response = {
+        "gantt": gantt.to_list(pids),
+        "classes": rows,
+        "average": {
+            "tat": total_tat / n if n else 0,
+            "wt": total_wt / n if n else 0,
+            "rt": total_rt / n if n else 0
+        },
+        "system": {
+            "total_time": total_time,
+            "throughput": n / total_time if total_time > 0 else 0
+        }
+    }
+
+    completion = classes["completion"]
+    if completion is not None:
+        # Rows like summarize(), in completion order
+        arrival = np.frombuffer(table.arrival, dtype=completion.dtype)
+        cpu = np.array(classes["cpu"], dtype=completion.dtype)
+        burst_time = np.empty(n, dtype=completion.dtype)
+        for c, hs in enumerate(classes["members"]):
+            burst_time[hs] = cpu[c]
+        order = np.argsort(completion, kind="stable")
+        tat = completion - arrival
+        response["processes"] = [{
+            "pid": pids[h],
+            "arrival": a,
+            "burst_time": b,
+            "completion_time": e,
+            "tat": x,
+            "wt": x - b,
+            "rt": r
+        } for h, a, b, e, x, r in zip(
+            order.tolist(), arrival[order].tolist(), burst_time[order].tolist(),
+            completion[order].tolist(), tat[order].tolist(), classes["response"][order].tolist()
+        )]
+
+    devices = getattr(table, "devices", None)
+    if devices is not None:
+        response["devices"] = devices.report(total_time)
+
+    return response
@@ -0,0 +1,196 @@
+"""
+Finite I/O devices: BLOCKED processes queue for a device instead of all
+doing I/O in parallel.
+
+A request body can configure devices with
+
+    "devices": [{"name": "disk0", "capacity": 1, "discipline": "sstf",
+                 "seek_time": 0}]
+
+and processes pick one with "device" (default: the first device) and a
+"track" (default 0) for SSTF. Each device serves up to `capacity`
+requests at once. Waiting requests are served in arrival order (fifo)
+or nearest track to the head first (sstf). Every dispatch moves the head
+and adds seek_time per track of distance to the I/O burst.
+
+DeviceSet is a drop-in BLOCKED queue for the engines (submit, next_time,
+pop_due, __len__). Completions are processed in time order whenever
+the engine submits or polls, so a slot freed at time t goes to the
+requests that were waiting at t. A handle is released to READY at its
+completion time, like the plain blocked queues.
+"""
+from bisect import bisect_left, insort
+from collections import deque
+import heapq
+import math
+
+
+DISCIPLINES = ("fifo", "sstf")
+
+
+class Device:
+
+    def __init__(self, name, capacity=1, discipline="fifo", seek_time=0):
+        if discipline not in DISCIPLINES:
+            raise ValueError(
+                f"{name}: unknown discipline {discipline!r}, expected one of {list(DISCIPLINES)}"
+            )
+        if type(capacity) is not int or capacity < 1:
+            raise ValueError(f"{name}: capacity must be a positive integer")
+        if type(seek_time) not in (int, float) or not 0 <= seek_time < math.inf:
+            raise ValueError(f"{name}: seek_time must be a non-negative number")
+
+        self.name = name
+        self.capacity = capacity
+        self.discipline = discipline
+        self.seek_time = seek_time
+        self.busy = 0                 # requests in service
+        self.head = 0
+        # fifo: deque of (submitted, h, duration, track)
+        # sstf: a deque per track, plus the sorted tracks that have one
+        self.waiting = deque()
+        self.tracks = []
+        self.by_track = {}
+        self.queued = 0
+
+        self.requests = 0
+        self.busy_time = 0
+        self.wait_time = 0
+        self.max_queue = 0
+
+    def take(self):
+        """Remove and return the next waiting request as (submitted, h, duration, track)."""
+        self.queued -= 1
+        if self.discipline == "fifo":
+            return self.waiting.popleft()
+
+        tracks, head = self.tracks, self.head
+        i = bisect_left(tracks, head)
+        if i == len(tracks) or (i and head - tracks[i - 1] <= tracks[i] - head):
+            i -= 1                    # ties go to the lower track
+        track = tracks[i]
+        bucket = self.by_track[track]
+        request = bucket.popleft()
+        if not bucket:
+            del self.by_track[track]
+            del tracks[i]
+        return request
+
+    def queue(self, request):
+        if self.discipline == "fifo":
+            self.waiting.append(request)
+        else:
+            track = request[3]
+            bucket = self.by_track.get(track)
+            if bucket is None:
+                bucket = self.by_track[track] = deque()
+                insort(self.tracks, track)
+            bucket.append(request)
+        self.queued += 1
+        self.max_queue = max(self.max_queue, self.queued)
+
+    def report(self, total_time):
+        span = self.capacity * total_time
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "discipline": self.discipline,
+            "requests": self.requests,
+            "busy_time": self.busy_time,
+            "utilization": self.busy_time / span if span > 0 else 0,
+            # Little's law: time-average queue depth = total waiting / time
+            "avg_queue": self.wait_time / total_time if total_time > 0 else 0,
+            "max_queue": self.max_queue,
+            "avg_wait": self.wait_time / self.requests if self.requests else 0,
+        }
+
+
+class DeviceSet:
+
+    def __init__(self, config, processes, typecode="q"):
+        # typecode: the table's time typecode; seek times add to its times
+        if not config:
+            raise ValueError("devices needs at least one device")
+        self.devices = [Device(
+            d["name"],
+            d.get("capacity", 1),
+            d.get("discipline", "fifo"),
+            d.get("seek_time", 0),
+        ) for d in config]
+        if typecode == "q" and any(type(d.seek_time) is not int for d in self.devices):
+            raise ValueError("seek_time must be an integer like the process times")
+        index = {d.name: i for i, d in enumerate(self.devices)}
+
+        self.device_of = []
+        self.track_of = []
+        for p in processes:
+            name = p.get("device", self.devices[0].name)
+            if name not in index:
+                raise ValueError(f"{p['pid']}: unknown device {name!r}")
+            track = p.get("track", 0)
+            if type(track) not in (int, float) or not math.isfinite(track):
+                raise ValueError(f"{p['pid']}: track must be a number")
+            if typecode == "q" and type(track) is not int:
+                raise ValueError(f"{p['pid']}: track must be an integer like the process times")
+            self.device_of.append(index[name])
+            self.track_of.append(track)
+
+        self.running = []             # heap of (done, seq, h)
+        self.done = deque()           # completed, in completion order, not yet polled
+        self.count = 0
+        self.seq = 0
+
+    def __len__(self):
+        return self.count
+
+    def submit(self, now, duration, h):
+        self._advance(now)
+        self.count += 1
+        device = self.devices[self.device_of[h]]
+        device.requests += 1
+        if device.busy < device.capacity:
+            self._start(device, now, now, h, duration, self.track_of[h])
+        else:
+            device.queue((now, h, duration, self.track_of[h]))
+
+    def next_time(self):
+        if self.done:
+            return self.done[0][0]
+        return self.running[0][0] if self.running else None
+
+    def pop_due(self, now):
+        self._advance(now)
+        done = self.done
+        due = []
+        while done and done[0][0] <= now:
+            due.append(done.popleft()[1])
+        self.count -= len(due)
+        return due
+
+    def report(self, total_time):
+        return [d.report(total_time) for d in self.devices]
+
+    # -------------------------
+    # INTERNALS
+    # -------------------------
+    def _start(self, device, now, submitted, h, duration, track):
+        service = duration + device.seek_time * abs(track - device.head)
+        device.head = track
+        device.busy += 1
+        device.busy_time += service
+        device.wait_time += now - submitted
+        heapq.heappush(self.running, (now + service, self.seq, h))
+        self.seq += 1
+
+    def _advance(self, now):
+        # Finish everything due by `now`, handing each freed slot to the
+        # next waiting request at the moment it was freed
+        running = self.running
+        while running and running[0][0] <= now:
+            when, _, h = heapq.heappop(running)
+            self.done.append((when, h))
+            device = self.devices[self.device_of[h]]
+            device.busy -= 1
+            if device.queued:
+                submitted, nxt, duration, track = device.take()
+                self._start(device, when, submitted, nxt, duration, track)
@@ -0,0 +1,349 @@
+"""
+Scheduling engines shared by the API views and the batch tools.
+
+Each engine takes the request's process list and returns
+(gantt, table, completed, total_time): a columnar Gantt, the
+struct-of-arrays ProcessTable, the handles of completed processes in
+completion order and the end time. summarize() turns that into the
+response body the views send. A table from with_metrics() makes them
+record no Gantt and fold completions into running aggregates instead,
+for summarize_metrics(), and one from trace.with_trace() streams the
+schedule out as trace events. Nothing in here imports Django, so the engines
+also run in worker processes.
+"""
+from array import array
+from collections import deque
+import heapq
+
+from .blocked_queue import make_blocked_queue
+from .devices import DeviceSet
+from .indexed_heap import IndexedHeap
+from .process_table import Gantt, NullGantt, ProcessTable
+from .profiling import phase
+
+
+# =========================
+# READY QUEUE ORDERINGS
+# =========================
+# key(table, h) for the min-heap READY queue; None = plain FIFO
+NON_PREEMPTIVE_KEYS = {
+    "fcfs": None,
+    "sjf": lambda t, h: t.bursts[t.cursor[h]],
+    "ljf": lambda t, h: -t.bursts[t.cursor[h]],
+    "priority": lambda t, h: t.priority[h],    # lower number = higher priority
+}
+
+PREEMPTIVE_KEYS = {
+    "srtf": lambda t, h: t.remaining[h],
+    "lrtf": lambda t, h: -t.remaining[h],
+    "prtf": lambda t, h: t.priority[h],
+}
+
+NEEDS_PRIORITY = {"priority", "prtf"}
+
+
+def _table(processes, policy, context_switch=0):
+    # processes: the request's list, or a ProcessTable built from a
+    # generator spec (workload.synthesize)
+    if isinstance(processes, ProcessTable):
+        table = processes
+        if table.typecode == "q" and type(context_switch) is not int:
+            raise ValueError("context_switch must be an integer like the process times")
+    else:
+        table = ProcessTable(processes, context_switch)
+    if policy in NEEDS_PRIORITY and table.n and table.priority is None:
+        raise ValueError(f"{policy} needs a priority for every process")
+    if policy in PREEMPTIVE_KEYS and table.typecode == "d":
+        # The preemptive engine steps one time unit at a time
+        if any(x % 1 for x in table.arrival) or any(x % 1 for x in table.bursts):
+            raise ValueError(f"{policy} runs in whole time units: arrival and burst times must be integers")
+    return table
+
+
+def _sinks(table):
+    # Where an engine records its schedule: a Gantt and the completion
+    # order, nothing and running aggregates in metrics mode, or a trace
+    # writer for both (see trace.py)
+    trace = getattr(table, "trace_writer", None)
+    if trace is not None:
+        return trace, trace
+    metrics = getattr(table, "metrics", None)
+    if metrics is None:
+        return Gantt(table.typecode), []
+    return NullGantt(), metrics
+
+
+def with_metrics(processes, context_switch=0):
+    """Table for a metrics-only run (see aggregates.py); engines accept it in place of processes."""
+    from .aggregates import OnlineMetrics
+
+    if isinstance(processes, ProcessTable):
+        table = processes
+    else:
+        table = ProcessTable(processes, context_switch)
+    table.metrics = OnlineMetrics(table)
+    return table
+
+
+def _blocked(table, kind, devices=None):
+    # Unlimited parallel I/O, or finite devices when the request has them;
+    # the table keeps the devices so summarize() can report on them
+    if devices is None:
+        blocked = make_blocked_queue(kind)
+    else:
+        blocked = table.devices = DeviceSet(devices, table.records, table.typecode)
+    trace = getattr(table, "trace_writer", None)
+    return blocked if trace is None else trace.watch(blocked)
+
+
+# =========================
+# NON-PREEMPTIVE ENGINE (FCFS / SJF / LJF / PRIORITY)
+# =========================
+def run_nonpreemptive(processes, context_switch=0, policy="fcfs", blocked_queue="heap",
+                      devices=None):
+    key = NON_PREEMPTIVE_KEYS[policy]
+    t = _table(processes, policy, context_switch)
+
+    bursts, cursor, burst_end = t.bursts, t.cursor, t.burst_end
+    burst_time, started = t.burst_time, t.started
+
+    time = 0
+    gantt, completed = _sinks(t)
+    tie = 0                     # tie-breaker for heap
+
+    # NEW queue (handles sorted by arrival time)
+    new = t.by_arrival()
+    arrived = 0                 # new[:arrived] have left NEW
+
+    ready = deque() if key is None else []
+    blocked = _blocked(t, blocked_queue, devices)
+
+    while arrived < len(new) or ready or blocked:
+
+        # NEW → READY, then BLOCKED → READY
+        due = []
+        while arrived < len(new) and t.arrival[new[arrived]] <= time:
+            due.append(new[arrived])
+            arrived += 1
+        due.extend(blocked.pop_due(time))
+
+        if key is None:
+            ready.extend(due)
+        else:
+            for h in due:
+                heapq.heappush(ready, (key(t, h), tie, h))
+                tie += 1
+
+        if ready:
+            h = ready.popleft() if key is None else heapq.heappop(ready)[2]
+
+            c = cursor[h]
+            cpu_time = bursts[c]
+            start = time
+            end = start + cpu_time
+
+            # Response time only once
+            if not started[h]:
+                started[h] = 1
+                t.response[h] = start - t.arrival[h]
+
+            gantt.add(h, start, end)
+            burst_time[h] += cpu_time
+
+            # If IO burst exists → BLOCKED
+            if c + 1 < burst_end[h]:
+                blocked.submit(end, bursts[c + 1], h)
+                cursor[h] = c + 2
+            else:
+                cursor[h] = c + 1
+                t.completion[h] = end
+                completed.append(h)
+
+            pending = arrived < len(new) or ready or blocked
+            time = end + context_switch if pending else end
+
+        else:
+            # CPU IDLE handling
+            next_times = []
+            if arrived < len(new):
+                next_times.append(t.arrival[new[arrived]])
+            if blocked:
+                next_times.append(blocked.next_time())
+
+            if next_times:
+                next_time = min(next_times)
+                gantt.add(-1, time, next_time)
+                time = next_time
+
+    return gantt, t, completed, time
+
+
+# =========================
+# PREEMPTIVE ENGINE (SRTF / LRTF / PREEMPTIVE PRIORITY)
+# 1-unit time steps, CPU bursts only
+# =========================
+def run_preemptive(processes, policy="srtf"):
+    key = PREEMPTIVE_KEYS[policy]
+    t = _table(processes, policy)
+    t.remaining = array(t.typecode, [t.cpu_total(h) for h in range(t.n)])
+
+    remaining, burst_time, started = t.remaining, t.burst_time, t.started
+
+    time = 0
+    gantt, completed = _sinks(t)
+    tie = 0
+
+    new = t.by_arrival()
+    arrived = 0
+    ready = IndexedHeap(t.n)    # (key, tie) per handle; the running process stays queued
+    current = None
+
+    while arrived < len(new) or ready:
+
+        while arrived < len(new) and t.arrival[new[arrived]] <= time:
+            h = new[arrived]
+            ready.push(h, (key(t, h), tie))
+            tie += 1
+            arrived += 1
+
+        # The running process goes behind everything already waiting on an
+        # equal key; its entry moves in place instead of being re-pushed.
+        if current is not None:
+            ready.update(current, (key(t, current), tie))
+            tie += 1
+            current = None
+
+        if ready:
+            h = ready.peek()
+
+            if not started[h]:
+                started[h] = 1
+                t.response[h] = time - t.arrival[h]
+
+            start = time
+            remaining[h] -= 1
+            burst_time[h] += 1
+            time += 1
+
+            gantt.add(h, start, time)
+
+            if remaining[h] == 0:
+                ready.pop()
+                t.completion[h] = time
+                completed.append(h)
+            else:
+                current = h
+        else:
+            time += 1
+
+    return gantt, t, completed, time
+
+
+# =========================
+# POLICY REGISTRY
+# =========================
+def run_policy(policy, processes, context_switch=0, blocked_queue="heap", devices=None):
+    if policy in NON_PREEMPTIVE_KEYS:
+        return run_nonpreemptive(processes, context_switch, policy, blocked_queue, devices)
+    if policy in PREEMPTIVE_KEYS:
+        return run_preemptive(processes, policy)
+    raise ValueError(
+        f"unknown policy {policy!r}, expected one of {sorted(POLICIES)}"
+    )
+
+
+POLICIES = sorted([*NON_PREEMPTIVE_KEYS, *PREEMPTIVE_KEYS])
+
+
+def simulate(policy, processes, context_switch=0, blocked_queue="heap", devices=None,
+             metrics=False):
+    """Run a policy and return the summarized response body."""
+    if metrics:
+        processes = with_metrics(processes, context_switch)
+    elif policy in NON_PREEMPTIVE_KEYS and devices is None:
+        from .fastpath import try_fast_path, try_fast_path_table
+
+        with phase("simulate"):
+            if isinstance(processes, ProcessTable):
+                result = try_fast_path_table(processes, context_switch, policy)
+            else:
+                result = try_fast_path(processes, context_switch, policy)
+        if result is not None:
+            return result
+
+    with phase("simulate"):
+        run = run_policy(policy, processes, context_switch, blocked_queue, devices)
+    with phase("build_response"):
+        return summarize_metrics(*run) if metrics else summarize(*run)
+
+
+# =========================
+# METRICS
+# =========================
+def summarize(gantt, table, completed, total_time):
+    n = len(completed)
+    total_tat = total_wt = total_rt = 0
+    result = []
+    pids = table.pid
+
+    for h in completed:
+        arrival = table.arrival[h]
+        completion = table.completion[h]
+        burst_time = table.burst_time[h]
+        tat = completion - arrival
+        wt = tat - burst_time
+        rt = table.response[h]
+
+        total_tat += tat
+        total_wt += wt
+        total_rt += rt
+
+        result.append({
+            "pid": pids[h],
+            "arrival": arrival,
+            "burst_time": burst_time,
+            "completion_time": completion,
+            "tat": tat,
+            "wt": wt,
+            "rt": rt
+        })
+
+    response = {
+        "gantt": gantt.to_list(pids),
+        "processes": result,
+        "average": {
+            "tat": total_tat / n if n else 0,
+            "wt": total_wt / n if n else 0,
+            "rt": total_rt / n if n else 0
+        },
+        "system": {
+            "total_time": total_time,
+            "throughput": n / total_time if total_time > 0 else 0
+        }
+    }
+
+    devices = getattr(table, "devices", None)
+    if devices is not None:
+        response["devices"] = devices.report(total_time)
+
+    return response
+
+
+def summarize_metrics(gantt, table, completed, total_time):
+    """Response body of a metrics-only run: no Gantt and no per-process rows."""
+    stats = completed.report()
+    n = len(completed)
+    response = {
+        "average": {name: stats[name]["mean"] for name in ("tat", "wt", "rt")},
+        "system": {
+            "total_time": total_time,
+            "throughput": n / total_time if total_time > 0 else 0
+        },
+        "metrics": stats,
+    }
+
+    devices = getattr(table, "devices", None)
+    if devices is not None:
+        response["devices"] = devices.report(total_time)
+
+    return response
@@ -0,0 +1,299 @@
+"""
+Analytic estimates: closed-form queueing results instead of a run.
+
+fit() reduces a workload to an arrival rate and its CPU bursts. Every
+CPU burst is a visit to the CPU, so a process with I/O visits it several
+times, and its I/O time is added to WT as the engine does (wt = tat -
+CPU time). Visits are grouped into classes served in order: one class
+for fcfs, burst lengths for sjf / srtf, reversed burst lengths for ljf
+and priorities for priority / prtf. The preemptive engine runs whole
+processes without I/O, one time unit at a time, so there a process is a
+single visit of its total CPU time.
+
+When the CPU is stable (utilisation rho < 1), the M/G/1 steady state:
+
+  * fcfs: Pollaczek-Khinchine;
+  * sjf / ljf / priority: non-preemptive priority classes (Cobham);
+  * srtf: SRPT (Schrage and Miller);
+  * prtf: preemptive-resume priority classes, with processor sharing
+    within a class since equal priorities take turns every time unit.
+
+lrtf has no closed form and is not estimated.
+
+A finite workload cannot wait longer than it would if every process
+arrived at once, so steady-state waits are capped by that batch.
+
+When rho >= 1 there is no steady state, and the fluid limit is used
+over the arrival span T: the classes that fit in the CPU keep their
+steady-state waits, the first one that does not gets what capacity is
+left until T and the rest wait for T.
+
+The bounds add, to the spread from the confidence interval of the
+arrival rate, the run-to-run noise of a finite workload's average wait,
+from the reflected Brownian motion approximation (Whitt):
+relative variance 2 (ca^2 + cs^2) / (n (1 - rho)^2).
+"""
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from .process_table import ProcessTable
+
+
+POLICIES = ("fcfs", "sjf", "ljf", "priority", "srtf", "prtf")
+
+NEEDS_PRIORITY = ("priority", "prtf")
+
+PREEMPTIVE = ("srtf", "prtf")
+
+
+# =========================
+# FIT
+# =========================
+def fit(processes, context_switch=0, whole=False):
+    """Arrival rate and CPU visits of a request's processes (list or ProcessTable)."""
+    t = processes if isinstance(processes, ProcessTable) else ProcessTable(processes)
+    dtype = np.int64 if t.typecode == "q" else np.float64
+    n = t.n
+    arrival = np.frombuffer(t.arrival, dtype=dtype).astype(float)
+    bursts = np.frombuffer(t.bursts, dtype=dtype).astype(float)
+    end = np.frombuffer(t.burst_end, dtype=np.int64)
+    counts = np.diff(end, prepend=0)
+
+    owner = np.repeat(np.arange(n), counts)
+    offset = np.arange(len(bursts)) - np.repeat(end - counts, counts)
+    cpu = offset % 2 == 0
+    size = bursts[cpu] + context_switch         # a dispatch costs its burst plus the switch
+    if whole:
+        # One visit per process, I/O ignored
+        size = np.bincount(owner[cpu], weights=size, minlength=n)
+        owner, offset = np.arange(n), np.zeros(n, dtype=np.int64)
+        bursts, cpu = size, np.ones(n, dtype=bool)
+
+    gaps = np.diff(np.sort(arrival))
+    span = float(gaps.sum())
+    priority = None
+    if t.priority is not None:
+        priority = np.frombuffer(t.priority, dtype=np.int64 if t.priority.typecode == "q" else np.float64)
+    return {
+        "n": n,
+        "rate": (n - 1) / span if span > 0 else math.inf,
+        "arrival_scv": float(gaps.var() / gaps.mean() ** 2) if span > 0 else 0.0,
+        "arrival": arrival,
+        "priority": priority,
+        "owner": owner[cpu],                    # process of every visit
+        "first": offset[cpu] == 0,
+        "size": size,
+        "cpu": np.bincount(owner[cpu], weights=size, minlength=n),
+        "io": float(bursts[~cpu].sum()) / n if n else 0.0,
+    }
+
+
+def _keys(policy, f):
+    size = f["size"]
+    if policy == "fcfs":
+        return np.zeros(len(size))
+    if policy in ("sjf", "srtf"):
+        return size
+    if policy == "ljf":
+        return -size
+    return f["priority"][f["owner"]]
+
+
+def _classes(keys, size):
+    # Share of the visits, first and second moment of every class, in the
+    # order classes are served
+    keys, inverse, count = np.unique(keys, return_inverse=True, return_counts=True)
+    m1 = np.bincount(inverse, weights=size) / count
+    m2 = np.bincount(inverse, weights=size * size) / count
+    return inverse, count / len(size), m1, m2
+
+
+# =========================
+# STEADY STATE (rho < 1)
+# =========================
+def _steady(policy, lam, m1, m2, above, below):
+    """(wt, rt) per class; above / below: load of the classes up to / before it."""
+    if policy in ("fcfs", "sjf", "ljf", "priority"):
+        queue = (lam * m2).sum() / 2 / ((1 - below) * (1 - above))
+        return queue, queue
+    if policy == "srtf":
+        # Classes are the distinct burst lengths x_k, in increasing order
+        x = m1
+        later = lam[::-1].cumsum()[::-1] - lam  # rate of the longer bursts
+        queue = (np.cumsum(lam * m2) + x * x * later) / (2 * (1 - above) ** 2)
+        residence = np.cumsum(np.diff(x, prepend=0) / (1 - below))
+        return queue + residence - x, queue
+
+    # prtf: higher classes preempt, the class itself shares the CPU
+    higher = (np.cumsum(lam * m2) - lam * m2) / 2
+    response = m1 / (1 - above) + higher / ((1 - below) * (1 - above))
+    # A newcomer waits for one turn of its class and for higher-class work
+    first = (lam * response + higher / (1 - below)) / (1 - below)
+    return response - m1, first
+
+
+# =========================
+# BATCH AND FLUID (rho >= 1)
+# =========================
+def _batch(policy, f):
+    # Mean wait when every process arrives at once: each waits for the
+    # CPU time of the processes served before it
+    cpu = f["cpu"]
+    if policy == "fcfs":
+        order = np.argsort(f["arrival"], kind="stable")
+    elif policy in ("sjf", "srtf"):
+        order = np.argsort(cpu, kind="stable")
+    elif policy == "ljf":
+        order = np.argsort(-cpu, kind="stable")
+    else:
+        order = np.lexsort((f["arrival"], f["priority"]))
+    ahead = np.cumsum(cpu[order]) - cpu[order]
+    return float(ahead.mean())
+
+
+def _fluid(lam, load, above, below, span):
+    """Class waits when arrivals, spread evenly over [0, T], need more than the CPU.
+
+    Classes are served in order at the fluid rate. Returns the critical
+    class, the waits and the waits without the own-class queue, which is
+    what a class sharing the CPU (prtf) waits for its first turn.
+    """
+    critical = int(np.argmax(above >= 1))
+    wait = np.zeros(len(load))
+    shared = np.zeros(len(load))
+
+    # The critical class gets c = 1 - sigma_(k-1) until T and all of the
+    # CPU after: its work arriving at uT has uT (a - c) queued ahead, which
+    # takes until T for u < c / a
+    a, c = load[critical], 1 - below[critical]
+    u0 = c / a
+    early = (a - c) / c * u0 * u0 / 2 if c > 0 else 0.0
+    late = (1 - c) * (1 - u0) ** 2 / 2 + (a - c) * (1 - u0 * u0) / 2
+    wait[critical] = span * (early + late)
+    # Sharing, it waits one turn of the processes of its class in the
+    # system instead, about lam uT (1 - c / a) of them
+    shared[critical] = lam[critical] * span * (1 - u0) / 2 / c if c > 0 else span / 2
+
+    # Later classes wait for T, then for the backlog of the classes before them
+    rest = slice(critical + 1, None)
+    shared[rest] = span / 2 + (below[rest] - 1) * span
+    wait[rest] = shared[rest] + load[rest] * span / 2
+    return critical, wait, shared
+
+
+def _waits(policy, f, rate, classes, batch):
+    """(model, wt, rt, utilisation) at a given arrival rate, I/O time not included."""
+    inverse, share, m1, m2 = classes
+    n, first = f["n"], f["first"]
+    if not math.isfinite(rate):
+        return "batch", batch, batch, math.inf
+
+    visit_rate = rate * len(f["size"]) / n
+    lam = visit_rate * share
+    load = lam * m1
+    above = np.cumsum(load)                     # sigma_k
+    below = above - load                        # sigma_(k-1)
+    utilisation = float(above[-1])
+
+    if utilisation < 1:
+        wait, response = _steady(policy, lam, m1, m2, above, below)
+        model = "m/g/1"
+    else:
+        critical, wait, shared = _fluid(lam, load, above, below, (n - 1) / rate)
+        response = shared if policy == "prtf" else wait.copy()
+        if critical:
+            stable = slice(None, critical)
+            wait[stable], response[stable] = _steady(
+                policy, lam[stable], m1[stable], m2[stable], above[stable], below[stable]
+            )
+        model = "fluid"
+
+    wt = float(wait[inverse].sum()) / n
+    rt = float(response[inverse][first].sum()) / n
+    if model == "m/g/1":
+        wt, rt = min(wt, batch), min(rt, batch)
+    return model, wt, rt, utilisation
+
+
+def estimate(policy, processes, context_switch=0, confidence=0.95):
+    """Predicted average TAT, WT and RT of a policy, without running it."""
+    if policy not in POLICIES:
+        raise ValueError(f"no estimate for policy {policy!r}, expected one of {list(POLICIES)}")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    preemptive = policy in PREEMPTIVE
+    f = fit(processes, 0 if preemptive else context_switch, whole=preemptive)
+    n = f["n"]
+    if n == 0:
+        raise ValueError("no processes to estimate")
+    if policy in NEEDS_PRIORITY and f["priority"] is None:
+        raise ValueError(f"{policy} needs a priority for every process")
+
+    size = f["size"]
+    scv = float(size.var() / size.mean() ** 2) if size.mean() > 0 else 0.0
+    classes = _classes(_keys(policy, f), size)
+    batch = _batch(policy, f)
+    rate = f["rate"]
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    # Arrival rate interval: the number of arrivals is about normal, sd sqrt(n)
+    if math.isfinite(rate):
+        spread = z / math.sqrt(n - 1)
+        rates = (rate * max(0.0, 1 - spread), rate, rate * (1 + spread))
+    else:
+        rates = (rate, rate, rate)
+    points = [_waits(policy, f, r, classes, batch) for r in rates]
+    model, wt, rt, utilisation = points[1]
+
+    # Run-to-run noise of the average wait of n processes
+    noise = 0.0
+    if model == "m/g/1":
+        noise = z * math.sqrt(2 * (f["arrival_scv"] + scv) / n) / (1 - utilisation)
+
+    def bounds(values):
+        return [max(0.0, min(values) * (1 - noise)), max(values) * (1 + noise)]
+
+    io = f["io"]
+    cpu = float(f["cpu"].mean())
+    if not preemptive:
+        cpu -= context_switch * len(size) / n
+    wts = bounds([p[1] for p in points])
+    return {
+        "model": model,
+        "average": {"tat": wt + io + cpu, "wt": wt + io, "rt": rt},
+        "bounds": {
+            "tat": [w + io + cpu for w in wts],
+            "wt": [w + io for w in wts],
+            "rt": bounds([p[2] for p in points]),
+        },
+        "confidence": confidence,
+        "system": {
+            "arrival_rate": rate if math.isfinite(rate) else None,
+            "utilisation": utilisation if math.isfinite(utilisation) else None,
+            "stable": utilisation < 1,
+        },
+        "fit": {
+            "processes": n,
+            "cpu_bursts": len(size),
+            "cpu_burst_mean": float(size.mean()),
+            "cpu_burst_scv": scv,
+            "arrival_scv": f["arrival_scv"],
+            "io_per_process": io,
+        },
+    }
+
+
+def deviation(estimated, simulated):
+    """How far an estimate was from a simulated run's averages."""
+    result = {}
+    for name, value in simulated["average"].items():
+        guess = estimated["average"][name]
+        low, high = estimated["bounds"][name]
+        result[name] = {
+            "absolute": guess - value,
+            "relative": (guess - value) / value if value else None,
+            "within_bounds": low <= value <= high,
+        }
+    return result
@@ -0,0 +1,141 @@
+"""
+Closed-form schedules for the common no-I/O cases.
+
+When every process has a single integer CPU burst:
+
+  * FCFS is a recurrence over arrival order,
+        start[i] = max(arrival[i], end[i-1] + context_switch)
+    which becomes a running maximum once the cumulative burst time is
+    subtracted out.
+  * SJF / LJF / priority with every process arriving together is a
+    stable sort on the key followed by a cumulative sum.
+
+Both produce exactly what engine.run_nonpreemptive would, including
+IDLE slices, tie order and averages; anything else returns None and
+the general engine takes over.
+"""
+import numpy as np
+
+
+def try_fast_path(processes, context_switch, policy):
+    if not processes or type(context_switch) is not int:
+        return None
+
+    try:
+        bursts = np.array([b for (b,) in (p["bursts"] for p in processes)])
+    except ValueError:
+        return None                 # some process has I/O
+    arrival = np.array([p["arrival"] for p in processes])
+
+    if bursts.dtype.kind != "i" or arrival.dtype.kind != "i":
+        return None
+
+    order = _order(policy, arrival, bursts, lambda: np.array([p["priority"] for p in processes]))
+    if order is None:
+        return None
+
+    pids = [processes[i]["pid"] for i in order.tolist()]
+    return _schedule(pids, arrival[order], bursts[order], context_switch)
+
+
+def try_fast_path_table(table, context_switch, policy):
+    """try_fast_path() for a generated or stored ProcessTable that has not run yet."""
+    if not table.n or type(context_switch) is not int or table.typecode != "q":
+        return None
+    if policy == "priority" and (table.priority is None or table.priority.typecode != "q"):
+        return None
+
+    cursor = np.frombuffer(table.cursor, dtype=np.int64)
+    if not (np.frombuffer(table.burst_end, dtype=np.int64) - cursor == 1).all():
+        return None                 # some process has I/O
+    bursts = np.frombuffer(table.bursts, dtype=np.int64)
+    arrival = np.frombuffer(table.arrival, dtype=np.int64)
+
+    order = _order(policy, arrival, bursts, lambda: np.frombuffer(table.priority, dtype=np.int64))
+    if order is None:
+        return None
+
+    pids = [table.pid[i] for i in order.tolist()]
+    return _schedule(pids, arrival[order], bursts[order], context_switch)
+
+
+def _order(policy, arrival, bursts, priority):
+    # Dispatch order, or None when there is no closed form
+    if policy == "fcfs":
+        return np.argsort(arrival, kind="stable")
+    if arrival.min() != arrival.max():
+        return None
+    if policy == "sjf":
+        key = bursts
+    elif policy == "ljf":
+        key = -bursts
+    elif policy == "priority":
+        key = priority()
+        if key.dtype.kind != "i":
+            return None
+    else:
+        return None
+    return np.argsort(key, kind="stable")
+
+
+def _schedule(pids, arrival, bursts, context_switch):
+    n = len(pids)
+
+    # offset[i]: CPU + switch time dispatched before i if there were no gaps
+    offset = np.zeros(n, dtype=np.int64)
+    np.cumsum(bursts[:-1] + context_switch, out=offset[1:])
+
+    start = np.maximum.accumulate(np.maximum(arrival - offset, 0)) + offset
+    end = start + bursts
+
+    # free[i]: time the CPU is free for process i, idle[i]: gap before i
+    free = np.empty(n, dtype=np.int64)
+    free[0] = 0
+    free[1:] = end[:-1] + context_switch
+    idle = start > free
+
+    tat = end - arrival
+    wt = tat - bursts
+    rt = start - arrival
+
+    arrival_l, bursts_l, start_l, end_l = (
+        arrival.tolist(), bursts.tolist(), start.tolist(), end.tolist()
+    )
+
+    gantt = []
+    if idle.any():
+        idle_l, free_l = idle.tolist(), free.tolist()
+        for i in range(n):
+            if idle_l[i]:
+                gantt.append({"pid": "IDLE", "start": free_l[i], "end": start_l[i]})
+            gantt.append({"pid": pids[i], "start": start_l[i], "end": end_l[i]})
+    else:
+        gantt = [{"pid": pid, "start": s, "end": e}
+                 for pid, s, e in zip(pids, start_l, end_l)]
+
+    result = [{
+        "pid": pid,
+        "arrival": a,
+        "burst_time": b,
+        "completion_time": c,
+        "tat": t,
+        "wt": w,
+        "rt": r
+    } for pid, a, b, c, t, w, r in zip(
+        pids, arrival_l, bursts_l, end_l, tat.tolist(), wt.tolist(), rt.tolist()
+    )]
+
+    total_time = end_l[-1]
+    return {
+        "gantt": gantt,
+        "processes": result,
+        "average": {
+            "tat": int(tat.sum()) / n,
+            "wt": int(wt.sum()) / n,
+            "rt": int(rt.sum()) / n
+        },
+        "system": {
+            "total_time": total_time,
+            "throughput": n / total_time if total_time > 0 else 0
+        }
+    }
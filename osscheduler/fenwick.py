@@ -0,0 +1,46 @@
+"""
+Fenwick (binary indexed) tree over integer weights.
+
+Used by the lottery scheduler: each process handle holds its tickets,
+and drawing a winner is a prefix-sum search in O(log n) instead of a
+linear scan over the ticket holders.
+"""
+
+
+class Fenwick:
+
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+        self.total = 0
+        self.top = 1 << (n.bit_length() - 1) if n else 0   # highest power of two <= n
+
+    def add(self, i, delta):
+        self.total += delta
+        i += 1
+        tree, n = self.tree, self.n
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Sum of weights[0:i]."""
+        tree = self.tree
+        s = 0
+        while i:
+            s += tree[i]
+            i &= i - 1
+        return s
+
+    def find(self, r):
+        """Smallest i with prefix(i + 1) > r, for 0 <= r < total."""
+        tree, n = self.tree, self.n
+        i = 0
+        step = self.top
+        while step:
+            j = i + step
+            if j <= n and tree[j] <= r:
+                i = j
+                r -= tree[j]
+            step >>= 1
+        return i
@@ -0,0 +1,118 @@
+"""
+Addressable binary min-heap over integer process handles.
+
+Unlike heapq, every handle's position is tracked, so a queued process
+can have its key changed or be removed in O(log n) without pushing a
+duplicate entry. Keys are any comparable values, typically
+(key, tie) tuples.
+"""
+
+
+class IndexedHeap:
+
+    def __init__(self, capacity=0):
+        self.heap = []                  # handles
+        self.keys = [None] * capacity   # keys[h]
+        self.pos = [-1] * capacity      # pos[h] in heap, -1 if absent
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, h):
+        return h < len(self.pos) and self.pos[h] >= 0
+
+    def peek(self):
+        return self.heap[0]
+
+    def peek_key(self):
+        return self.keys[self.heap[0]]
+
+    def push(self, h, key):
+        if h >= len(self.pos):
+            grow = h + 1 - len(self.pos)
+            self.keys.extend([None] * grow)
+            self.pos.extend([-1] * grow)
+        elif self.pos[h] >= 0:
+            raise KeyError(f"handle {h} already queued")
+
+        self.keys[h] = key
+        self.pos[h] = len(self.heap)
+        self.heap.append(h)
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self):
+        h = self.heap[0]
+        self._remove_at(0)
+        return h
+
+    def remove(self, h):
+        self._remove_at(self.pos[h])
+
+    def update(self, h, key):
+        old = self.keys[h]
+        self.keys[h] = key
+        if key < old:
+            self._sift_up(self.pos[h])
+        else:
+            self._sift_down(self.pos[h])
+
+    def decrease_key(self, h, key):
+        self.keys[h] = key
+        self._sift_up(self.pos[h])
+
+    def increase_key(self, h, key):
+        self.keys[h] = key
+        self._sift_down(self.pos[h])
+
+    # -------------------------
+    # INTERNALS
+    # -------------------------
+    def _remove_at(self, i):
+        heap, pos = self.heap, self.pos
+        h = heap[i]
+        last = heap.pop()
+        pos[h] = -1
+        if i < len(heap):
+            heap[i] = last
+            pos[last] = i
+            if self.keys[last] < self.keys[h]:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+
+    def _sift_up(self, i):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        h = heap[i]
+        key = keys[h]
+        while i:
+            parent = (i - 1) >> 1
+            ph = heap[parent]
+            if not key < keys[ph]:
+                break
+            heap[i] = ph
+            pos[ph] = i
+            i = parent
+        heap[i] = h
+        pos[h] = i
+
+    def _sift_down(self, i):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        n = len(heap)
+        h = heap[i]
+        key = keys[h]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            ch = heap[child]
+            right = child + 1
+            if right < n and keys[heap[right]] < keys[ch]:
+                child = right
+                ch = heap[right]
+            if not keys[ch] < key:
+                break
+            heap[i] = ch
+            pos[ch] = i
+            i = child
+        heap[i] = h
+        pos[h] = i
@@ -0,0 +1,259 @@
+"""
+Workload library: process tables uploaded once and run by id.
+
+A workload is stored as one compressed blob of ProcessTable columns:
+
+    8-byte header length | header JSON | arrival | priority | burst_end
+                         | bursts | arrival order
+
+The header has the typecodes, the pids and the optional per-process
+fields (nice, tickets, queue, ...). Its id is the sha256 of the
+uncompressed blob, so uploading the same table twice stores it once and
+an exported workload imports back to the same id.
+
+Scheduler requests name it with "workload": "<id>" in place of
+"processes". Decoded tables are kept in an in-process LRU bounded by
+settings.WORKLOAD_CACHE_BYTES, and every run gets a fresh() copy, so a
+warm run skips the upload, JSON parse, table build and arrival sort.
+"""
+from array import array
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Workload, WorkloadTag
+from .process_table import DefaultRecords, ProcessTable
+
+
+COLUMNS = ("pid", "arrival", "bursts")
+
+LEVEL = 6                   # zlib
+
+
+# =========================
+# COLUMNAR CODEC
+# =========================
+def encode(processes):
+    """(id, uncompressed blob, table) for a process list; raises like ProcessTable."""
+    if not isinstance(processes, list):
+        raise ValueError("processes must be a list")
+    table = ProcessTable(processes)
+    # priority is a column only when every process has one
+    columns = COLUMNS if table.priority is None else (*COLUMNS, "priority")
+    extras = [{k: v for k, v in p.items() if k not in columns} for p in processes]
+    header = {
+        "n": table.n,
+        "typecode": table.typecode,
+        "priority": table.priority.typecode if table.priority is not None else None,
+        "pids": table.pid,
+        "records": extras if any(extras) else None,
+    }
+    head = json.dumps(header, sort_keys=True, separators=(",", ":")).encode()
+
+    table.order = array("q", table.by_arrival())
+    data = [table.arrival, table.priority, table.burst_end, table.bursts, table.order]
+    blob = b"".join([
+        len(head).to_bytes(8, "little"), head,
+        *(column.tobytes() for column in data if column is not None),
+    ])
+    return hashlib.sha256(blob).hexdigest(), blob, table
+
+
+def decode(blob):
+    """The ProcessTable template of an uncompressed blob."""
+    size = int.from_bytes(blob[:8], "little")
+    header = json.loads(blob[8:8 + size])
+    view = memoryview(blob)[8 + size:]
+    n = header["n"]
+
+    def take(typecode, count):
+        nonlocal view
+        column = array(typecode)
+        column.frombytes(view[:count * column.itemsize])
+        view = view[count * column.itemsize:]
+        return column
+
+    t = ProcessTable.__new__(ProcessTable)
+    t.n = n
+    t.typecode = header["typecode"]
+    t.arrival = take(t.typecode, n)
+    t.priority = take(header["priority"], n) if header["priority"] else None
+    t.burst_end = take("q", n)
+    t.bursts = take(t.typecode, t.burst_end[-1] if n else 0)
+    t.order = take("q", n)
+    t.cursor = array("q", [0]) + t.burst_end[:-1] if n else array("q")
+    t.pid = header["pids"]
+    if header["records"] is None:
+        t.records = DefaultRecords(t.pid)
+    else:
+        t.records = [{"pid": pid, **extra} for pid, extra in zip(t.pid, header["records"])]
+    t._reset()
+    return t
+
+
+def to_processes(t):
+    """Process dicts of a stored table, as they are uploaded."""
+    processes = []
+    for h, record in enumerate(t.records):
+        p = {
+            "pid": t.pid[h],
+            "arrival": t.arrival[h],
+            "bursts": t.bursts[t.cursor[h]:t.burst_end[h]].tolist(),
+        }
+        if t.priority is not None:
+            p["priority"] = t.priority[h]
+        p.update((k, v) for k, v in record.items() if k != "pid")
+        processes.append(p)
+    return processes
+
+
+# =========================
+# DECODE CACHE
+# =========================
+_cache = OrderedDict()      # id -> (table, bytes)
+_cached_bytes = 0
+_lock = threading.Lock()
+
+
+def _nbytes(t):
+    columns = (t.arrival, t.priority, t.bursts, t.burst_end, t.cursor, t.order)
+    return sum(len(c) * c.itemsize for c in columns if c is not None)
+
+
+def _remember(workload_id, t):
+    global _cached_bytes
+    limit = settings.WORKLOAD_CACHE_BYTES
+    size = _nbytes(t)
+    if size > limit:
+        return
+    with _lock:
+        if workload_id in _cache:
+            return
+        _cache[workload_id] = (t, size)
+        _cached_bytes += size
+        while _cached_bytes > limit:
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cached_bytes -= evicted
+
+
+def _cached(workload_id):
+    with _lock:
+        entry = _cache.get(workload_id)
+        if entry is None:
+            return None
+        _cache.move_to_end(workload_id)
+        return entry[0]
+
+
+# =========================
+# STORE
+# =========================
+def _tags(tags):
+    if tags is None:
+        return []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) and 0 < len(tag) <= 64 for tag in tags):
+        raise ValueError("tags must be a list of strings of 1 to 64 characters")
+    return sorted(set(tags))
+
+
+def _prepare(entry):
+    # Everything that can reject an entry, before anything is written
+    if not isinstance(entry, dict):
+        raise ValueError("every workload must be an object")
+    name = entry.get("name", "")
+    if not isinstance(name, str) or len(name) > 200:
+        raise ValueError("name must be a string of at most 200 characters")
+    tags = _tags(entry.get("tags"))
+    workload_id, blob, table = encode(entry["processes"])
+    return name, tags, workload_id, blob, table
+
+
+def _save(name, tags, workload_id, blob, table):
+    workload = Workload.objects.filter(pk=workload_id).defer("data").first()
+    created = workload is None
+    if created:
+        data = zlib.compress(blob, LEVEL)
+        workload = Workload.objects.create(
+            id=workload_id, name=name, size=table.n, stored_bytes=len(data), data=data
+        )
+    WorkloadTag.objects.bulk_create(
+        [WorkloadTag(workload=workload, name=tag) for tag in tags], ignore_conflicts=True
+    )
+    return workload, created
+
+
+def store(entry):
+    """Save one {"name", "tags", "processes"} entry; returns (workload, created)."""
+    return store_many([entry])[0]
+
+
+def store_many(entries):
+    """Save a list of entries, all or none; returns a (workload, created) per entry."""
+    prepared = [_prepare(entry) for entry in entries]
+    with transaction.atomic():
+        stored = [_save(*p) for p in prepared]
+    for _, _, workload_id, blob, _ in prepared:
+        _remember(workload_id, decode(blob))
+    return stored
+
+
+def load(workload_id):
+    """A fresh ProcessTable of a stored workload; ValueError if there is none."""
+    template = _cached(workload_id)
+    if template is None:
+        row = Workload.objects.filter(pk=workload_id).values_list("data", flat=True).first()
+        if row is None:
+            raise ValueError(f"unknown workload {workload_id!r}")
+        template = decode(zlib.decompress(row))
+        _remember(workload_id, template)
+    return template.fresh()
+
+
+def describe(workload):
+    return {
+        "id": workload.id,
+        "name": workload.name,
+        "tags": sorted(tag.name for tag in workload.tags.all()),
+        "processes": workload.size,
+        "stored_bytes": workload.stored_bytes,
+        "created": workload.created.isoformat(),
+    }
+
+
+def search(workload_id=None, name=None, tag=None, min_size=None, max_size=None, limit=100):
+    """Stored workloads, newest first, without their data."""
+    query = Workload.objects.defer("data").prefetch_related("tags")
+    if workload_id:
+        query = query.filter(pk=workload_id)
+    if name:
+        query = query.filter(name=name)
+    if tag:
+        query = query.filter(tags__name=tag)
+    if min_size is not None:
+        query = query.filter(size__gte=min_size)
+    if max_size is not None:
+        query = query.filter(size__lte=max_size)
+    return list(query[:limit])
+
+
+def export(workload):
+    """{"name", "tags", "processes"} of a stored workload, the form store() takes."""
+    return {
+        "name": workload.name,
+        "tags": sorted(tag.name for tag in workload.tags.all()),
+        "processes": to_processes(load(workload.id)),
+    }
+
+
+def delete(workload_id):
+    global _cached_bytes
+    Workload.objects.filter(pk=workload_id).delete()
+    with _lock:
+        entry = _cache.pop(workload_id, None)
+        if entry is not None:
+            _cached_bytes -= entry[1]
@@ -0,0 +1,58 @@
+"""
+Pre-render the visualizer page so it can be served as a static file.
+
+Run after collectstatic. Writes prerendered/index.html with the
+stylesheet inlined and asset URLs pointing at the hashed (immutable)
+names from the static manifest, plus .gz and .br variants next to it.
+WhiteNoise serves the directory at the site root; any static host or
+CDN can serve it just as well without Django.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+STYLESHEET = "styles/template.css"
+
+
+class Command(BaseCommand):
+    help = "Pre-render template.html into a static, pre-compressed index.html"
+
+    def handle(self, *args, **options):
+        html = render_to_string("template.html")
+        html = self.inline_stylesheet(html)
+
+        out_dir = settings.PRERENDER_ROOT
+        out_dir.mkdir(parents=True, exist_ok=True)
+        data = html.encode("utf-8")
+
+        (out_dir / "index.html").write_bytes(data)
+        (out_dir / "index.html.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        variants = ["gz"]
+        if brotli is not None:
+            (out_dir / "index.html.br").write_bytes(brotli.compress(data))
+            variants.append("br")
+
+        self.stdout.write(
+            f"Wrote {out_dir / 'index.html'} ({len(data)} bytes, {'/'.join(variants)})"
+        )
+
+    def inline_stylesheet(self, html):
+        # The stylesheet is small enough that all of it is critical CSS;
+        # inlining it removes a render-blocking request.
+        href = re.escape(staticfiles_storage.url(STYLESHEET))
+        link = re.compile(r'<link rel="stylesheet" href="' + href + r'">')
+
+        with staticfiles_storage.open(STYLESHEET) as f:
+            css = f.read().decode("utf-8")
+
+        return link.sub(lambda _: f"<style>\n{css}</style>", html, count=1)
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workload',
+            fields=[
+                ('id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('size', models.PositiveIntegerField(db_index=True)),
+                ('stored_bytes', models.PositiveBigIntegerField()),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkloadTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=64)),
+                ('workload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='osscheduler.workload')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('workload', 'name'), name='unique_workload_tag')],
+            },
+        ),
+    ]
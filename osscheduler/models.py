@@ -0,0 +1,33 @@
+"""
+Stored workloads for the workload library (see library.py).
+"""
+from django.db import models
+
+
+class Workload(models.Model):
+    # sha256 of the uncompressed columns, so an identical upload is the same row
+    id = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=200, blank=True, db_index=True)
+    size = models.PositiveIntegerField(db_index=True)           # processes
+    stored_bytes = models.PositiveBigIntegerField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    data = models.BinaryField()                                 # compressed columns
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self):
+        return f"{self.name or self.id[:12]} ({self.size} processes)"
+
+
+class WorkloadTag(models.Model):
+    workload = models.ForeignKey(Workload, on_delete=models.CASCADE, related_name="tags")
+    name = models.CharField(max_length=64, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["workload", "name"], name="unique_workload_tag"),
+        ]
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,173 @@
+"""
+Monte Carlo workload studies.
+
+K independent workloads are drawn from a workload spec (see workload.py)
+into shared-memory NumPy buffers, every requested policy is run on each
+of them over a process pool, and the per-workload averages are reduced
+to a mean and a Student-t confidence interval per metric.
+
+Workload k always draws from child k of SeedSequence(seed) and results
+are reduced in workload order, so a study is reproducible for a given
+seed whatever the number of workers.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from statistics import NormalDist
+import math
+import os
+
+import numpy as np
+
+from . import workload
+from .engine import POLICIES, simulate
+
+
+METRICS = ("tat", "wt", "rt", "throughput")
+
+MAX_BURST_CELLS = 8 * workload.MAX_GENERATED    # runs x processes x bursts per process
+
+
+# =========================
+# SHARED WORKLOAD BUFFERS
+# =========================
+FIELDS = ("arrival", "priority", "bursts", "counts")
+
+
+def _allocate(shapes):
+    blocks, arrays = {}, {}
+    for name, shape in shapes.items():
+        size = max(int(np.prod(shape)) * 8, 1)
+        blocks[name] = SharedMemory(create=True, size=size)
+        arrays[name] = np.ndarray(shape, dtype=np.int64, buffer=blocks[name].buf)
+    return blocks, arrays
+
+
+_worker = {}
+
+
+def _attach(names, shapes):
+    for name in FIELDS:
+        block = SharedMemory(name=names[name])
+        _worker[name] = (block, np.ndarray(shapes[name], dtype=np.int64, buffer=block.buf))
+
+
+def _run_chunk(indices, policies, context_switch):
+    arrays = {name: _worker[name][1] for name in FIELDS}
+    return [_run_one(arrays, k, policies, context_switch) for k in indices]
+
+
+def _run_one(arrays, k, policies, context_switch):
+    processes = workload.to_processes(
+        arrays["arrival"][k], arrays["priority"][k], arrays["bursts"][k], arrays["counts"][k]
+    )
+    row = {}
+    for policy in policies:
+        result = simulate(policy, processes, context_switch)
+        row[policy] = (
+            result["average"]["tat"],
+            result["average"]["wt"],
+            result["average"]["rt"],
+            result["system"]["throughput"],
+        )
+    return row
+
+
+# =========================
+# STATISTICS
+# =========================
+def t_quantile(p, df):
+    # Cornish-Fisher expansion of the Student-t quantile around the normal
+    z = NormalDist().inv_cdf(p)
+    if df == math.inf:
+        return z
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+def interval(samples, confidence):
+    values = np.asarray(samples, dtype=float)
+    k = len(values)
+    mean = float(values.mean())
+    if k < 2:
+        return {"mean": mean, "std": 0.0, "ci_low": mean, "ci_high": mean}
+
+    std = float(values.std(ddof=1))
+    half = t_quantile((1 + confidence) / 2, k - 1) * std / math.sqrt(k)
+    return {"mean": mean, "std": std, "ci_low": mean - half, "ci_high": mean + half}
+
+
+# =========================
+# STUDY
+# =========================
+def run_study(spec, policies, runs, processes, seed, workers=1,
+              confidence=0.95, context_switch=0):
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+    if runs < 1 or processes < 1:
+        raise ValueError("runs and processes must be positive")
+    if runs * processes > workload.MAX_GENERATED:
+        raise ValueError(f"runs x processes must be at most {workload.MAX_GENERATED}")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    spec = workload.parse_spec(spec)
+    width = workload.max_bursts(spec)
+    if runs * processes * width > MAX_BURST_CELLS:
+        raise ValueError(f"runs x processes x bursts per process must be at most {MAX_BURST_CELLS}")
+    shapes = {
+        "arrival": (runs, processes),
+        "priority": (runs, processes),
+        "bursts": (runs, processes, width),
+        "counts": (runs, processes),
+    }
+
+    blocks, arrays = _allocate(shapes)
+    try:
+        for k, child in enumerate(np.random.SeedSequence(seed).spawn(runs)):
+            rng = np.random.default_rng(child)
+            generated = workload.generate(spec, processes, rng)
+            for name, values in zip(FIELDS, generated):
+                arrays[name][k] = values
+
+        workers = max(1, min(workers, runs, os.cpu_count() or 1))
+        if workers == 1:
+            rows = [_run_one(arrays, k, policies, context_switch) for k in range(runs)]
+        else:
+            chunks = [list(range(runs))[i::workers] for i in range(workers)]
+            names = {name: blocks[name].name for name in FIELDS}
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_attach,
+                initargs=(names, shapes),
+            ) as pool:
+                results = pool.map(_run_chunk, chunks,
+                                   [policies] * workers, [context_switch] * workers)
+                by_index = {}
+                for chunk, rows_ in zip(chunks, results):
+                    by_index.update(zip(chunk, rows_))
+            rows = [by_index[k] for k in range(runs)]
+    finally:
+        del arrays
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return {
+        "runs": runs,
+        "processes": processes,
+        "seed": seed,
+        "confidence": confidence,
+        "policies": {
+            policy: {
+                metric: interval([row[policy][i] for row in rows], confidence)
+                for i, metric in enumerate(METRICS)
+            }
+            for policy in policies
+        },
+    }
@@ -0,0 +1,335 @@
+"""
+Multilevel queue scheduler.
+
+Processes are split into classes by their "queue" field (default: the
+first queue). Each queue orders its own processes with one of the
+non-preemptive orderings (fcfs / sjf / ljf / priority) or round robin
+with its own quantum; a process keeps the CPU within its queue until its
+burst ends (or its quantum does, for rr).
+
+Which queue gets the CPU is decided by the arbitration:
+
+  * "priority": the first non-empty queue in the list always runs. An
+    arrival or wakeup in a higher queue preempts a lower one; the
+    preempted process resumes first when its queue runs again.
+  * "weighted": queues share the CPU by "weight", one "slice" at a time,
+    with the stride scheduler from proportional.py running over queues
+    instead of processes. Idle queues give up their share to the rest.
+
+Non-empty queues sit in a small IndexedHeap and every queue's ready set
+is a deque or a heap, so a dispatch is O(log n). Like cfs.py, the engine
+jumps from event to event rather than stepping ticks.
+"""
+from array import array
+from collections import deque
+import heapq
+
+from .engine import NON_PREEMPTIVE_KEYS, _blocked, _sinks, _table
+from .indexed_heap import IndexedHeap
+from .proportional import StrideSet
+
+
+POLICIES = (*NON_PREEMPTIVE_KEYS, "rr")
+
+ARBITRATIONS = ("priority", "weighted")
+
+
+class Level:
+    """One queue: its ready set plus the process that has started a dispatch in it."""
+
+    def __init__(self, spec):
+        if not isinstance(spec, dict):
+            raise ValueError("every queue must be an object")
+        self.name = spec["name"]
+        self.policy = spec.get("policy", "fcfs")
+        if self.policy not in POLICIES:
+            raise ValueError(f"{self.name}: unknown policy {self.policy!r}, expected one of {list(POLICIES)}")
+        self.quantum = spec.get("quantum", 1) if self.policy == "rr" else None
+        if self.quantum is not None and not self.quantum > 0:
+            raise ValueError(f"{self.name}: quantum must be positive")
+        self.weight = spec.get("weight", 1)
+        if type(self.weight) is not int or self.weight <= 0:
+            raise ValueError(f"{self.name}: weight must be a positive integer")
+
+        self.key = NON_PREEMPTIVE_KEYS.get(self.policy)
+        self.ready = deque() if self.key is None else []
+        self.tie = 0
+        self.current = None
+        self.size = 0
+
+    def push(self, t, h):
+        if self.key is None:
+            self.ready.append(h)
+        else:
+            heapq.heappush(self.ready, (self.key(t, h), self.tie, h))
+            self.tie += 1
+        self.size += 1
+
+    def take(self):
+        if self.current is None:
+            self.current = self.ready.popleft() if self.key is None else heapq.heappop(self.ready)[2]
+        return self.current
+
+    def rotate(self):
+        # rr: the current process used its quantum, to the back of the queue
+        self.ready.append(self.current)
+        self.current = None
+
+    def finish(self):
+        # the current process left the queue (I/O or completion)
+        self.current = None
+        self.size -= 1
+
+
+class PrioritySet:
+    """Non-empty queues by position; same interface as the proportional runnable sets."""
+
+    def __init__(self, n):
+        self.ready = IndexedHeap(n)
+
+    def push(self, q):
+        self.ready.push(q, q)
+
+    def pick(self):
+        return self.ready.peek()
+
+    def charge(self, q, run):
+        pass
+
+    def remove(self, q):
+        self.ready.remove(q)
+
+
+def _levels(queues):
+    if not isinstance(queues, list) or not queues:
+        raise ValueError("queues must be a non-empty list")
+    levels = [Level(spec) for spec in queues]
+    names = [level.name for level in levels]
+    if len(set(names)) != len(names):
+        raise ValueError("queue names must be unique")
+    return levels
+
+
+def _assign(t, levels):
+    index = {level.name: q for q, level in enumerate(levels)}
+    queue = array("q", bytes(8 * t.n))
+    for h, p in enumerate(t.records):
+        name = p.get("queue")
+        if name is None:
+            continue
+        if name not in index:
+            raise ValueError(f"{p['pid']}: unknown queue {name!r}")
+        queue[h] = index[name]
+
+    if t.priority is None and any(level.policy == "priority" for level in levels):
+        priority = []
+        for h, p in enumerate(t.records):
+            level = levels[queue[h]]
+            if level.policy == "priority" and p.get("priority") is None:
+                raise ValueError(f"{p['pid']}: queue {level.name!r} needs a priority for every process")
+            priority.append(p.get("priority", 0))
+        t.priority = priority
+    return queue
+
+
+def run_multilevel(processes, queues, arbitration="priority", slice_=1,
+                   blocked_queue="heap", devices=None):
+    if arbitration not in ARBITRATIONS:
+        raise ValueError(f"unknown arbitration {arbitration!r}, expected one of {list(ARBITRATIONS)}")
+    if not slice_ > 0:
+        raise ValueError("slice must be positive")
+
+    levels = _levels(queues)
+    t = _table(processes, "multilevel")
+    queue = t.queue = _assign(t, levels)
+    t.levels = levels
+    quanta = [level.quantum for level in levels if level.quantum is not None]
+    if t.typecode == "q" and any(type(x) is not int for x in (slice_, *quanta)):
+        raise ValueError("slice and quantum must be integers like the process times")
+    strict = arbitration == "priority"
+    if strict:
+        arbiter = PrioritySet(len(levels))
+    else:
+        arbiter = StrideSet([level.weight for level in levels], slice_)
+
+    bursts, cursor, burst_end = t.bursts, t.cursor, t.burst_end
+    left = array(t.typecode, bytes(8 * t.n))        # rest of the current CPU burst
+    used = array(t.typecode, bytes(8 * t.n))        # of the current rr quantum
+    t.queue_cpu = array(t.typecode, bytes(8 * len(levels)))
+
+    time = 0
+    gantt, completed = _sinks(t)
+    new = t.by_arrival()
+    arrived = 0
+    waiting = 0                 # processes in any queue, including the running one
+    blocked = _blocked(t, blocked_queue, devices)
+
+    def next_event():
+        times = []
+        if arrived < len(new):
+            times.append(t.arrival[new[arrived]])
+        if blocked:
+            times.append(blocked.next_time())
+        return min(times) if times else None
+
+    # Arrivals and wakeups due during a dispatch wait here until it ends,
+    # then go to READY arrivals first, as in engine.run_nonpreemptive.
+    # Those of the queue whose process keeps its dispatch over weighted
+    # slices or a preemption (`held`) wait until that process leaves it.
+    arrivals, wakeups = [], []
+    held = None
+    held_arrivals, held_wakeups = [], []
+
+    def collect():
+        # Take what is due from NEW and BLOCKED; returns the highest queue
+        nonlocal arrived
+        top = len(levels)
+        while arrived < len(new) and t.arrival[new[arrived]] <= time:
+            h = new[arrived]
+            arrivals.append(h)
+            arrived += 1
+            top = min(top, queue[h])
+        for h in blocked.pop_due(time):
+            wakeups.append(h)
+            top = min(top, queue[h])
+        return top
+
+    def admit():
+        # NEW → READY, then BLOCKED → READY
+        nonlocal waiting
+        collect()
+        if not arrivals and not wakeups and (held is not None or not (held_arrivals or held_wakeups)):
+            return
+        if held is None:
+            due = (*held_arrivals, *arrivals, *held_wakeups, *wakeups)
+            held_arrivals.clear()
+            held_wakeups.clear()
+        else:
+            held_arrivals.extend(h for h in arrivals if queue[h] == held)
+            held_wakeups.extend(h for h in wakeups if queue[h] == held)
+            due = [h for h in (*arrivals, *wakeups) if queue[h] != held]
+        arrivals.clear()
+        wakeups.clear()
+        for h in due:
+            q = queue[h]
+            level = levels[q]
+            if not level.size:
+                arbiter.push(q)
+            level.push(t, h)
+            left[h] = bursts[cursor[h]]
+            waiting += 1
+
+    while arrived < len(new) or waiting or blocked:
+
+        admit()
+
+        if not waiting:
+            next_time = next_event()
+            gantt.add(-1, time, next_time)
+            time = next_time
+            continue
+
+        q = arbiter.pick()
+        level = levels[q]
+        h = level.take()
+
+        if not t.started[h]:
+            t.started[h] = 1
+            t.response[h] = time - t.arrival[h]
+
+        # The dispatch ends with the burst, the rr quantum or the
+        # weighted slice, whichever comes first
+        run = left[h]
+        expires = False
+        if level.quantum is not None and level.quantum - used[h] < run:
+            run = level.quantum - used[h]
+            expires = True
+        if not strict and slice_ < run:
+            run = slice_
+            expires = False
+        finishing = run == left[h]
+        start = time
+        end = time + run
+
+        # Under strict priority an arrival in a higher queue preempts
+        while True:
+            event = next_event()
+            stop = end if event is None or event >= end else event
+            gantt.extend(h, time, stop)
+            time = stop
+            if stop == end:
+                break
+            if collect() < q and strict:
+                break
+
+        ran = time - start
+        t.burst_time[h] += ran
+        t.queue_cpu[q] += ran
+        arbiter.charge(q, ran)
+
+        done = time == end and finishing
+        if not done:
+            left[h] -= ran
+            if level.quantum is not None:
+                used[h] = level.quantum if time == end and expires else used[h] + ran
+        rotates = not done and level.quantum is not None and used[h] == level.quantum
+        held = None if done or rotates else q
+        admit()
+
+        if done:
+            left[h] = 0
+        else:
+            if rotates:
+                used[h] = 0
+                level.rotate()
+            continue
+
+        used[h] = 0
+        level.finish()
+        waiting -= 1
+        if not level.size:
+            arbiter.remove(q)
+
+        c = cursor[h]
+        if c + 1 < burst_end[h]:
+            blocked.submit(time, bursts[c + 1], h)
+            cursor[h] = c + 2
+        else:
+            cursor[h] = c + 1
+            t.completion[h] = time
+            completed.append(h)
+
+    return gantt, t, completed, time
+
+
+# =========================
+# PER-QUEUE REPORT
+# =========================
+def queue_report(table):
+    """CPU time, share of busy time and average TAT / WT / RT for every queue."""
+    levels = table.levels
+    count = [0] * len(levels)
+    tat = [0] * len(levels)
+    wt = [0] * len(levels)
+    rt = [0] * len(levels)
+    for h in range(table.n):
+        q = table.queue[h]
+        turnaround = table.completion[h] - table.arrival[h]
+        count[q] += 1
+        tat[q] += turnaround
+        wt[q] += turnaround - table.burst_time[h]
+        rt[q] += table.response[h]
+
+    busy = sum(table.queue_cpu)
+    return [{
+        "name": level.name,
+        "policy": level.policy,
+        "processes": count[q],
+        "cpu_time": table.queue_cpu[q],
+        "cpu_share": table.queue_cpu[q] / busy if busy else 0,
+        "average": {
+            "tat": tat[q] / count[q] if count[q] else 0,
+            "wt": wt[q] / count[q] if count[q] else 0,
+            "rt": rt[q] / count[q] if count[q] else 0,
+        },
+    } for q, level in enumerate(levels)]
@@ -0,0 +1,396 @@
+"""
+Optimal non-preemptive schedules by branch and bound.
+
+A schedule is the order of CPU dispatches: each one runs the next CPU
+burst of a process, from when both the CPU and the process are free.
+Bursts are followed by their I/O (unlimited parallel I/O, as in the
+engine) and the CPU by a context switch while anything is left, so any
+order the engine could produce, and every other one, is a leaf. Average
+TAT and WT differ from the sum of completion times by constants (arrival
+and CPU time), so both are minimised by the same order.
+
+The search is a depth-first branch and bound:
+
+  * only active schedules are branched on: a process is not dispatched
+    at a time by which another one could have run a whole burst (and its
+    switch) first, since running that one first is never worse;
+  * the lower bound on the completions still to come takes, for the
+    k-th of them, the larger of the k-th smallest "its own remaining
+    chain, from when it is free" and "the k smallest remaining CPU works
+    run back to back";
+  * states already reached at a lower cost are memoised and cut, with
+    ready times before the CPU's clock taken as the clock.
+
+The tree is opened breadth-first until there are a few subtrees per
+worker, which run over a process pool sharing the best cost found so
+far. Subtrees left unfinished when the time budget runs out keep their
+bound, so an interrupted search still reports how far from optimal its
+best order can be. The incumbent starts from the heuristic policies.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import heapq
+import os
+import time
+
+from .engine import _table, run_policy, summarize
+
+
+HEURISTICS = ("fcfs", "sjf", "ljf", "priority")
+
+OBJECTIVES = ("wt", "tat")
+
+MAX_PROCESSES = 24
+
+MAX_BURSTS = 96                 # CPU bursts over all processes
+
+MAX_BUDGET = 120                # seconds
+
+MEMO_LIMIT = 1 << 20            # states memoised per subtree before starting over
+
+SUBTREES_PER_WORKER = 8
+
+
+class _Timeout(Exception):
+    pass
+
+
+# =========================
+# PROBLEM
+# =========================
+class Problem:
+    """A request's processes as plain tuples, picklable for the pool."""
+
+    def __init__(self, table, context_switch=0):
+        self.n = table.n
+        self.cs = context_switch
+        self.pid = list(table.pid)
+        self.arrival = tuple(table.arrival)
+        self.bursts = tuple(
+            tuple(table.bursts[table.cursor[h]:table.burst_end[h]]) for h in range(self.n)
+        )
+        # From every CPU burst c on: the shortest time to finish alone
+        # (CPU bursts, and I/O or a switch between them) and the CPU work
+        # with a switch per burst
+        self.chain, self.work = [], []
+        for b in self.bursts:
+            chain, work = [0] * len(b), [0] * len(b)
+            for c in range(len(b) - 1, -1, -2):
+                after = c + 2 < len(b)
+                chain[c] = b[c] + (max(b[c + 1], context_switch) + chain[c + 2] if after else 0)
+                work[c] = b[c] + context_switch + (work[c + 2] if after else 0)
+            self.chain.append(tuple(chain))
+            self.work.append(tuple(work))
+        self.cpu = tuple(sum(b[0::2]) for b in self.bursts)
+
+    def replay(self, order):
+        """Completion and first start of every process, and the Gantt, for a dispatch order."""
+        cs = self.cs
+        cur = [0] * self.n
+        ready = list(self.arrival)
+        completion, first = [None] * self.n, [None] * self.n
+        left = self.n
+        gantt = []
+        t = 0
+        for h in order:
+            start = max(t, ready[h])
+            if start > t:
+                gantt.append({"pid": "IDLE", "start": t, "end": start})
+            end = start + self.bursts[h][cur[h]]
+            gantt.append({"pid": self.pid[h], "start": start, "end": end})
+            if first[h] is None:
+                first[h] = start
+            if cur[h] + 1 < len(self.bursts[h]):
+                ready[h] = end + self.bursts[h][cur[h] + 1]
+                cur[h] += 2
+            else:
+                cur[h] = len(self.bursts[h])
+                completion[h] = end
+                left -= 1
+            t = end + cs if left else end
+        if left:
+            raise ValueError("order does not finish every process")
+        return completion, first, gantt, t
+
+    def averages(self, completion, first):
+        n = self.n
+        tat = sum(c - a for c, a in zip(completion, self.arrival)) / n
+        return {
+            "tat": tat,
+            "wt": tat - sum(self.cpu) / n,
+            "rt": sum(f - a for f, a in zip(first, self.arrival)) / n,
+        }
+
+    def averages_of(self, total):
+        """Average TAT and WT for a sum of completion times."""
+        tat = (total - sum(self.arrival)) / self.n
+        return {"tat": tat, "wt": tat - sum(self.cpu) / self.n}
+
+
+# =========================
+# SEARCH
+# =========================
+class Search:
+    """Depth-first branch and bound below one node."""
+
+    def __init__(self, problem, shared, deadline):
+        self.p = problem
+        self.shared = shared    # best sum of completions over all workers
+        self.deadline = deadline
+        self.best = shared.value
+        self.order = None       # best dispatch order found here
+        self.nodes = self.pruned = self.memo_hits = 0
+        self.memo = {}
+
+    def bound(self, t, cur, ready):
+        p = self.p
+        alone, work = [], []
+        for h in range(p.n):
+            c = cur[h]
+            if c < len(p.bursts[h]):
+                r = ready[h]
+                alone.append((r if r > t else t) + p.chain[h][c])
+                work.append(p.work[h][c])
+        alone.sort()
+        work.sort()
+        total, cpu = 0, t - p.cs
+        for a, w in zip(alone, work):
+            cpu += w
+            total += a if a > cpu else cpu
+        return total
+
+    def children(self, t, cur, ready):
+        # (start, burst, h) of the processes that may go next
+        p = self.p
+        options = []
+        for h in range(p.n):
+            c = cur[h]
+            if c < len(p.bursts[h]):
+                r = ready[h]
+                options.append((r if r > t else t, p.bursts[h][c], h))
+        threshold = min(s + b for s, b, _ in options) + p.cs
+        # The process that sets the threshold always stays: with a zero
+        # burst and no switch it starts at the threshold itself
+        return sorted(o for o in options if o[0] < threshold or o[0] + o[1] + p.cs == threshold)
+
+    def dispatch(self, t, cur, ready, left, s, b, h):
+        """Dispatch h at s; returns (new time, completion or None, new left, undo)."""
+        p = self.p
+        c, r = cur[h], ready[h]
+        end = s + b
+        done = None
+        if c + 1 < len(p.bursts[h]):
+            ready[h] = end + p.bursts[h][c + 1]
+            cur[h] = c + 2
+        else:
+            cur[h] = len(p.bursts[h])
+            done = end
+            left -= 1
+        return (end + p.cs if left else end), done, left, (h, c, r)
+
+    def run(self, t, cur, ready, cost, left, order):
+        """Search below a node; False when the time budget ran out first."""
+        cur, ready, order = list(cur), list(ready), list(order)
+        try:
+            self._dfs(t, cur, ready, cost, left, order)
+        except _Timeout:
+            return False
+        return True
+
+    def _improve(self, cost, order):
+        shared = self.shared
+        with shared.get_lock():
+            if cost < shared.value:
+                shared.value = cost
+        self.best = min(self.best, cost)
+        self.order = list(order)
+
+    def _dfs(self, t, cur, ready, cost, left, order):
+        self.nodes += 1
+        if not self.nodes & 1023:
+            if time.time() > self.deadline:
+                raise _Timeout
+            self.best = min(self.best, self.shared.value)
+
+        if not left:
+            if cost < self.best:
+                self._improve(cost, order)
+            return
+        if cost + self.bound(t, cur, ready) >= self.best:
+            self.pruned += 1
+            return
+
+        key = (t, tuple(cur), tuple(r if r > t else t for r in ready))
+        seen = self.memo.get(key)
+        if seen is not None and seen <= cost:
+            self.memo_hits += 1
+            return
+        if len(self.memo) >= MEMO_LIMIT:
+            self.memo.clear()
+        self.memo[key] = cost
+
+        for s, b, h in self.children(t, cur, ready):
+            nt, done, nleft, (h, c, r) = self.dispatch(t, cur, ready, left, s, b, h)
+            order.append(h)
+            self._dfs(nt, cur, ready, cost + (done or 0), nleft, order)
+            order.pop()
+            cur[h], ready[h] = c, r
+
+
+# Worker state, set once per pool process
+_worker = {}
+
+
+def _attach(problem, shared):
+    _worker["problem"] = problem
+    _worker["shared"] = shared
+
+
+def _run_subtree(node, deadline):
+    search = Search(_worker["problem"], _worker["shared"], deadline)
+    complete = search.run(*node)
+    return {
+        "complete": complete,
+        "best": search.best if search.order is not None else None,
+        "order": search.order,
+        "nodes": search.nodes,
+        "pruned": search.pruned,
+        "memo_hits": search.memo_hits,
+    }
+
+
+def _split(problem, shared, count):
+    """Open the tree breadth-first into about `count` subtrees, by bound."""
+    search = Search(problem, shared, float("inf"))
+    root = (0, (0,) * problem.n, problem.arrival, 0, problem.n, ())
+    frontier = [root]
+    leaves = []
+    while frontier and len(frontier) < count:
+        wider = []
+        for t, cur, ready, cost, left, order in frontier:
+            cur, ready = list(cur), list(ready)
+            for s, b, h in search.children(t, cur, ready):
+                nt, done, nleft, (h, c, r) = search.dispatch(t, cur, ready, left, s, b, h)
+                node = (nt, tuple(cur), tuple(ready), cost + (done or 0), nleft, order + (h,))
+                (wider if nleft else leaves).append(node)
+                cur[h], ready[h] = c, r
+        if not wider:
+            break
+        frontier = wider
+
+    for node in leaves:
+        if node[3] < search.best:
+            search._improve(node[3], node[5])
+    bounded = [(node[3] + search.bound(node[0], node[1], node[2]), i, node)
+               for i, node in enumerate(frontier) if node[4]]
+    heapq.heapify(bounded)
+    return [heapq.heappop(bounded) for _ in range(len(bounded))], search
+
+
+# =========================
+# OPTIMISE
+# =========================
+def optimise(processes, context_switch=0, objective="wt", policies=None, time_budget=10,
+             workers=1):
+    """Best dispatch order within a time budget, and how far each heuristic is from it."""
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r}, expected one of {list(OBJECTIVES)}")
+    if not 0 < time_budget <= MAX_BUDGET:
+        raise ValueError(f"time_budget must be between 0 and {MAX_BUDGET} seconds")
+    table = _table(processes, "fcfs", context_switch)
+    if not 0 < table.n <= MAX_PROCESSES:
+        raise ValueError(f"the optimiser takes 1 to {MAX_PROCESSES} processes")
+    problem = Problem(table, context_switch)
+    if sum((len(b) + 1) // 2 for b in problem.bursts) > MAX_BURSTS:
+        raise ValueError(f"the optimiser takes at most {MAX_BURSTS} CPU bursts in all")
+    if policies is None:
+        policies = [p for p in HEURISTICS if p != "priority" or table.priority is not None]
+    for policy in policies:
+        if policy not in HEURISTICS:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {list(HEURISTICS)}")
+
+    started = time.time()
+    deadline = started + time_budget
+
+    # Heuristic runs: their averages and the first incumbent
+    heuristics = {}
+    incumbent = None
+    for policy in policies:
+        gantt, run, completed, total_time = run_policy(policy, table.fresh(), context_switch)
+        heuristics[policy] = summarize(gantt, run, completed, total_time)["average"]
+        order = [h for h in gantt.proc if h >= 0]
+        cost = sum(run.completion)
+        if incumbent is None or cost < incumbent[0]:
+            incumbent = (cost, order)
+    if incumbent is None:
+        order = sorted(range(problem.n), key=lambda h: problem.arrival[h])
+        order = [h for h in order for _ in range(0, len(problem.bursts[h]), 2)]
+        completion, _, _, _ = problem.replay(order)
+        incumbent = (sum(completion), order)
+
+    ctx = get_context("spawn")
+    shared = ctx.Value("d", incumbent[0])
+    workers = max(1, min(workers, os.cpu_count() or 1))
+    subtrees, opener = _split(problem, shared, workers * SUBTREES_PER_WORKER)
+    if opener.order is not None:
+        incumbent = (opener.best, opener.order)
+
+    results = []
+    if workers == 1 or len(subtrees) <= 1:
+        _attach(problem, shared)
+        for _, _, node in subtrees:
+            results.append(_run_subtree(node, deadline))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_attach,
+            initargs=(problem, shared),
+        ) as pool:
+            results = list(pool.map(_run_subtree, [node for _, _, node in subtrees],
+                                    [deadline] * len(subtrees)))
+
+    for result in results:
+        if result["order"] is not None and result["best"] < incumbent[0]:
+            incumbent = (result["best"], result["order"])
+    best, order = incumbent
+    open_bounds = [bound for (bound, _, _), result in zip(subtrees, results) if not result["complete"]]
+    lower = min([best, *open_bounds])
+    optimal = not open_bounds
+
+    completion, first, gantt, total_time = problem.replay(order)
+    average = problem.averages(completion, first)
+    bound = problem.averages_of(lower)
+    gaps = {}
+    for policy, value in heuristics.items():
+        gap = value[objective] - average[objective]
+        gaps[policy] = {
+            "average": value,
+            "gap": gap,
+            "relative": gap / average[objective] if average[objective] else None,
+            # the true gap is at most this much
+            "gap_bound": value[objective] - bound[objective],
+        }
+
+    return {
+        "objective": objective,
+        "optimal": optimal,
+        "best": {
+            "order": [problem.pid[h] for h in order],
+            "average": average,
+            "gantt": gantt,
+            "total_time": total_time,
+        },
+        "lower_bound": bound,
+        "heuristics": gaps,
+        "search": {
+            "nodes": opener.nodes + sum(r["nodes"] for r in results),
+            "pruned": sum(r["pruned"] for r in results),
+            "memo_hits": sum(r["memo_hits"] for r in results),
+            "subtrees": len(subtrees),
+            "unfinished": len(open_bounds),
+            "workers": workers,
+            "seconds": time.time() - started,
+            "time_budget": time_budget,
+        },
+    }
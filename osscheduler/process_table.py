@@ -0,0 +1,184 @@
+"""
+Struct-of-arrays process state for the engines.
+
+Processes are addressed by small integer handles (their position in the
+request) and every field is one typed array indexed by handle, instead
+of one dict per process. Bursts are flattened into a single array with
+per-process offsets. Times use 'q' (int64) columns when every input time
+is an integer and 'd' (float64) otherwise, so integer tables come back
+as integers exactly as before.
+
+`records` keeps the request's process dicts for the optional per-process
+fields some engines read (nice, tickets, device, track).
+
+A table runs once: the engines advance `cursor` and fill the run
+columns. fresh() gives another run over the same input columns.
+"""
+from array import array
+import copy
+from itertools import accumulate
+
+
+def time_typecode(*columns):
+    for column in columns:
+        for value in column:
+            if type(value) is not int:
+                return "d"
+    return "q"
+
+
+class ProcessTable:
+
+    def __init__(self, processes, context_switch=0):
+        n = len(processes)
+        self.n = n
+        self.records = processes
+
+        self.pid = [p["pid"] for p in processes]
+        arrival = [p["arrival"] for p in processes]
+        flat = [b for p in processes for b in p["bursts"]]
+
+        tc = time_typecode(arrival, flat, (context_switch,))
+        self.typecode = tc
+        try:
+            self.arrival = array(tc, arrival)
+            self.bursts = array(tc, flat)
+        except OverflowError:
+            raise ValueError("times must fit in a signed 64-bit integer") from None
+
+        self.burst_end = array("q", bytes(8 * n))
+        self.cursor = array("q", bytes(8 * n))       # next burst, index into bursts
+        offset = 0
+        for h, p in enumerate(processes):
+            self.cursor[h] = offset
+            offset += len(p["bursts"])
+            self.burst_end[h] = offset
+
+        priority = [p.get("priority") for p in processes]
+        if n and None not in priority:
+            try:
+                self.priority = array(time_typecode(priority), priority)
+            except OverflowError:
+                raise ValueError("priorities must fit in a signed 64-bit integer") from None
+        else:
+            self.priority = None
+
+        self.order = None
+        self._reset()
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Integer table from column chunks (arrival, priority, bursts, counts)
+        as produced by workload.stream(): int64 buffers, with each chunk's
+        bursts back to back, counts[i] of them for process i.
+        """
+        t = cls.__new__(cls)
+        t.typecode = "q"
+        t.arrival, t.priority, t.bursts = array("q"), array("q"), array("q")
+        t.cursor, t.burst_end = array("q"), array("q")
+
+        def raw(buffer):
+            return memoryview(buffer).cast("B")
+
+        offset = 0
+        for arrival, priority, bursts, counts in chunks:
+            t.arrival.frombytes(raw(arrival))
+            t.priority.frombytes(raw(priority))
+            t.bursts.frombytes(raw(bursts))
+            ends = array("q")
+            ends.frombytes(raw(counts))
+            ends = array("q", accumulate(ends, initial=offset))
+            t.cursor.extend(ends[:-1])
+            t.burst_end.extend(ends[1:])
+            offset = ends[-1]
+
+        t.n = len(t.arrival)
+        t.pid = [f"P{h + 1}" for h in range(t.n)]
+        t.records = DefaultRecords(t.pid)
+        t.order = None
+        t._reset()
+        return t
+
+    def fresh(self):
+        """Copy of a table that has not run, sharing its input columns."""
+        t = copy.copy(self)
+        t.cursor = array("q", self.cursor)
+        t._reset()
+        return t
+
+    def _reset(self):
+        zeros = bytes(8 * self.n)
+        self.burst_time = array(self.typecode, zeros)    # total CPU time used
+        self.completion = array(self.typecode, zeros)
+        self.response = array(self.typecode, zeros)
+        self.started = bytearray(self.n)                 # response time recorded
+
+    def by_arrival(self):
+        if self.order is not None:
+            return self.order.tolist()          # stored with the table
+        return sorted(range(self.n), key=self.arrival.__getitem__)
+
+    def cpu_total(self, h):
+        # Sum of the CPU bursts (even positions) of h
+        start = self.cursor[h]
+        return sum(self.bursts[start:self.burst_end[h]:2])
+
+
+class DefaultRecords:
+    """Records of a generated table: a pid and every optional field at its default."""
+
+    def __init__(self, pids):
+        self.pids = pids
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __iter__(self):
+        return ({"pid": pid} for pid in self.pids)
+
+
+class Gantt:
+    """Dispatch slices as three columns; proc is a handle or -1 for IDLE."""
+
+    def __init__(self, typecode="q"):
+        self.proc = array("q")
+        self.start = array(typecode)
+        self.end = array(typecode)
+
+    def __len__(self):
+        return len(self.proc)
+
+    def add(self, h, start, end):
+        self.proc.append(h)
+        self.start.append(start)
+        self.end.append(end)
+
+    def extend(self, h, start, end):
+        # Like add(), but a slice that continues the last one grows it
+        if self.proc and self.proc[-1] == h and self.end[-1] == start:
+            self.end[-1] = end
+        else:
+            self.add(h, start, end)
+
+    def to_list(self, pids):
+        return [{
+            "pid": pids[h] if h >= 0 else "IDLE",
+            "start": s,
+            "end": e
+        } for h, s, e in zip(self.proc, self.start, self.end)]
+
+
+class NullGantt:
+    """Gantt that records nothing, for metrics-only runs."""
+
+    def __len__(self):
+        return 0
+
+    def add(self, h, start, end):
+        pass
+
+    extend = add
+
+    def to_list(self, pids):
+        return []
@@ -0,0 +1,171 @@
+"""
+Deterministic per-request profiler with speedscope output.
+
+Profiler records every Python and C function call of the current thread
+through sys.setprofile and produces a speedscope "evented" profile
+(https://www.speedscope.app, also readable by other flame graph tools).
+It is slow, which is fine: it only runs for requests that ask for it.
+
+phase(name) marks a stage of a request (parse, simulate, build_response,
+serialise). It shows up in the profile as a frame named "phase: <name>"
+around everything called inside it, and costs one attribute lookup when
+no profile is being taken.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+from .storage import sweep, valid_id
+
+
+SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+KEEP = 3600                 # seconds a stored profile is kept
+
+_local = threading.local()
+
+
+class Profiler:
+
+    def __init__(self, name):
+        self.name = name
+        self.frames = []            # speedscope frame dicts
+        self.index = {}             # code object / name -> frame index
+        self.events = []            # (at, frame, opened)
+        self.stack = []
+        self.start_ns = self.end_ns = 0
+
+    def frame(self, key, name, file=None, line=None):
+        i = self.index.get(key)
+        if i is None:
+            i = self.index[key] = len(self.frames)
+            frame = {"name": name}
+            if file:
+                frame["file"] = file
+                frame["line"] = line
+            self.frames.append(frame)
+        return i
+
+    def code_frame(self, code):
+        i = self.index.get(code)
+        if i is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            i = self.frame(code, name, code.co_filename, code.co_firstlineno)
+        return i
+
+    def builtin_frame(self, function):
+        # Keyed by name: every bound method (e.g. some_list.append) is a
+        # new object but should be one frame
+        name = getattr(function, "__qualname__", None) or type(function).__name__
+        module = getattr(function, "__module__", None)
+        if module:
+            name = f"{module}.{name}"
+        return self.frame(name, name)
+
+    def open(self, i):
+        self.stack.append(i)
+        self.events.append((time.perf_counter_ns(), i, True))
+
+    def close(self):
+        self.events.append((time.perf_counter_ns(), self.stack.pop(), False))
+
+    def _trace(self, frame, event, arg):
+        code = frame.f_code
+        if code in _IGNORED:
+            return
+        if event == "call":
+            self.open(self.code_frame(code))
+        elif event == "c_call":
+            self.open(self.builtin_frame(arg))
+        elif self.stack:
+            # return, c_return, c_exception; frames that were already
+            # running when the profile started have nothing to close
+            self.close()
+
+    def start(self):
+        _local.profiler = self
+        self.start_ns = time.perf_counter_ns()
+        sys.setprofile(self._trace)
+
+    def stop(self):
+        sys.setprofile(None)
+        _local.profiler = None
+        self.end_ns = time.perf_counter_ns()
+        while self.stack:
+            self.close()
+
+    def speedscope(self):
+        start = self.start_ns
+        events = [{"type": "O" if opened else "C", "frame": i, "at": at - start}
+                  for at, i, opened in self.events]
+        return {
+            "$schema": SCHEMA,
+            "exporter": "osscheduler",
+            "name": self.name,
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "evented",
+                "name": self.name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": self.end_ns - start,
+                "events": events,
+            }],
+        }
+
+
+class _Phase:
+
+    __slots__ = ("profiler",)
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler is not None:
+            self.profiler.close()
+
+
+def phase(name):
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.open(profiler.frame(f"phase: {name}", f"phase: {name}"))
+    return _Phase(profiler)
+
+
+# The profiler's own bookkeeping stays out of the profile
+_IGNORED = {
+    f.__code__ for f in (
+        Profiler.frame, Profiler.code_frame, Profiler.builtin_frame,
+        Profiler.open, Profiler.close, Profiler.start, Profiler.stop,
+        phase, _Phase.__init__, _Phase.__enter__, _Phase.__exit__,
+    )
+}
+
+
+# =========================
+# STORAGE
+# =========================
+def save(directory, profile):
+    """Write a speedscope profile and return its id."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    sweep(directory, KEEP)
+    profile_id = uuid.uuid4().hex
+    path = os.path.join(directory, f"{profile_id}.speedscope.json")
+    with open(path, "w") as f:
+        json.dump(profile, f, separators=(",", ":"))
+    return profile_id
+
+
+def path_of(directory, profile_id):
+    """Path of a stored profile, or None for an id that is not one of ours."""
+    if not valid_id(profile_id):
+        return None
+    return os.path.join(directory, f"{profile_id}.speedscope.json")
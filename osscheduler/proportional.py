@@ -0,0 +1,203 @@
+"""
+Proportional-share engines: lottery and stride scheduling.
+
+Processes carry "tickets" (default 100) and are scheduled one quantum at
+a time over their CPU bursts, like the preemptive engines. Lottery
+draws the winner from a Fenwick tree of the runnable processes' tickets
+with a seeded random.Random. Stride runs the lowest pass value from an
+IndexedHeap and advances it by STRIDE1 / tickets per quantum used.
+
+Both return (gantt, table, completed, total_time) for summarize(). They
+also fill table.fair with the CPU time each process was entitled to:
+tickets / runnable tickets, integrated over the time it was runnable.
+Both sides of that integral come from one running "share per ticket"
+total, so tracking it is O(1) per decision.
+"""
+from array import array
+import random
+
+from .engine import _sinks, _table
+from .fenwick import Fenwick
+from .indexed_heap import IndexedHeap
+
+
+POLICIES = ("lottery", "stride")
+
+DEFAULT_TICKETS = 100
+STRIDE1 = 1 << 20
+
+
+def _tickets(processes):
+    tickets = [p.get("tickets", DEFAULT_TICKETS) for p in processes]
+    for p, n in zip(processes, tickets):
+        if type(n) is not int or n <= 0:
+            raise ValueError(f"{p['pid']}: tickets must be a positive integer")
+    return tickets
+
+
+def _setup(processes, quantum):
+    if not quantum > 0:
+        raise ValueError("quantum must be positive")
+    t = _table(processes, "proportional")
+    t.tickets = _tickets(t.records)
+    t.remaining = array(t.typecode, [t.cpu_total(h) for h in range(t.n)])
+    t.fair = array("d", bytes(8 * t.n))
+    return t
+
+
+# =========================
+# RUNNABLE SETS
+# =========================
+# Both expose push(h), pick(), charge(h, run) and remove(h)
+class LotterySet:
+
+    def __init__(self, tickets, seed=0):
+        self.tickets = tickets
+        self.tree = Fenwick(len(tickets))
+        self.rng = random.Random(seed)
+
+    def push(self, h):
+        self.tree.add(h, self.tickets[h])
+
+    def pick(self):
+        return self.tree.find(self.rng.randrange(self.tree.total))
+
+    def charge(self, h, run):
+        pass
+
+    def remove(self, h):
+        self.tree.add(h, -self.tickets[h])
+
+
+class StrideSet:
+
+    def __init__(self, tickets, quantum=1):
+        self.stride = [STRIDE1 / n for n in tickets]
+        self.quantum = quantum
+        self.ready = IndexedHeap(len(tickets))     # (pass, tie) per handle
+        self.tie = 0
+        self.last_pass = 0.0
+
+    def push(self, h):
+        # Join one stride after the current minimum pass, so a newcomer
+        # neither starves nor monopolises the CPU
+        base = self.ready.peek_key()[0] if self.ready else self.last_pass
+        self.ready.push(h, (base + self.stride[h], self.tie))
+        self.tie += 1
+
+    def pick(self):
+        return self.ready.peek()
+
+    def charge(self, h, run):
+        # A short final quantum advances the pass proportionally
+        passed = self.ready.keys[h][0] + self.stride[h] * run / self.quantum
+        self.ready.update(h, (passed, self.tie))
+        self.tie += 1
+
+    def remove(self, h):
+        self.last_pass = self.ready.keys[h][0]
+        self.ready.remove(h)
+
+
+# =========================
+# QUANTUM LOOP
+# =========================
+def _run(t, quantum, runnable):
+    tickets, remaining, fair = t.tickets, t.remaining, t.fair
+
+    time = 0
+    gantt, completed = _sinks(t)
+    new = t.by_arrival()
+    arrived = 0
+    count = 0                   # runnable processes
+    total = 0                   # their tickets
+    share = 0.0                 # CPU time per ticket handed out so far
+    joined = [0.0] * t.n
+
+    while arrived < len(new) or count:
+
+        while arrived < len(new) and t.arrival[new[arrived]] <= time:
+            h = new[arrived]
+            runnable.push(h)
+            joined[h] = share
+            total += tickets[h]
+            count += 1
+            arrived += 1
+
+        if not count:
+            next_time = t.arrival[new[arrived]]
+            gantt.add(-1, time, next_time)
+            time = next_time
+            continue
+
+        h = runnable.pick()
+
+        if not t.started[h]:
+            t.started[h] = 1
+            t.response[h] = time - t.arrival[h]
+
+        run = min(quantum, remaining[h])
+        gantt.extend(h, time, time + run)   # consecutive quanta, one slice
+        remaining[h] -= run
+        t.burst_time[h] += run
+        share += run / total
+        time += run
+
+        if remaining[h] == 0:
+            runnable.remove(h)
+            fair[h] = tickets[h] * (share - joined[h])
+            total -= tickets[h]
+            count -= 1
+            t.completion[h] = time
+            completed.append(h)
+        else:
+            runnable.charge(h, run)
+
+    return gantt, t, completed, time
+
+
+def run_lottery(processes, quantum=1, seed=0):
+    t = _setup(processes, quantum)
+    return _run(t, quantum, LotterySet(t.tickets, seed))
+
+
+def run_stride(processes, quantum=1):
+    t = _setup(processes, quantum)
+    return _run(t, quantum, StrideSet(t.tickets, quantum))
+
+
+def run_proportional(policy, processes, quantum=1, seed=0):
+    if policy == "lottery":
+        return run_lottery(processes, quantum, seed)
+    if policy == "stride":
+        return run_stride(processes, quantum)
+    raise ValueError(f"unknown policy {policy!r}, expected one of {list(POLICIES)}")
+
+
+# =========================
+# FAIR-SHARE REPORT
+# =========================
+def fairness(table, completed):
+    """Per-process entitled vs received CPU, and Jain's index over the ratios."""
+    shares = []
+    ratios = []
+    for h in completed:
+        fair = round(table.fair[h], 6)
+        got = table.burst_time[h]
+        ratio = got / fair if fair else None
+        shares.append({
+            "pid": table.pid[h],
+            "tickets": table.tickets[h],
+            "fair_share": fair,
+            "received": got,
+            "share_ratio": ratio,
+        })
+        if ratio is not None:
+            ratios.append(ratio)
+
+    n = len(ratios)
+    return {
+        "processes": shares,
+        "jain_index": sum(ratios) ** 2 / (n * sum(r * r for r in ratios)) if n else None,
+        "max_deviation": max((abs(r - 1) for r in ratios), default=None),
+    }
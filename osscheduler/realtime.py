@@ -0,0 +1,312 @@
+"""
+Periodic real-time task sets: EDF and Rate Monotonic.
+
+A task is {"pid", "period", "wcet", "deadline" (default period),
+"offset" (default 0)} in integer time units. Job releases are generated
+lazily from one pending release per task, so memory stays O(tasks +
+pending jobs) however long the horizon or hyperperiod is.
+
+At every hyperperiod boundary (max offset + k·H) the pending jobs and
+next releases are recorded relative to the boundary. Once a state
+repeats, the schedule is periodic from there on: without a horizon the
+simulation stops, with one the whole number of remaining cycles is
+skipped and its job counts are scaled in. analyze() gives the classic
+schedulability tests, which do not depend on H at all.
+"""
+from functools import reduce
+import heapq
+import math
+
+
+POLICIES = ("edf", "rm")
+
+MAX_JOBS = 200_000
+
+
+def _tasks(tasks):
+    out = []
+    for t in tasks:
+        task = {
+            "pid": t["pid"],
+            "period": t["period"],
+            "wcet": t["wcet"],
+            "deadline": t.get("deadline", t["period"]),
+            "offset": t.get("offset", 0),
+        }
+        for field in ("period", "wcet", "deadline", "offset"):
+            value = task[field]
+            if type(value) is not int or value < 0 or (value == 0 and field != "offset"):
+                raise ValueError(f"{task['pid']}: {field} must be a positive integer")
+        out.append(task)
+    if not out:
+        raise ValueError("at least one task is required")
+    return out
+
+
+def hyperperiod(tasks):
+    return reduce(math.lcm, (t["period"] for t in tasks))
+
+
+# =========================
+# SCHEDULABILITY TESTS
+# =========================
+def _rm_order(tasks):
+    # Shorter period = higher priority, ties by request order
+    return sorted(range(len(tasks)), key=lambda i: (tasks[i]["period"], i))
+
+
+def _response_time(tasks, higher, i):
+    c, d = tasks[i]["wcet"], tasks[i]["deadline"]
+    r = c + sum(tasks[j]["wcet"] for j in higher)
+    while r <= d:
+        nxt = c + sum(-(-r // tasks[j]["period"]) * tasks[j]["wcet"] for j in higher)
+        if nxt == r:
+            return r
+        r = nxt
+    return None
+
+
+def _busy_period(tasks):
+    w = sum(t["wcet"] for t in tasks)
+    while True:
+        nxt = sum(-(-w // t["period"]) * t["wcet"] for t in tasks)
+        if nxt == w:
+            return w
+        w = nxt
+
+
+def _demand_ok(tasks, limit, max_points):
+    # dbf(L) <= L at every absolute deadline L up to the busy period
+    points = [(t["deadline"], i) for i, t in enumerate(tasks)]
+    heapq.heapify(points)
+    checked = 0
+    while points and points[0][0] <= limit:
+        L = points[0][0]
+        while points and points[0][0] == L:
+            _, i = heapq.heappop(points)
+            heapq.heappush(points, (L + tasks[i]["period"], i))
+        demand = sum(
+            ((L - t["deadline"]) // t["period"] + 1) * t["wcet"]
+            for t in tasks if L >= t["deadline"]
+        )
+        if demand > L:
+            return False
+        checked += 1
+        if checked >= max_points:
+            return None
+    return True
+
+
+def analyze(tasks, policy, max_points=100_000):
+    """Utilisation bounds and exact tests for the synchronous task set."""
+    tasks = _tasks(tasks)
+    n = len(tasks)
+    u = sum(t["wcet"] / t["period"] for t in tasks)
+    result = {"utilization": u, "hyperperiod": hyperperiod(tasks)}
+
+    if policy == "rm":
+        bound = n * (2 ** (1 / n) - 1)
+        order = _rm_order(tasks)
+        response = {}
+        for rank, i in enumerate(order):
+            if tasks[i]["deadline"] <= tasks[i]["period"]:
+                response[tasks[i]["pid"]] = _response_time(tasks, order[:rank], i)
+        exact = len(response) == n
+        result.update({
+            "liu_layland_bound": bound,
+            "liu_layland": u <= bound,
+            "hyperbolic": math.prod(t["wcet"] / t["period"] + 1 for t in tasks) <= 2,
+            "response_times": response,
+            "schedulable": all(r is not None for r in response.values()) if exact else None,
+        })
+    else:
+        if u > 1:
+            schedulable = False
+        elif all(t["deadline"] >= t["period"] for t in tasks):
+            schedulable = True
+        else:
+            limit = _busy_period(tasks) if u < 1 else result["hyperperiod"]
+            schedulable = _demand_ok(tasks, limit, max_points)
+        result.update({
+            "density": sum(t["wcet"] / min(t["deadline"], t["period"]) for t in tasks),
+            "schedulable": schedulable,
+        })
+
+    return result
+
+
+# =========================
+# EVENT-DRIVEN SIMULATION
+# =========================
+# ready entry: [key, seq, task, job, release, deadline, remaining]
+KEY, SEQ, TASK, JOB, RELEASE, DEADLINE, REMAINING = range(7)
+
+
+def _state(ready, releases, now, policy):
+    relative = sorted(
+        (e[KEY] - now if policy == "edf" else e[KEY], e[SEQ], e[TASK],
+         e[RELEASE] - now, e[DEADLINE] - now, e[REMAINING])
+        for e in ready
+    )
+    return (
+        tuple(r[:1] + r[2:] for r in relative),
+        tuple(sorted((i, when - now) for when, i, _ in releases)),
+    )
+
+
+def simulate(tasks, policy="edf", horizon=None, max_jobs=MAX_JOBS, extrapolate=True):
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {list(POLICIES)}")
+    tasks = _tasks(tasks)
+    if horizon is not None and (type(horizon) is not int or horizon <= 0):
+        raise ValueError("horizon must be a positive integer")
+
+    n = len(tasks)
+    H = hyperperiod(tasks)
+    # With more than H work released per hyperperiod the backlog only
+    # grows, so no state can repeat and recording states would cost
+    # O(backlog) per boundary
+    periodic = sum(t["wcet"] * (H // t["period"]) for t in tasks) <= H
+    rank = [0] * n
+    for r, i in enumerate(_rm_order(tasks)):
+        rank[i] = r
+
+    # Per-task counters; the scalable ones are snapshotted at boundaries
+    jobs = [0] * n
+    misses = [0] * n
+    rt_sum = [0] * n
+    rt_min = [None] * n
+    rt_max = [None] * n
+    lateness = [0] * n
+
+    releases = [(t["offset"], i, 0) for i, t in enumerate(tasks)]
+    heapq.heapify(releases)
+    ready = []
+    seq = 0
+
+    gantt = []
+    recording = True
+    last = None                 # (task, job) of the last Gantt slice
+
+    time = 0
+    boundary = max(t["offset"] for t in tasks)
+    seen = {}
+    repeat = None
+    truncated = False
+    released = 0
+
+    while True:
+        # Release every job due now, each scheduling its successor
+        while releases[0][0] == time:
+            _, i, job = heapq.heappop(releases)
+            t = tasks[i]
+            deadline = time + t["deadline"]
+            key = deadline if policy == "edf" else rank[i]
+            heapq.heappush(ready, [key, seq, i, job, time, deadline, t["wcet"]])
+            heapq.heappush(releases, (time + t["period"], i, job + 1))
+            seq += 1
+            released += 1
+
+        if time == boundary:
+            boundary += H
+            if repeat is None and periodic:
+                state = _state(ready, releases, time, policy)
+                if state in seen:
+                    start, snapshot = seen[state]
+                    period = time - start
+                    repeat = {"from": start, "period": period, "cycles": 0}
+                    if horizon is None:
+                        break
+                    cycles = (horizon - time) // period if extrapolate else 0
+                    if cycles:
+                        shift = cycles * period
+                        for counter, before in zip((jobs, misses, rt_sum), snapshot):
+                            for i in range(n):
+                                counter[i] += cycles * (counter[i] - before[i])
+                        for e in ready:
+                            if policy == "edf":
+                                e[KEY] += shift
+                            e[RELEASE] += shift
+                            e[DEADLINE] += shift
+                        releases = [(when + shift, i, job) for when, i, job in releases]
+                        heapq.heapify(releases)
+                        time += shift
+                        boundary = time + H
+                        repeat["cycles"] = cycles
+                        recording = False   # the Gantt covers the simulated part only
+                else:
+                    seen[state] = (time, (jobs[:], misses[:], rt_sum[:]))
+
+        if horizon is not None and time >= horizon:
+            break
+        if released >= max_jobs:
+            truncated = True
+            break
+
+        until = min(releases[0][0], boundary)
+        if horizon is not None:
+            until = min(until, horizon)
+
+        if ready:
+            e = ready[0]
+            until = min(until, time + e[REMAINING])
+            if recording:
+                if last == (e[TASK], e[JOB]) and gantt[-1]["end"] == time:
+                    gantt[-1]["end"] = until
+                else:
+                    gantt.append({"pid": tasks[e[TASK]]["pid"], "start": time, "end": until})
+                    last = (e[TASK], e[JOB])
+            e[REMAINING] -= until - time
+            time = until
+
+            if e[REMAINING] == 0:
+                heapq.heappop(ready)
+                i = e[TASK]
+                rt = time - e[RELEASE]
+                jobs[i] += 1
+                rt_sum[i] += rt
+                rt_min[i] = rt if rt_min[i] is None else min(rt_min[i], rt)
+                rt_max[i] = rt if rt_max[i] is None else max(rt_max[i], rt)
+                if time > e[DEADLINE]:
+                    misses[i] += 1
+                    lateness[i] = max(lateness[i], time - e[DEADLINE])
+        else:
+            if recording:
+                gantt.append({"pid": "IDLE", "start": time, "end": until})
+                last = None
+            time = until
+
+    # Jobs still pending past their deadline count as missed
+    pending = [0] * n
+    for e in ready:
+        pending[e[TASK]] += 1
+        if time > e[DEADLINE]:
+            misses[e[TASK]] += 1
+            lateness[e[TASK]] = max(lateness[e[TASK]], time - e[DEADLINE])
+
+    per_task = [{
+        "pid": t["pid"],
+        "jobs": jobs[i],
+        "pending": pending[i],
+        "misses": misses[i],
+        "max_lateness": lateness[i],
+        "response": {
+            "min": rt_min[i],
+            "max": rt_max[i],
+            "mean": rt_sum[i] / jobs[i] if jobs[i] else None,
+            "jitter": rt_max[i] - rt_min[i] if jobs[i] else None,
+        },
+    } for i, t in enumerate(tasks)]
+
+    return {
+        "gantt": gantt,
+        "tasks": per_task,
+        "analysis": analyze(tasks, policy),
+        "system": {
+            "total_time": time,
+            "hyperperiod": H,
+            "misses": sum(misses),
+            "repeat": repeat,
+            "truncated": truncated,
+        },
+    }
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -124,7 +126,45 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Pre-rendered visualizer page (python manage.py prerender), served at the
+# site root by WhiteNoise before the request reaches any view.
+PRERENDER_ROOT = BASE_DIR / "prerendered"
+if PRERENDER_ROOT.is_dir():
+    WHITENOISE_ROOT = PRERENDER_ROOT
+    WHITENOISE_INDEX_FILE = True
+
+# Identical API requests that are in flight at the same time share one
+# simulation: "thread" within a worker, "process" across the workers on
+# this host, or "off".
+SINGLEFLIGHT = os.environ.get("OSSCHEDULER_SINGLEFLIGHT", "thread")
+SINGLEFLIGHT_DIR = Path(tempfile.gettempdir()) / "osscheduler-singleflight"
+
+# Requests with the header "X-Profile: <PROFILE_TOKEN>" are profiled and
+# the speedscope profile saved in PROFILE_DIR. Disabled without a token.
+PROFILE_TOKEN = os.environ.get("OSSCHEDULER_PROFILE_TOKEN", "")
+PROFILE_DIR = Path(tempfile.gettempdir()) / "osscheduler-profiles"
+
+# Gantt pyramids of "mode": "tiles" runs, served by /api/tiles/<id>/ and
+# removed after an hour.
+TILES_DIR = Path(tempfile.gettempdir()) / "osscheduler-tiles"
+
+# Traces saved by /api/trace/ with "save": true, served by
+# /api/traces/<id>/ and removed after an hour.
+TRACES_DIR = Path(tempfile.gettempdir()) / "osscheduler-traces"
+
+# Workload library (/api/workloads/): decoded tables kept in memory per
+# worker, and the largest upload accepted.
+WORKLOAD_CACHE_BYTES = int(os.environ.get("OSSCHEDULER_WORKLOAD_CACHE_MB", "256")) << 20
+WORKLOAD_UPLOAD_MAX_BYTES = int(os.environ.get("OSSCHEDULER_WORKLOAD_UPLOAD_MB", "512")) << 20
 
 
 # Default primary key field type
@@ -0,0 +1,54 @@
+"""
+Lean settings for the API-only server profile.
+
+Only the /api/* scheduler endpoints are served. Admin, auth, sessions,
+messages and templates are left out so that cold starts import as
+little of Django as possible and every request skips the middleware
+chain entirely. The database is only touched by the workload library.
+
+Run with:
+    DJANGO_SETTINGS_MODULE=osscheduler.settings_api gunicorn osscheduler.wsgi_api
+"""
+
+from .settings import (  # noqa: F401
+    BASE_DIR, SECRET_KEY, DEBUG, ALLOWED_HOSTS, SINGLEFLIGHT, SINGLEFLIGHT_DIR,
+    PROFILE_TOKEN, PROFILE_DIR, TILES_DIR, TRACES_DIR, WORKLOAD_CACHE_BYTES,
+    WORKLOAD_UPLOAD_MAX_BYTES,
+)
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'osscheduler',
+]
+
+MIDDLEWARE = []
+
+ROOT_URLCONF = 'osscheduler.urls_api'
+
+TEMPLATES = []
+
+WSGI_APPLICATION = 'osscheduler.wsgi_api.application'
+
+
+# Database
+# The scheduler endpoints are stateless; the workload library keeps its
+# tables in the same SQLite database as the full settings.
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+
+# Internationalization
+
+USE_I18N = False
+
+USE_TZ = True
+
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
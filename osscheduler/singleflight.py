@@ -0,0 +1,187 @@
+"""
+Single-flight coalescing of identical in-flight API requests.
+
+The first POST for a given (path, canonical JSON body) runs the view.
+Identical requests that arrive while it is running wait for it and get a
+copy of its response instead of simulating again. Nothing is kept once
+the flight lands, so this is de-duplication, not a cache.
+
+settings.SINGLEFLIGHT selects the scope:
+
+    "thread"    threads of one worker share a flight (default)
+    "process"   additionally, workers on one host share a flight through
+                a flock()ed file per key in settings.SINGLEFLIGHT_DIR
+    "off"       every request runs its own view
+
+"process" needs fcntl; without it only threads are coalesced.
+"""
+from functools import wraps
+import hashlib
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+
+from .storage import sweep
+
+try:
+    import fcntl
+except ImportError:             # not POSIX
+    fcntl = None
+
+
+MODES = ("off", "thread", "process")
+
+SWEEP_AFTER = 60                # seconds a result file may outlive its flight
+
+
+def canonical_key(path, body):
+    """Key for a request, or None when the body is not JSON."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{path}\n{canonical}".encode()).hexdigest()
+
+
+def _snapshot(response):
+    return response.status_code, response["Content-Type"], response.content
+
+
+def _replay(snapshot):
+    status, content_type, content = snapshot
+    response = HttpResponse(content, status=status, content_type=content_type)
+    response["X-Single-Flight"] = "shared"
+    return response
+
+
+# =========================
+# IN-PROCESS FLIGHTS
+# =========================
+class Flight:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_lock = threading.Lock()
+
+
+def _thread_flight(key, compute):
+    """Return (result, leader)."""
+    with _lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = Flight()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, False
+
+    try:
+        flight.result = compute()
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+        flight.done.set()
+    return flight.result, True
+
+
+# =========================
+# CROSS-PROCESS FLIGHTS
+# =========================
+def _read(path, since):
+    # A result written after `since` belongs to the flight we waited on
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header["at"] < since:
+                return None
+            return header["status"], header["content_type"], f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write(path, snapshot):
+    status, content_type, content = snapshot
+    header = {"at": time.time(), "status": status, "content_type": content_type}
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def _process_flight(key, compute):
+    directory = settings.SINGLEFLIGHT_DIR
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    result_path = os.path.join(directory, f"{key}.result")
+    fd = os.open(os.path.join(directory, f"{key}.lock"), os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another worker is simulating this payload: wait for it
+            since = time.time()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            shared = _read(result_path, since)
+            if shared is not None:
+                return shared
+
+        snapshot = compute()
+        _write(result_path, snapshot)
+        return snapshot
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+        sweep(directory, SWEEP_AFTER, every=SWEEP_AFTER)
+
+
+# =========================
+# VIEW DECORATOR
+# =========================
+def single_flight(view):
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        mode = getattr(settings, "SINGLEFLIGHT", "thread")
+        if mode not in MODES:
+            raise ImproperlyConfigured(f"SINGLEFLIGHT must be one of {list(MODES)}, not {mode!r}")
+        if mode == "off" or request.method != "POST" or "HTTP_X_PROFILE" in request.META:
+            # a profiled request has to run its own view
+            return view(request, *args, **kwargs)
+
+        key = canonical_key(request.path, request.body)
+        if key is None:
+            return view(request, *args, **kwargs)
+
+        own = []
+
+        def compute():
+            response = view(request, *args, **kwargs)
+            own.append(response)
+            return _snapshot(response)
+
+        if mode == "process" and fcntl is not None:
+            # Threads of this worker queue behind one cross-process flight
+            snapshot, _ = _thread_flight(key, lambda: _process_flight(key, compute))
+        else:
+            snapshot, _ = _thread_flight(key, compute)
+
+        return own[0] if own else _replay(snapshot)
+
+    return wrapper
@@ -0,0 +1,302 @@
+"""
+Open-system steady-state runs.
+
+Instead of scheduling a fixed batch until it drains, processes keep
+arriving from a workload spec (see workload.py) for as long as the run
+lasts. A process is retired the moment it completes: its slot is reused
+and only per-batch sums are kept, so memory follows the number of
+processes in the system, not the number that ever arrived.
+
+Statistics use the method of batch means. The first `warmup` time units
+are discarded; after that the clock is cut into batches of `batch` time
+units, each contributing one mean per metric:
+
+  * wt / rt / tat of the processes completing in it,
+  * the time-average READY queue length and CPU utilisation,
+  * throughput.
+
+The steady-state estimate is the mean over batches with a Student-t
+interval, as in montecarlo.py. The run stops at `horizon`, or earlier
+once the interval on wt is within `target` of its mean.
+
+The engine is event-driven. Non-preemptive policies run each CPU burst
+to its end, like engine.run_nonpreemptive; srtf and prtf preempt only
+when an arrival or wakeup has a strictly better key than the running
+process (remaining CPU burst, or priority).
+"""
+from collections import deque
+import heapq
+import math
+
+import numpy as np
+
+from . import workload
+from .montecarlo import interval, t_quantile
+
+
+POLICIES = ("fcfs", "sjf", "ljf", "priority", "srtf", "prtf")
+
+PREEMPTIVE = ("srtf", "prtf")
+
+METRICS = ("wt", "rt", "tat", "queue_length", "utilisation", "throughput")
+
+MIN_BATCHES = 10            # before a target can stop the run
+
+MAX_IN_SYSTEM = 1_000_000   # more than this and the system is taken as unstable
+
+MAX_ARRIVALS = 20_000_000
+
+MAX_BATCHES = 10_000        # batch means kept per metric
+
+
+def _arrivals(spec, seed):
+    # (arrival, priority, bursts) of an endless stream of processes
+    for arrival, priority, flat, counts in workload.stream(spec, 1 << 62, seed):
+        ends = np.cumsum(counts).tolist()
+        flat = flat.tolist()
+        start = 0
+        for a, p, end in zip(arrival.tolist(), priority.tolist(), ends):
+            yield a, p, flat[start:end]
+            start = end
+
+
+# =========================
+# BATCH MEANS
+# =========================
+class BatchMeans:
+
+    def __init__(self, batch, warmup, horizon, target, confidence):
+        self.batch = batch
+        self.horizon = horizon
+        self.target = target
+        self.confidence = confidence
+        self.boundary = warmup if warmup > 0 else batch
+        self.warming = warmup > 0
+        self.batches = {metric: [] for metric in METRICS}
+        self.stopped_by = None
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.wt = self.rt = self.tat = 0
+        self.area = 0               # READY queue length x time
+        self.busy = 0
+
+    def complete(self, tat, wt, rt):
+        self.count += 1
+        self.tat += tat
+        self.wt += wt
+        self.rt += rt
+
+    def advance(self, time, to, queued, busy):
+        """Integrate [time, to) and close the batches it crosses; False once the run is over."""
+        while to >= self.boundary:
+            span = self.boundary - time
+            self.area += queued * span
+            self.busy += busy * span
+            time = self.boundary
+            self._close()
+            if self.stopped_by is not None:
+                return False
+        span = to - time
+        self.area += queued * span
+        self.busy += busy * span
+        return True
+
+    def _close(self):
+        if self.warming:
+            self.warming = False
+        else:
+            batch, batches = self.batch, self.batches
+            if self.count:
+                batches["wt"].append(self.wt / self.count)
+                batches["rt"].append(self.rt / self.count)
+                batches["tat"].append(self.tat / self.count)
+            batches["queue_length"].append(self.area / batch)
+            batches["utilisation"].append(self.busy / batch)
+            batches["throughput"].append(self.count / batch)
+            if self.boundary >= self.horizon:
+                self.stopped_by = "horizon"
+            elif self._target_met():
+                self.stopped_by = "target"
+        self._reset()
+        self.boundary += self.batch
+
+    def _target_met(self):
+        values = self.batches["wt"]
+        k = len(values)
+        if self.target is None or k < MIN_BATCHES:
+            return False
+        mean = sum(values) / k
+        std = float(np.std(values, ddof=1))
+        half = t_quantile((1 + self.confidence) / 2, k - 1) * std / math.sqrt(k)
+        return half <= self.target * abs(mean)
+
+    def report(self):
+        result = {}
+        for metric, values in self.batches.items():
+            result[metric] = interval(values, self.confidence) if values else None
+        return result
+
+    def lag1(self, metric="wt"):
+        # Autocorrelation of consecutive batch means; near 0 when the
+        # batches are long enough to be treated as independent
+        values = np.asarray(self.batches[metric], dtype=float)
+        if len(values) < 3 or values.std() == 0:
+            return None
+        return float(np.corrcoef(values[:-1], values[1:])[0, 1])
+
+
+# =========================
+# OPEN-SYSTEM ENGINE
+# =========================
+def run_open(spec, policy="fcfs", seed=0, batch=1000, warmup=None, horizon=None,
+             target=None, confidence=0.95):
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {list(POLICIES)}")
+    if not 0 < batch < math.inf:
+        raise ValueError("batch must be positive and finite")
+    warmup = batch if warmup is None else warmup
+    horizon = warmup + 30 * batch if horizon is None else horizon
+    if not (0 <= warmup < math.inf and warmup + batch <= horizon < math.inf):
+        raise ValueError("need a finite warmup >= 0 and horizon >= warmup + batch")
+    if (horizon - warmup) / batch > MAX_BATCHES:
+        raise ValueError(f"at most {MAX_BATCHES} batches between warmup and horizon")
+    if target is not None and not target > 0:
+        raise ValueError("target must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if type(seed) is not int or seed < 0:
+        raise ValueError("seed must be a non-negative integer")
+    if not isinstance(spec, dict):
+        raise ValueError("workload must be an object")
+
+    source = _arrivals(workload.parse_spec(spec), seed)
+    stats = BatchMeans(batch, warmup, horizon, target, confidence)
+    preemptive = policy in PREEMPTIVE
+
+    # Slots of the processes in the system, reused after they complete
+    arrival, priority, bursts, cursor, left, cpu, response = [], [], [], [], [], [], []
+    free = []
+
+    def key(s):
+        if policy == "sjf" or policy == "srtf":
+            return left[s]
+        if policy == "ljf":
+            return -left[s]
+        return priority[s]
+
+    fifo = policy == "fcfs"
+    ready = deque() if fifo else []
+    tie = 0
+    blocked = []                # (when, seq, slot)
+    seq = 0
+
+    def make_ready(s):
+        nonlocal tie
+        if fifo:
+            ready.append(s)
+        else:
+            heapq.heappush(ready, (key(s), tie, s))
+            tie += 1
+
+    time = 0
+    running = None
+    run_start = run_end = 0
+    in_system = peak = arrived = completed = 0
+    upcoming = next(source)
+
+    while True:
+        event = upcoming[0]
+        if blocked and blocked[0][0] < event:
+            event = blocked[0][0]
+        if running is not None and run_end < event:
+            event = run_end
+        if not stats.advance(time, event, len(ready), running is not None):
+            break
+        time = event
+
+        # The running burst ends → BLOCKED or retired
+        if running is not None and run_end == time:
+            s = running
+            running = None
+            c = cursor[s]
+            if c + 1 < len(bursts[s]):
+                heapq.heappush(blocked, (time + bursts[s][c + 1], seq, s))
+                seq += 1
+                cursor[s] = c + 2
+            else:
+                tat = time - arrival[s]
+                stats.complete(tat, tat - cpu[s], response[s])
+                bursts[s] = None
+                free.append(s)
+                in_system -= 1
+                completed += 1
+
+        # NEW → READY, then BLOCKED → READY
+        while upcoming[0] <= time:
+            a, p, b = upcoming
+            if free:
+                s = free.pop()
+                arrival[s], priority[s], bursts[s], cursor[s] = a, p, b, 0
+                left[s], cpu[s], response[s] = b[0], sum(b[0::2]), None
+            else:
+                s = len(arrival)
+                for column, value in zip(
+                    (arrival, priority, bursts, cursor, left, cpu, response),
+                    (a, p, b, 0, b[0], sum(b[0::2]), None),
+                ):
+                    column.append(value)
+            make_ready(s)
+            in_system += 1
+            arrived += 1
+            upcoming = next(source)
+        while blocked and blocked[0][0] <= time:
+            s = heapq.heappop(blocked)[2]
+            left[s] = bursts[s][cursor[s]]
+            make_ready(s)
+
+        peak = max(peak, in_system)
+        if in_system > MAX_IN_SYSTEM:
+            raise ValueError(
+                f"more than {MAX_IN_SYSTEM} processes in the system at time {time}: "
+                "arrivals outpace the CPU, so there is no steady state"
+            )
+        if arrived > MAX_ARRIVALS:
+            stats.stopped_by = "arrivals"
+            break
+
+        # A better key preempts the running process
+        if preemptive and running is not None and ready:
+            left[running] = run_end - time
+            if ready[0][0] < key(running):
+                make_ready(running)
+                running = None
+
+        if running is None and ready:
+            s = ready.popleft() if fifo else heapq.heappop(ready)[2]
+            if response[s] is None:
+                response[s] = time - arrival[s]
+            running = s
+            run_start, run_end = time, time + left[s]
+
+    return {
+        "policy": policy,
+        "seed": seed,
+        "batch": batch,
+        "warmup": warmup,
+        "horizon": horizon,
+        "simulated_time": time,
+        "batches": len(stats.batches["utilisation"]),
+        "stopped_by": stats.stopped_by,
+        "target": target,
+        "confidence": confidence,
+        "steady_state": stats.report(),
+        "lag1_wt": stats.lag1(),
+        "processes": {
+            "arrived": arrived,
+            "completed": completed,
+            "in_system": in_system,
+            "max_in_system": peak,
+        },
+    }
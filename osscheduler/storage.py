@@ -0,0 +1,35 @@
+"""
+Files the API keeps for a while: stored profiles, tile pyramids, saved
+traces and cross-process single-flight results. Each kind lives in its
+own directory, under a uuid4().hex id where clients fetch it by id, and
+is swept once it is older than that kind's KEEP.
+"""
+import os
+import time
+
+
+_last_sweep = {}                # directory -> time it was last swept
+
+
+def valid_id(value):
+    """Whether `value` is an id as the stores hand out (32 lowercase hex digits)."""
+    return len(value) == 32 and all(c in "0123456789abcdef" for c in value)
+
+
+def sweep(directory, keep, remove=os.remove, every=None):
+    """Remove the entries of `directory` older than `keep` seconds.
+
+    Scans at most once per `every` seconds (keep / 10 by default) per
+    directory; `remove` deletes one entry by path (shutil.rmtree for
+    directories).
+    """
+    now = time.time()
+    if now - _last_sweep.get(directory, 0.0) < (keep / 10 if every is None else every):
+        return
+    _last_sweep[directory] = now
+    for entry in os.scandir(directory):
+        try:
+            if now - entry.stat().st_mtime > keep:
+                remove(entry.path)
+        except OSError:
+            pass
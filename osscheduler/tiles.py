@@ -0,0 +1,230 @@
+"""
+Level-of-detail Gantt tiles.
+
+build() turns an engine's Gantt into a pyramid:
+
+  * level 0 is the exact slices, as the engine dispatched them;
+  * level k >= 1 cuts the time axis into buckets of width
+    base * FANOUT^(k-1) and keeps, per bucket, how much of it each
+    process ran. Only the TOP processes of a bucket are kept by name,
+    the rest of its busy time is summed as "other".
+
+Level 1 has no more buckets than level 0 has slices and every level
+after that has FANOUT times fewer, up to a single bucket for the whole
+schedule, so the pyramid is O(slices). Each level is computed from the
+previous one's (bucket, process) sums.
+
+tile() answers a (level, t0, t1) window with binary searches on the
+stored columns, which save() writes as .npy files so a tile request
+memory-maps them instead of reading the whole pyramid. A window may
+hold at most TILE_LIMIT buckets (or slices at level 0): panning and
+zooming cost bounded bytes and time at every scale.
+"""
+import json
+import math
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from .storage import sweep, valid_id
+
+
+FANOUT = 4
+
+TOP = 8
+
+TILE_LIMIT = 2048
+
+KEEP = 3600                 # seconds a stored pyramid is kept
+
+
+def _widths(typecode, total_time, slices):
+    # Level 1 is the narrowest power of FANOUT with no more buckets than
+    # there are slices (at least 1 time unit for integer schedules)
+    if not slices or total_time <= 0:
+        return []
+    power = 0 if typecode == "q" else math.floor(math.log(total_time / slices, FANOUT))
+    width = FANOUT ** power
+    while total_time / width > slices:
+        width *= FANOUT
+    widths = [width]
+    while total_time > width:
+        width *= FANOUT
+        widths.append(width)
+    return widths
+
+
+def _pairs(proc, start, end, width, n):
+    # Busy time of every (bucket, process) pair for buckets of `width`,
+    # as key = bucket * n + handle with the busy times summed per key
+    keep = (proc >= 0) & (end > start)
+    proc, start, end = proc[keep], start[keep], end[keep]
+    first = np.floor(start / width).astype(np.int64)
+    last = np.ceil(end / width).astype(np.int64) - 1
+    span = last - first + 1
+
+    slice_of = np.repeat(np.arange(len(proc)), span)
+    offset = np.arange(len(slice_of)) - np.repeat(np.cumsum(span) - span, span)
+    bucket = first[slice_of] + offset
+    busy = (np.minimum(end[slice_of], (bucket + 1) * width)
+            - np.maximum(start[slice_of], bucket * width))
+    return _sum(bucket * n + proc[slice_of], busy)
+
+
+def _sum(keys, busy):
+    keys, inverse = np.unique(keys, return_inverse=True)
+    return keys, np.bincount(inverse, weights=busy)
+
+
+def _level(keys, busy, n, buckets):
+    bucket, proc = keys // n, keys % n
+    total = np.bincount(bucket, weights=busy, minlength=buckets)
+
+    # Largest TOP processes of every bucket, by busy time
+    order = np.lexsort((-busy, bucket))
+    bucket, proc, busy = bucket[order], proc[order], busy[order]
+    first = np.searchsorted(bucket, bucket)
+    top = np.arange(len(bucket)) - first < TOP
+    bucket, proc, busy = bucket[top], proc[top], busy[top]
+
+    return {
+        "offsets": np.searchsorted(bucket, np.arange(buckets + 1)),
+        "proc": proc,
+        "busy": busy,
+        "total": total,
+    }
+
+
+def build(gantt, pids, total_time):
+    """Pyramid of a Gantt: {"levels": [...], "pids": ..., "total_time": ...}."""
+    dtype = np.int64 if gantt.start.typecode == "q" else np.float64
+    proc = np.frombuffer(gantt.proc, dtype=np.int64)
+    start = np.frombuffer(gantt.start, dtype=dtype)
+    end = np.frombuffer(gantt.end, dtype=dtype)
+    n = max(len(pids), 1)
+
+    levels = [{"width": None, "proc": proc, "start": start, "end": end}]
+    keys = busy = None
+    for width in _widths(gantt.start.typecode, total_time, len(proc)):
+        if keys is None:
+            keys, busy = _pairs(proc, start, end, width, n)
+        else:
+            keys, busy = _sum((keys // n // FANOUT) * n + keys % n, busy)
+        level = _level(keys, busy, n, math.ceil(total_time / width))
+        level["width"] = width
+        levels.append(level)
+
+    return {
+        "levels": levels,
+        "pids": np.array([json.dumps(pid).encode() for pid in pids]),
+        "total_time": total_time,
+    }
+
+
+# =========================
+# STORAGE
+# =========================
+def save(directory, pyramid):
+    """Write a pyramid and return its description: id, total time and levels."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    sweep(directory, KEEP, shutil.rmtree)
+    tiles_id = uuid.uuid4().hex
+    path = os.path.join(directory, tiles_id)
+    os.mkdir(path, mode=0o700)
+
+    np.save(os.path.join(path, "pids.npy"), pyramid["pids"])
+    levels = []
+    for k, level in enumerate(pyramid["levels"]):
+        for name, column in level.items():
+            if name != "width":
+                np.save(os.path.join(path, f"{k}.{name}.npy"), column)
+        count = len(level["proc"]) if k == 0 else len(level["total"])
+        levels.append({"level": k, "width": level["width"], "count": count})
+
+    meta = {"id": tiles_id, "total_time": pyramid["total_time"], "levels": levels,
+            "tile_limit": TILE_LIMIT}
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def path_of(directory, tiles_id):
+    """Directory of a stored pyramid, or None for an id that is not one of ours."""
+    if not valid_id(tiles_id):
+        return None
+    return os.path.join(directory, tiles_id)
+
+
+# =========================
+# TILES
+# =========================
+def describe(path):
+    """What save() returned for a stored pyramid; OSError if there is none."""
+    with open(os.path.join(path, "meta.json")) as f:
+        return json.load(f)
+
+
+def tile(path, level, t0, t1):
+    """The part of a stored level between t0 and t1; OSError if there is no such pyramid."""
+    meta = describe(path)
+    if type(level) is not int or not 0 <= level < len(meta["levels"]):
+        raise ValueError(f"level must be an integer from 0 to {len(meta['levels']) - 1}")
+    if not t0 < t1:
+        raise ValueError("need t0 < t1")
+
+    def column(name):
+        return np.load(os.path.join(path, f"{level}.{name}.npy"), mmap_mode="r")
+
+    pids = np.load(os.path.join(path, "pids.npy"), mmap_mode="r")
+    total_time = meta["total_time"]
+    width = meta["levels"][level]["width"]
+    result = {"level": level, "width": width, "t0": t0, "t1": t1}
+
+    if width is None:
+        end, start = column("end"), column("start")
+        i0 = int(np.searchsorted(end, t0, side="right"))
+        i1 = max(i0, int(np.searchsorted(start, t1, side="left")))
+        _check(i1 - i0)
+        proc = column("proc")[i0:i1].tolist()
+        result["slices"] = [{
+            "pid": json.loads(pids[h]) if h >= 0 else "IDLE",
+            "start": s,
+            "end": e,
+        } for h, s, e in zip(proc, start[i0:i1].tolist(), end[i0:i1].tolist())]
+        return result
+
+    buckets = meta["levels"][level]["count"]
+    b0 = min(max(0, math.floor(t0 / width)), buckets)
+    b1 = max(b0, min(buckets, math.ceil(t1 / width)))
+    _check(b1 - b0)
+    offsets = column("offsets")[b0:b1 + 1].tolist()
+    proc = column("proc")[offsets[0]:offsets[-1]].tolist()
+    busy = column("busy")[offsets[0]:offsets[-1]].tolist()
+    totals = column("total")[b0:b1].tolist()
+
+    out = []
+    for i, b in enumerate(range(b0, b1)):
+        start = b * width
+        span = min(start + width, total_time) - start
+        lo, hi = offsets[i] - offsets[0], offsets[i + 1] - offsets[0]
+        shares = {}
+        for h, t in zip(proc[lo:hi], busy[lo:hi]):
+            shares[json.loads(pids[h])] = round(t / span, 6)
+        out.append({
+            "start": start,
+            "end": start + span,
+            "idle": round(1 - totals[i] / span, 6),
+            "pids": shares,
+            "other": round((totals[i] - sum(busy[lo:hi])) / span, 6),
+        })
+    result["buckets"] = out
+    return result
+
+
+def _check(count):
+    if count > TILE_LIMIT:
+        raise ValueError(
+            f"{count} items in view, at most {TILE_LIMIT}: zoom in or use a coarser level"
+        )
@@ -0,0 +1,341 @@
+"""
+Chrome / Perfetto trace export.
+
+TraceWriter is a sink for the engines, like the running aggregates of
+metrics mode: with_trace() attaches it to a table, and the engine's
+Gantt, BLOCKED queue and completions all go through it. Every event is
+written out as soon as it is known, in the Trace Event Format that
+Perfetto (ui.perfetto.dev) and chrome://tracing open, so memory does not
+grow with the schedule: only one time per process (when it entered its
+current state) and one open slice are kept next to the table.
+
+The trace has two processes:
+
+  * "CPU": one track, with a slice per dispatch named after the process,
+    "idle" slices and "switch" slices for context switches;
+  * "Processes": one track per process, in request order, with its
+    "ready", "running" and "io" slices and "arrive" / "exit" instants.
+
+Consecutive time units of one process (the preemptive engine dispatches
+one unit at a time) are one slice. One scheduler time unit is one
+microsecond of trace time.
+
+stream() runs the engine in a thread and yields the trace in chunks as
+they are consumed, so a response never holds more than a few of them;
+save() writes it to a file served by /api/traces/<id>/.
+"""
+from array import array
+import json
+import os
+import queue
+import re
+import threading
+import uuid
+import zlib
+
+from .blocked_queue import make_blocked_queue
+from .devices import DeviceSet
+from .engine import POLICIES, _table, run_policy, with_metrics
+from .storage import sweep, valid_id
+
+
+CPU, PROCESSES = 1, 2           # trace pids of the two groups of tracks
+
+CHUNK = 1 << 16                 # bytes of events buffered before a write
+
+KEEP = 3600                     # seconds a saved trace is kept
+
+_PLAIN = re.compile(r'[\w .:#/+-]*\Z', re.ASCII).match
+
+
+class TraceWriter:
+    """Gantt, completion sink and BLOCKED wrapper that write trace events."""
+
+    def __init__(self, table, out, context_switch=0):
+        self.table = table
+        self.out = out
+        self.context_switch = context_switch
+        self.clock = 0          # end of the last dispatch
+        self.metrics = table.metrics
+        self.pids = table.pid
+        self.since = array(table.typecode, table.arrival)
+        self.slice = None       # open dispatch [h, start, end]
+        self.parts = []
+        self.size = 0
+        self.events = 0
+        self.slices = 0
+        self.first = True
+
+    # -------------------------
+    # OUTPUT
+    # -------------------------
+    def _emit(self, event):
+        self.parts.append(event)
+        self.size += len(event)
+        self.events += 1
+        if self.size >= CHUNK:
+            self._write()
+
+    def _write(self):
+        if not self.parts:
+            return
+        text = ",\n".join(self.parts)
+        self.out.write((text if self.first else ",\n" + text).encode())
+        self.first = False
+        self.parts = []
+        self.size = 0
+
+    def _name(self, h):
+        # A pid as a JSON string; most need no escaping
+        pid = self.pids[h]
+        return f'"{pid}"' if type(pid) is str and _PLAIN(pid) else json.dumps(str(pid))
+
+    def _slice(self, pid, tid, name, start, end):
+        self._emit(f'{{"ph":"X","pid":{pid},"tid":{tid},"name":{name},"ts":{start},"dur":{end - start}}}')
+
+    def _instant(self, tid, name, ts):
+        self._emit(f'{{"ph":"i","s":"t","pid":{PROCESSES},"tid":{tid},"name":"{name}","ts":{ts}}}')
+
+    def begin(self, policy):
+        self.out.write(b'{"traceEvents":[\n')
+        self._emit(f'{{"ph":"M","pid":{CPU},"name":"process_name","args":{{"name":"CPU ({policy})"}}}}')
+        self._emit(f'{{"ph":"M","pid":{CPU},"tid":0,"name":"thread_name","args":{{"name":"CPU 0"}}}}')
+        self._emit(f'{{"ph":"M","pid":{PROCESSES},"name":"process_name","args":{{"name":"Processes"}}}}')
+        arrival = self.table.arrival
+        for h in range(self.table.n):
+            name = self._name(h)
+            self._emit(f'{{"ph":"M","pid":{PROCESSES},"tid":{h + 1},"name":"thread_name","args":{{"name":{name}}}}}')
+            self._emit(f'{{"ph":"M","pid":{PROCESSES},"tid":{h + 1},"name":"thread_sort_index","args":{{"sort_index":{h}}}}}')
+            self._instant(h + 1, "arrive", arrival[h])
+
+    def end(self, other):
+        self._close_slice()
+        self._write()
+        self.out.write(f'\n],"otherData":{json.dumps(other)}}}\n'.encode())
+
+    # -------------------------
+    # GANTT
+    # -------------------------
+    def __len__(self):
+        return self.slices
+
+    def add(self, h, start, end):
+        s = self.slice
+        if s is not None and s[0] == h and s[2] == start:
+            s[2] = end
+        else:
+            self._close_slice()
+            if start > self.clock:
+                # The engines leave context switches, and the preemptive
+                # one its idle time units, out of the Gantt
+                gap = '"switch"' if start - self.clock == self.context_switch else '"idle"'
+                self._slice(CPU, 0, gap, self.clock, start)
+            self.slice = [h, start, end]
+            if h >= 0 and self.since[h] < start:
+                self._slice(PROCESSES, h + 1, '"ready"', self.since[h], start)
+        self.clock = end
+        if h >= 0:
+            self.since[h] = end
+
+    extend = add
+
+    def _close_slice(self):
+        s = self.slice
+        if s is None:
+            return
+        h, start, end = s
+        self.slice = None
+        self.slices += 1
+        if h < 0:
+            self._slice(CPU, 0, '"idle"', start, end)
+        else:
+            self._slice(CPU, 0, self._name(h), start, end)
+            self._slice(PROCESSES, h + 1, '"running"', start, end)
+
+    # -------------------------
+    # COMPLETIONS
+    # -------------------------
+    def append(self, h):
+        self._instant(h + 1, "exit", self.table.completion[h])
+        self.metrics.append(h)
+
+    def watch(self, blocked):
+        return _Watched(blocked, self)
+
+
+class _Watched:
+    """BLOCKED queue that reports every I/O burst as an "io" slice."""
+
+    def __init__(self, inner, trace):
+        self.inner = inner
+        self.trace = trace
+
+    def __len__(self):
+        return len(self.inner)
+
+    def submit(self, now, duration, h):
+        self.trace.since[h] = now
+        self.inner.submit(now, duration, h)
+
+    def next_time(self):
+        return self.inner.next_time()
+
+    def pop_due(self, now):
+        # One completion time at a time, so every slice ends when its I/O
+        # did; the order is still (when, push order)
+        inner, trace = self.inner, self.trace
+        since = trace.since
+        due = []
+        while inner and inner.next_time() <= now:
+            when = inner.next_time()
+            for h in inner.pop_due(when):
+                trace._slice(PROCESSES, h + 1, '"io"', since[h], when)
+                since[h] = when
+                due.append(h)
+        return due
+
+
+# =========================
+# RUNS
+# =========================
+def prepare(policy, processes, context_switch=0, blocked_queue="heap", devices=None):
+    """Table for a traced run; ValueError for a request that cannot run.
+
+    The BLOCKED queue and devices are built once here too, so a bad option
+    fails before a streamed response has started.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+    table = with_metrics(_table(processes, policy, context_switch), context_switch)
+    make_blocked_queue(blocked_queue)
+    if devices is not None:
+        DeviceSet(devices, table.records, table.typecode)
+    return table
+
+
+def with_trace(table, out, context_switch=0):
+    """Attach a TraceWriter writing to `out` (binary, .write only) to a prepared table."""
+    table.trace_writer = TraceWriter(table, out, context_switch)
+    return table.trace_writer
+
+
+def run_trace(policy, table, out, context_switch=0, blocked_queue="heap", devices=None):
+    """Run a prepared table, writing its trace to `out`; returns the run's summary."""
+    trace = with_trace(table, out, context_switch)
+    trace.begin(policy)
+    total_time = run_policy(policy, table, context_switch, blocked_queue, devices)[3]
+    trace._close_slice()
+    stats = table.metrics.report()
+    n = len(table.metrics)
+    summary = {
+        "policy": policy,
+        "processes": n,
+        "slices": trace.slices,
+        "total_time": total_time,
+        "throughput": n / total_time if total_time > 0 else 0,
+        "average": {name: stats[name]["mean"] for name in ("tat", "wt", "rt")},
+        "time_unit": "1 scheduler time unit = 1 us",
+    }
+    trace.end(summary)
+    summary["events"] = trace.events
+    return summary
+
+
+class _Gzip:
+    """Binary writer that gzips what it is given into another writer."""
+
+    def __init__(self, out):
+        self.out = out
+        self.z = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def write(self, data):
+        data = self.z.compress(data)
+        if data:
+            self.out.write(data)
+
+    def close(self):
+        self.out.write(self.z.flush())
+
+
+class _Closed(Exception):
+    pass
+
+
+class _Pipe:
+    # Hands chunks to the consuming thread; blocks while `depth` are
+    # waiting, and gives up once the consumer has gone
+    def __init__(self, chunks, stop):
+        self.chunks = chunks
+        self.stop = stop
+
+    def write(self, data):
+        while not self.stop.is_set():
+            try:
+                self.chunks.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise _Closed
+
+
+def stream(policy, table, context_switch=0, blocked_queue="heap", devices=None,
+           gzip=False, depth=8):
+    """Trace of a prepared table as a generator of byte chunks, run as it is consumed."""
+    chunks = queue.Queue(depth)
+    stop = threading.Event()
+    pipe = _Pipe(chunks, stop)
+
+    def work():
+        out = _Gzip(pipe) if gzip else pipe
+        try:
+            run_trace(policy, table, out, context_switch, blocked_queue, devices)
+            if gzip:
+                out.close()
+            pipe.write(None)
+        except _Closed:
+            pass
+        except Exception as e:
+            try:
+                pipe.write(e)
+            except _Closed:
+                pass
+
+    worker = threading.Thread(target=work, name="trace", daemon=True)
+    worker.start()
+    try:
+        while (chunk := chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        stop.set()
+        worker.join()
+
+
+# =========================
+# SAVED TRACES
+# =========================
+def save(directory, policy, table, context_switch=0, blocked_queue="heap", devices=None,
+         gzip=False):
+    """Write a trace to a file and return its id, size and the run's summary."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    sweep(directory, KEEP)
+    trace_id = uuid.uuid4().hex
+    path = os.path.join(directory, trace_id + (".json.gz" if gzip else ".json"))
+    with open(path, "wb") as f:
+        out = _Gzip(f) if gzip else f
+        summary = run_trace(policy, table, out, context_switch, blocked_queue, devices)
+        if gzip:
+            out.close()
+    return {"id": trace_id, "bytes": os.path.getsize(path), "gzip": gzip, **summary}
+
+
+def path_of(directory, trace_id):
+    """File of a saved trace, or None when there is none."""
+    if not valid_id(trace_id):
+        return None
+    for name in (trace_id + ".json", trace_id + ".json.gz"):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
@@ -28,6 +28,22 @@ urlpatterns = [
     path('api/lrtf/', views.lrtf_view, name='lrtf'),
     path('api/priority/',views.priority_view, name='priority'),
     path('api/srtf/', views.srtf_view, name='srtf'),
+    path('api/montecarlo/', views.montecarlo_view, name='montecarlo'),
+    path('api/steady/', views.steady_view, name='steady'),
+    path('api/optimal/', views.optimal_view, name='optimal'),
+    path('api/edf/', views.edf_view, name='edf'),
+    path('api/rm/', views.rm_view, name='rm'),
+    path('api/lottery/', views.lottery_view, name='lottery'),
+    path('api/stride/', views.stride_view, name='stride'),
+    path('api/cfs/', views.cfs_view, name='cfs'),
+    path('api/multilevel/', views.multilevel_view, name='multilevel'),
+    path('api/profiles/<str:profile_id>/', views.profile_view, name='profile'),
+    path('api/tiles/<str:tiles_id>/', views.tiles_view, name='tiles'),
+    path('api/trace/', views.trace_view, name='trace'),
+    path('api/traces/<str:trace_id>/', views.trace_file_view, name='trace_file'),
+    path('api/workloads/', views.workloads_view, name='workloads'),
+    path('api/workloads/export/', views.workloads_export_view, name='workloads_export'),
+    path('api/workloads/<str:workload_id>/', views.workload_view, name='workload'),
 
     
     path('api/fcfs/', views.fcfs_visualization_view, name='fcfs'),
@@ -0,0 +1,46 @@
+"""
+URL configuration for the API-only server profile.
+
+Views are resolved on first use so that importing the URLconf does not
+pull in the scheduler engines. Set OSSCHEDULER_PRELOAD=1 to import them
+eagerly instead (e.g. under gunicorn --preload, so forked workers share
+the imported modules).
+"""
+from importlib import import_module
+
+from django.urls import path
+
+
+def _lazy(name):
+    def view(request, *args, **kwargs):
+        views = import_module("osscheduler.views")
+        return getattr(views, name)(request, *args, **kwargs)
+    view.__name__ = name
+    return view
+
+
+urlpatterns = [
+    path('api/fcfs/', _lazy('fcfs_view'), name='fcfs'),
+    path('api/sjf/', _lazy('sjf_view'), name='sjf'),
+    path('api/ljf/', _lazy('ljf_view'), name='ljf'),
+    path('api/lrtf/', _lazy('lrtf_view'), name='lrtf'),
+    path('api/priority/', _lazy('priority_view'), name='priority'),
+    path('api/srtf/', _lazy('srtf_view'), name='srtf'),
+    path('api/prtf/', _lazy('prtf_visualization_view'), name='prtf'),
+    path('api/montecarlo/', _lazy('montecarlo_view'), name='montecarlo'),
+    path('api/steady/', _lazy('steady_view'), name='steady'),
+    path('api/optimal/', _lazy('optimal_view'), name='optimal'),
+    path('api/edf/', _lazy('edf_view'), name='edf'),
+    path('api/rm/', _lazy('rm_view'), name='rm'),
+    path('api/lottery/', _lazy('lottery_view'), name='lottery'),
+    path('api/stride/', _lazy('stride_view'), name='stride'),
+    path('api/cfs/', _lazy('cfs_view'), name='cfs'),
+    path('api/multilevel/', _lazy('multilevel_view'), name='multilevel'),
+    path('api/profiles/<str:profile_id>/', _lazy('profile_view'), name='profile'),
+    path('api/tiles/<str:tiles_id>/', _lazy('tiles_view'), name='tiles'),
+    path('api/trace/', _lazy('trace_view'), name='trace'),
+    path('api/traces/<str:trace_id>/', _lazy('trace_file_view'), name='trace_file'),
+    path('api/workloads/', _lazy('workloads_view'), name='workloads'),
+    path('api/workloads/export/', _lazy('workloads_export_view'), name='workloads_export'),
+    path('api/workloads/<str:workload_id>/', _lazy('workload_view'), name='workload'),
+]
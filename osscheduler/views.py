@@ -1,604 +1,766 @@
 from collections import deque
-from django.http import JsonResponse
+from functools import wraps
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
 import json
 import heapq
+import hmac
+
+from .blocked_queue import make_blocked_queue
+from .indexed_heap import IndexedHeap
+from .engine import run_policy, run_preemptive, simulate, summarize, summarize_metrics, with_metrics
+from .process_table import NullGantt
+from .profiling import Profiler, phase
+from .singleflight import single_flight
+from . import cfs, multilevel, proportional, realtime, profiling
 
 
 # =========================
-# FCFS SCHEDULER
+# PROFILING
+# X-Profile: <settings.PROFILE_TOKEN> runs one request under the profiler
 # =========================
-def fcfs_view(request):
-    if request.method != "POST":
-        return JsonResponse({"error": "POST method required"}, status=405)
-
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
-
-    time = 0
-    gantt = []
-
-    # NEW queue (sorted by arrival time)
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "bursts": p["bursts"],
-        "index": 0,                # current burst index
-        "burst_time": 0,           # total CPU time used
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
+def _profile_allowed(request):
+    token = settings.PROFILE_TOKEN
+    given = request.headers.get("X-Profile", "")
+    return bool(token) and hmac.compare_digest(given.encode(), token.encode())
 
-    new.sort(key=lambda x: x["arrival"])
-
-    ready = deque()               # READY queue
-    blocked = []                  # (unblock_time, process)
-    completed = []
-
-    while new or ready or blocked:
-
-        # NEW → READY
-        for p in new[:]:
-            if p["arrival"] <= time:
-                ready.append(p)
-                new.remove(p)
 
-        # BLOCKED → READY
-        for unblock_time, p in blocked[:]:
-            if unblock_time <= time:
-                ready.append(p)
-                blocked.remove((unblock_time, p))
-
-        if ready:
-            p = ready.popleft()
+def profiled(view):
 
-            cpu_time = p["bursts"][p["index"]]
-            start = time
-            end = start + cpu_time
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if "HTTP_X_PROFILE" not in request.META:
+            return view(request, *args, **kwargs)
+        if not _profile_allowed(request):
+            return JsonResponse({"error": "profiling not allowed"}, status=403)
 
-            # Response time only once
-            if p["response_time"] is None:
-                p["response_time"] = start - p["arrival"]
+        profiler = Profiler(f"{request.method} {request.path}")
+        profiler.start()
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            profiler.stop()
+        response["X-Profile-Id"] = profiling.save(settings.PROFILE_DIR, profiler.speedscope())
+        return response
 
-            gantt.append({"pid": p["pid"], "start": start, "end": end})
+    return wrapper
 
-            p["burst_time"] += cpu_time
-            p["index"] += 1
 
-            # If IO burst exists → BLOCKED
-            if p["index"] < len(p["bursts"]):
-                io_time = p["bursts"][p["index"]]
-                blocked.append((end + io_time, p))
-                p["index"] += 1
-            else:
-                p["completion_time"] = end
-                completed.append(p)
-
-            time = end + context_switch if (new or ready or blocked) else end
-
-        else:
-            # CPU IDLE handling
-            next_times = []
-            if new:
-                next_times.append(new[0]["arrival"])
-            if blocked:
-                next_times.append(min(t for t, _ in blocked))
+def profile_view(request, profile_id):
+    if request.method != "GET":
+        return JsonResponse({"error": "GET method required"}, status=405)
+    if not _profile_allowed(request):
+        return JsonResponse({"error": "profiling not allowed"}, status=403)
 
-            if next_times:
-                next_time = min(next_times)
-                gantt.append({"pid": "IDLE", "start": time, "end": next_time})
-                time = next_time
+    path = profiling.path_of(settings.PROFILE_DIR, profile_id)
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except (TypeError, OSError):
+        return JsonResponse({"error": "unknown profile"}, status=404)
 
-    return build_response(gantt, completed, time)
+    response = HttpResponse(content, content_type="application/json")
+    response["Content-Disposition"] = f'attachment; filename="{profile_id}.speedscope.json"'
+    return response
 
 
 # =========================
-# SJF SCHEDULER (NON-PREEMPTIVE)
+# WORKLOAD AND MODE OPTIONS
+# "generate": {...} in place of "processes", see workload.py
+# "workload": "<id>" in place of "processes", see library.py
+# "mode": "metrics" for running aggregates only, see aggregates.py
+# "mode": "tiles" for a stored Gantt pyramid instead of the Gantt, see tiles.py
+# "mode": "estimate" for queueing-model averages instead of a run, see estimate.py
 # =========================
-def sjf_view(request):
-    if request.method != "POST":
-        return JsonResponse({"error": "POST method required"}, status=405)
+def _processes(data):
+    workload_id = data.get("workload")
+    if workload_id is not None:
+        from .library import load
 
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
+        with phase("load_workload"):
+            return load(workload_id)
 
-    time = 0
-    gantt = []
-    tie = 0                     # tie-breaker for heap
+    spec = data.get("generate")
+    if spec is None:
+        return data["processes"]
 
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "bursts": p["bursts"],
-        "index": 0,
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
+    from .workload import synthesize
 
-    new.sort(key=lambda x: x["arrival"])
+    with phase("generate"):
+        return synthesize(spec)
 
-    ready = []                  # min-heap (cpu_time, tie, process)
-    blocked = []
-    completed = []
 
-    while new or ready or blocked:
+MODES = ("full", "metrics", "tiles", "estimate")
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (p["bursts"][p["index"]], tie, p))
-                tie += 1
-                new.remove(p)
+RUN_MODES = ("full", "metrics", "tiles")
 
-        for unblock_time, p in blocked[:]:
-            if unblock_time <= time:
-                heapq.heappush(ready, (p["bursts"][p["index"]], tie, p))
-                tie += 1
-                blocked.remove((unblock_time, p))
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
+def _mode(data, modes=MODES):
+    mode = data.get("mode", "full")
+    if mode not in modes:
+        raise ValueError(f"unknown mode {mode!r}, expected one of {list(modes)}")
+    return mode
 
-            cpu_time = p["bursts"][p["index"]]
-            start = time
-            end = start + cpu_time
 
-            if p["response_time"] is None:
-                p["response_time"] = start - p["arrival"]
+def _estimate(policy, data, processes, context_switch=0):
+    # "compare": true also runs the policy and reports how far off it was
+    from .estimate import deviation, estimate
 
-            gantt.append({"pid": p["pid"], "start": start, "end": end})
+    with phase("estimate"):
+        result = estimate(policy, processes, context_switch, float(data.get("confidence", 0.95)))
+    if data.get("compare"):
+        simulated = simulate(
+            policy, processes, context_switch,
+            data.get("blocked_queue", "heap"), data.get("devices"), metrics=True
+        )
+        result["simulated"] = simulated
+        result["deviation"] = deviation(result, simulated)
+    return result
 
-            p["burst_time"] += cpu_time
-            p["index"] += 1
 
-            if p["index"] < len(p["bursts"]):
-                io_time = p["bursts"][p["index"]]
-                blocked.append((end + io_time, p))
-                p["index"] += 1
-            else:
-                p["completion_time"] = end
-                completed.append(p)
+def _compressed(args, data):
+    # "compress": true runs classes of identical processes; "expand": true
+    # adds the per-process rows
+    from .classes import run_classes, summarize_classes
 
-            time = end + context_switch if (new or ready or blocked) else end
+    policy, processes, context_switch, blocked_queue, devices = args
+    with phase("simulate"):
+        run = run_classes(processes, context_switch, policy, blocked_queue, devices,
+                          bool(data.get("expand")))
+    with phase("build_response"):
+        return summarize_classes(*run)
 
-        else:
-            next_times = []
-            if new:
-                next_times.append(new[0]["arrival"])
-            if blocked:
-                next_times.append(min(t for t, _ in blocked))
 
-            if next_times:
-                next_time = min(next_times)
-                gantt.append({"pid": "IDLE", "start": time, "end": next_time})
-                time = next_time
+def _summarize(mode, run):
+    if mode == "metrics":
+        return summarize_metrics(*run)
+    if mode != "tiles":
+        return summarize(*run)
 
-    return build_response(gantt, completed, time)
+    from . import tiles
+
+    gantt, table, completed, total_time = run
+    result = summarize(NullGantt(), table, completed, total_time)
+    del result["gantt"]
+    result["tiles"] = tiles.save(settings.TILES_DIR, tiles.build(gantt, table.pid, total_time))
+    return result
 
 
 # =========================
-# LJF SCHEDULER
+# WORKLOAD LIBRARY
+# POST /api/workloads/ stores one workload or {"workloads": [...]}, GET
+# lists them; /api/workloads/export/ returns them with their processes
 # =========================
-def ljf_view(request):
-    if request.method != "POST":
-        return JsonResponse({"error": "POST method required"}, status=405)
-
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
-
-    time = 0
-    gantt = []
-    tie = 0
-
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "bursts": p["bursts"],
-        "index": 0,
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
-
-    new.sort(key=lambda x: x["arrival"])
-
-    ready = []                  # max-heap using negative burst
-    blocked = []
-    completed = []
+def _search(request):
+    from . import library
+
+    def size(name):
+        value = request.GET.get(name)
+        return None if value is None else int(value)
+
+    return library.search(
+        workload_id=request.GET.get("id"),
+        name=request.GET.get("name"),
+        tag=request.GET.get("tag"),
+        min_size=size("min_size"),
+        max_size=size("max_size"),
+        limit=min(int(request.GET.get("limit", 100)), 1000),
+    )
+
+
+@csrf_exempt
+@profiled
+def workloads_view(request):
+    from . import library
+
+    if request.method == "GET":
+        try:
+            found = _search(request)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse({"workloads": [library.describe(w) for w in found]})
 
-    while new or ready or blocked:
+    if request.method != "POST":
+        return JsonResponse({"error": "GET or POST method required"}, status=405)
+
+    if int(request.META.get("CONTENT_LENGTH") or 0) > settings.WORKLOAD_UPLOAD_MAX_BYTES:
+        return JsonResponse({"error": "workload too large"}, status=413)
+
+    with phase("parse"):
+        try:
+            data = json.loads(request.read())
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+    try:
+        with phase("store"):
+            if isinstance(data, dict) and "workloads" in data:
+                if not isinstance(data["workloads"], list):
+                    raise ValueError("workloads must be a list")
+                stored = library.store_many(data["workloads"])
+                result = {"workloads": [
+                    {**library.describe(w), "created": created} for w, created in stored
+                ]}
+            else:
+                workload, created = library.store(data)
+                result = {**library.describe(workload), "created": created}
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (-p["bursts"][p["index"]], tie, p))
-                tie += 1
-                new.remove(p)
+    with phase("serialise"):
+        return JsonResponse(result, status=201)
 
-        for unblock_time, p in blocked[:]:
-            if unblock_time <= time:
-                heapq.heappush(ready, (-p["bursts"][p["index"]], tie, p))
-                tie += 1
-                blocked.remove((unblock_time, p))
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
+@csrf_exempt
+@profiled
+def workload_view(request, workload_id):
+    from . import library
 
-            cpu_time = p["bursts"][p["index"]]
-            start = time
-            end = start + cpu_time
+    if request.method not in ("GET", "DELETE"):
+        return JsonResponse({"error": "GET or DELETE method required"}, status=405)
 
-            if p["response_time"] is None:
-                p["response_time"] = start - p["arrival"]
+    found = library.search(workload_id=workload_id, limit=1)
+    if not found:
+        return JsonResponse({"error": "unknown workload"}, status=404)
+    if request.method == "DELETE":
+        library.delete(workload_id)
+        return JsonResponse({"deleted": workload_id})
+    return JsonResponse(library.describe(found[0]))
 
-            gantt.append({"pid": p["pid"], "start": start, "end": end})
 
-            p["burst_time"] += cpu_time
-            p["index"] += 1
+@profiled
+def workloads_export_view(request):
+    from . import library
 
-            if p["index"] < len(p["bursts"]):
-                io_time = p["bursts"][p["index"]]
-                blocked.append((end + io_time, p))
-                p["index"] += 1
-            else:
-                p["completion_time"] = end
-                completed.append(p)
+    if request.method != "GET":
+        return JsonResponse({"error": "GET method required"}, status=405)
 
-            time = end + context_switch if (new or ready or blocked) else end
+    try:
+        found = _search(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-        else:
-            next_times = []
-            if new:
-                next_times.append(new[0]["arrival"])
-            if blocked:
-                next_times.append(min(t for t, _ in blocked))
+    with phase("build_response"):
+        result = {"workloads": [library.export(w) for w in found]}
+    with phase("serialise"):
+        return JsonResponse(result)
 
-            if next_times:
-                next_time = min(next_times)
-                gantt.append({"pid": "IDLE", "start": time, "end": next_time})
-                time = next_time
 
-    return build_response(gantt, completed, time)
+# =========================
+# GANTT TILES
+# GET ?level=&t0=&t1= for one window of a "mode": "tiles" run, no query
+# for the levels it has
+# =========================
+def _query_number(request, name):
+    try:
+        value = json.loads(request.GET[name])
+    except ValueError:
+        value = None
+    if type(value) not in (int, float):
+        raise ValueError(f"{name} must be a number")
+    return value
+
+
+@profiled
+def tiles_view(request, tiles_id):
+    if request.method != "GET":
+        return JsonResponse({"error": "GET method required"}, status=405)
+
+    from . import tiles
+
+    path = tiles.path_of(settings.TILES_DIR, tiles_id)
+    try:
+        if path is None:
+            raise OSError(tiles_id)
+        if "level" not in request.GET:
+            return JsonResponse(tiles.describe(path))
+        with phase("parse"):
+            level, t0, t1 = (_query_number(request, name) for name in ("level", "t0", "t1"))
+        with phase("build_response"):
+            result = tiles.tile(path, level, t0, t1)
+    except OSError:
+        return JsonResponse({"error": "unknown tiles"}, status=404)
+    except (KeyError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    with phase("serialise"):
+        return JsonResponse(result)
 
 
 # =========================
-# PRIORITY SCHEDULER
-# lower value = higher priority
+# TRACE EXPORT
+# POST a run to get its Chrome / Perfetto trace, streamed as the engine
+# runs, or stored with "save": true and fetched by id; see trace.py
 # =========================
-def priority_view(request):
+@csrf_exempt
+@profiled
+def trace_view(request):
+    # No single_flight: a streamed body cannot be shared
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
-    processes = data["processes"]
+    with phase("parse"):
+        data = json.loads(request.body)
+    policy = data.get("policy", "fcfs")
     context_switch = data.get("context_switch", 0)
+    options = (context_switch, data.get("blocked_queue", "heap"), data.get("devices"))
+    gzip = bool(data.get("gzip"))
+
+    from . import trace
+
+    try:
+        table = trace.prepare(policy, _processes(data), *options)
+        if data.get("save"):
+            with phase("simulate"):
+                result = trace.save(settings.TRACES_DIR, policy, table, *options, gzip=gzip)
+            return JsonResponse(result)
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    response = StreamingHttpResponse(
+        trace.stream(policy, table, *options, gzip=gzip),
+        content_type="application/gzip" if gzip else "application/json",
+    )
+    name = f"{policy}.trace.json" + (".gz" if gzip else "")
+    response["Content-Disposition"] = f'attachment; filename="{name}"'
+    return response
+
+
+@profiled
+def trace_file_view(request, trace_id):
+    if request.method != "GET":
+        return JsonResponse({"error": "GET method required"}, status=405)
+
+    from . import trace
+
+    path = trace.path_of(settings.TRACES_DIR, trace_id)
+    if path is None:
+        return JsonResponse({"error": "unknown trace"}, status=404)
+    gzip = path.endswith(".gz")
+    return FileResponse(
+        open(path, "rb"), as_attachment=True,
+        filename=f"{trace_id}.trace.json" + (".gz" if gzip else ""),
+        content_type="application/gzip" if gzip else "application/json",
+    )
 
-    time = 0
-    gantt = []
-    tie = 0
-
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "bursts": p["bursts"],
-        "priority": p["priority"],   # lower number = higher priority
-        "index": 0,
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
-
-    new.sort(key=lambda x: x["arrival"])
-
-    ready = []                  # (priority, tie, process)
-    blocked = []
-    completed = []
-
-    while new or ready or blocked:
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (p["priority"], tie, p))
-                tie += 1
-                new.remove(p)
+# =========================
+# NON-PREEMPTIVE SCHEDULERS
+# FCFS / SJF / LJF / PRIORITY (lower value = higher priority)
+# =========================
+def nonpreemptive_view(request, policy):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
 
-        for unblock_time, p in blocked[:]:
-            if unblock_time <= time:
-                heapq.heappush(ready, (p["priority"], tie, p))
-                tie += 1
-                blocked.remove((unblock_time, p))
+    with phase("parse"):
+        data = json.loads(request.body)
+    context_switch = data.get("context_switch", 0)
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
+    try:
+        mode = _mode(data)
+        args = (
+            policy, _processes(data), context_switch,
+            data.get("blocked_queue", "heap"), data.get("devices")
+        )
+        if data.get("compress") and mode != "full":
+            raise ValueError("compress is only available in full mode")
+        if mode == "estimate":
+            result = _estimate(policy, data, args[1], context_switch)
+        elif data.get("compress"):
+            result = _compressed(args, data)
+        elif mode == "tiles":
+            with phase("simulate"):
+                run = run_policy(*args)
+        else:
+            result = simulate(*args, mode == "metrics")
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-            cpu_time = p["bursts"][p["index"]]
-            start = time
-            end = start + cpu_time
+    if mode == "tiles":
+        with phase("build_response"):
+            result = _summarize(mode, run)
+    with phase("serialise"):
+        return JsonResponse(result, safe=False)
 
-            if p["response_time"] is None:
-                p["response_time"] = start - p["arrival"]
 
-            gantt.append({"pid": p["pid"], "start": start, "end": end})
+@csrf_exempt
+@profiled
+@single_flight
+def fcfs_view(request):
+    return nonpreemptive_view(request, "fcfs")
 
-            p["burst_time"] += cpu_time
-            p["index"] += 1
 
-            if p["index"] < len(p["bursts"]):
-                io_time = p["bursts"][p["index"]]
-                blocked.append((end + io_time, p))
-                p["index"] += 1
-            else:
-                p["completion_time"] = end
-                completed.append(p)
+@csrf_exempt
+@profiled
+@single_flight
+def sjf_view(request):
+    return nonpreemptive_view(request, "sjf")
 
-            time = end + context_switch if (new or ready or blocked) else end
 
-        else:
-            next_times = []
-            if new:
-                next_times.append(new[0]["arrival"])
-            if blocked:
-                next_times.append(min(t for t, _ in blocked))
+@csrf_exempt
+@profiled
+@single_flight
+def ljf_view(request):
+    return nonpreemptive_view(request, "ljf")
 
-            if next_times:
-                next_time = min(next_times)
-                gantt.append({"pid": "IDLE", "start": time, "end": next_time})
-                time = next_time
 
-    return build_response(gantt, completed, time)
+@csrf_exempt
+@profiled
+@single_flight
+def priority_view(request):
+    return nonpreemptive_view(request, "priority")
 
 
 # =========================
 # COMMON RESPONSE BUILDER
 # =========================
-def build_response(gantt, completed, total_time):
-    n = len(completed)
-    total_tat = total_wt = total_rt = 0
-    result = []
-
-    for p in completed:
-        tat = p["completion_time"] - p["arrival"]
-        wt = tat - p["burst_time"]
-        rt = p["response_time"]
-
-        total_tat += tat
-        total_wt += wt
-        total_rt += rt
-
-        result.append({
-            "pid": p["pid"],
-            "arrival": p["arrival"],
-            "burst_time": p["burst_time"],
-            "completion_time": p["completion_time"],
-            "tat": tat,
-            "wt": wt,
-            "rt": rt
-        })
-
-    return JsonResponse({
-        "gantt": gantt,
-        "processes": result,
-        "average": {
-            "tat": total_tat / n if n else 0,
-            "wt": total_wt / n if n else 0,
-            "rt": total_rt / n if n else 0
-        },
-        "system": {
-            "total_time": total_time,
-            "throughput": n / total_time if total_time > 0 else 0
-        }
-    }, safe=False)
+def build_response(gantt, table, completed, total_time):
+    with phase("build_response"):
+        result = summarize(gantt, table, completed, total_time)
+    with phase("serialise"):
+        return JsonResponse(result, safe=False)
 
 
 def template(request):
     return render(request, "template.html")
 
 
-def srtf_view(request):
+# =========================
+# MONTE CARLO STUDY
+# =========================
+@csrf_exempt
+@profiled
+@single_flight
+def montecarlo_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
+    with phase("parse"):
+        data = json.loads(request.body)
 
-    time = 0
-    gantt = []
-    tie = 0
+    from .montecarlo import run_study
 
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "remaining": sum(p["bursts"][::2]),
-        "bursts": p["bursts"],
-        "index": 0,
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
+    try:
+        with phase("simulate"):
+            result = run_study(
+                data.get("workload"),
+                data.get("policies", ["fcfs"]),
+                runs=int(data.get("runs", 30)),
+                processes=int(data.get("processes", 50)),
+                seed=int(data.get("seed", 0)),
+                workers=int(data.get("workers", 1)),
+                confidence=float(data.get("confidence", 0.95)),
+                context_switch=data.get("context_switch", 0),
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    new.sort(key=lambda x: x["arrival"])
-    ready = []
-    completed = []
+    with phase("serialise"):
+        return JsonResponse(result)
 
-    current = None
 
-    while new or ready or current:
+# =========================
+# OPEN-SYSTEM STEADY STATE
+# =========================
+@csrf_exempt
+@profiled
+@single_flight
+def steady_view(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (p["remaining"], tie, p))
-                tie += 1
-                new.remove(p)
+    with phase("parse"):
+        data = json.loads(request.body)
 
-        if current:
-            heapq.heappush(ready, (current["remaining"], tie, current))
-            tie += 1
-            current = None
+    from .steady import run_open
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
+    try:
+        with phase("simulate"):
+            result = run_open(
+                data.get("workload", {}),
+                data.get("policy", "fcfs"),
+                seed=data.get("seed", 0),
+                batch=float(data.get("batch", 1000)),
+                warmup=float(data["warmup"]) if data.get("warmup") is not None else None,
+                horizon=float(data["horizon"]) if data.get("horizon") is not None else None,
+                target=float(data["target"]) if data.get("target") is not None else None,
+                confidence=float(data.get("confidence", 0.95)),
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-            if p["response_time"] is None:
-                p["response_time"] = time - p["arrival"]
+    with phase("serialise"):
+        return JsonResponse(result)
+
+
+# =========================
+# OPTIMAL NON-PREEMPTIVE SCHEDULE
+# =========================
+@csrf_exempt
+@profiled
+@single_flight
+def optimal_view(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
 
-            start = time
-            p["remaining"] -= 1
-            p["burst_time"] += 1
-            time += 1
+    with phase("parse"):
+        data = json.loads(request.body)
 
-            gantt.append({"pid": p["pid"], "start": start, "end": time})
+    from .optimal import optimise
 
-            if p["remaining"] == 0:
-                p["completion_time"] = time
-                completed.append(p)
-            else:
-                current = p
-        else:
-            time += 1
+    try:
+        processes = _processes(data)
+        policies = data.get("policies")
+        with phase("search"):
+            result = optimise(
+                processes,
+                data.get("context_switch", 0),
+                objective=data.get("objective", "wt"),
+                policies=list(policies) if policies is not None else None,
+                time_budget=float(data.get("time_budget", 10)),
+                workers=int(data.get("workers", 1)),
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    return build_response(gantt, completed, time)
+    with phase("serialise"):
+        return JsonResponse(result)
 
 
-def lrtf_view(request):
+# =========================
+# REAL-TIME SCHEDULERS
+# EDF / RATE MONOTONIC (periodic tasks)
+# =========================
+def realtime_view(request, policy):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
+    with phase("parse"):
+        data = json.loads(request.body)
 
-    time = 0
-    gantt = []
-    tie = 0
+    try:
+        with phase("simulate"):
+            result = realtime.simulate(
+                data["tasks"],
+                policy,
+                horizon=data.get("horizon"),
+                max_jobs=min(int(data.get("max_jobs", realtime.MAX_JOBS)), realtime.MAX_JOBS),
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "remaining": sum(p["bursts"][::2]),
-        "bursts": p["bursts"],
-        "index": 0,
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
+    with phase("serialise"):
+        return JsonResponse(result)
 
-    new.sort(key=lambda x: x["arrival"])
-    ready = []
-    completed = []
-    current = None
 
-    while new or ready or current:
+@csrf_exempt
+@profiled
+@single_flight
+def edf_view(request):
+    return realtime_view(request, "edf")
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (-p["remaining"], tie, p))
-                tie += 1
-                new.remove(p)
 
-        if current:
-            heapq.heappush(ready, (-current["remaining"], tie, current))
-            tie += 1
-            current = None
+@csrf_exempt
+@profiled
+@single_flight
+def rm_view(request):
+    return realtime_view(request, "rm")
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
 
-            if p["response_time"] is None:
-                p["response_time"] = time - p["arrival"]
+# =========================
+# PROPORTIONAL-SHARE SCHEDULERS
+# LOTTERY / STRIDE
+# =========================
+def proportional_view(request, policy):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
+
+    with phase("parse"):
+        data = json.loads(request.body)
 
-            start = time
-            p["remaining"] -= 1
-            p["burst_time"] += 1
-            time += 1
+    try:
+        processes = _processes(data)
+        mode = _mode(data, RUN_MODES)
+        if mode == "metrics":
+            processes = with_metrics(processes)
+        with phase("simulate"):
+            run = proportional.run_proportional(
+                policy, processes, data.get("quantum", 1), int(data.get("seed", 0))
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-            gantt.append({"pid": p["pid"], "start": start, "end": time})
+    with phase("build_response"):
+        result = _summarize(mode, run)
+        if mode != "metrics":
+            result["fairness"] = proportional.fairness(run[1], run[2])
+    with phase("serialise"):
+        return JsonResponse(result)
 
-            if p["remaining"] == 0:
-                p["completion_time"] = time
-                completed.append(p)
-            else:
-                current = p
-        else:
-            time += 1
 
-    return build_response(gantt, completed, time)
+@csrf_exempt
+@profiled
+@single_flight
+def lottery_view(request):
+    return proportional_view(request, "lottery")
 
 
-def preemptive_priority_view(request):
+@csrf_exempt
+@profiled
+@single_flight
+def stride_view(request):
+    return proportional_view(request, "stride")
+
+
+# =========================
+# CFS (COMPLETELY FAIR SCHEDULER)
+# =========================
+@csrf_exempt
+@profiled
+@single_flight
+def cfs_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
-    processes = data["processes"]
-    context_switch = data.get("context_switch", 0)
-
-    time = 0
-    gantt = []
-    tie = 0
+    with phase("parse"):
+        data = json.loads(request.body)
+
+    try:
+        processes = _processes(data)
+        mode = _mode(data, RUN_MODES)
+        if mode == "metrics":
+            processes = with_metrics(processes)
+        trace = data.get("trace", True) and mode != "metrics"
+        with phase("simulate"):
+            run = cfs.run_cfs(
+                processes,
+                target_latency=data.get("target_latency", 6),
+                min_granularity=data.get("min_granularity", 1),
+                wakeup_granularity=data.get("wakeup_granularity", 1),
+                blocked_queue=data.get("blocked_queue", "heap"),
+                devices=data.get("devices"),
+                trace=trace,
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    with phase("build_response"):
+        result = _summarize(mode, run)
+        if trace:
+            result["vruntime"] = cfs.vruntime_traces(run[1], run[2])
+    with phase("serialise"):
+        return JsonResponse(result)
 
-    new = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "priority": p["priority"],
-        "remaining": sum(p["bursts"][::2]),
-        "burst_time": 0,
-        "completion_time": None,
-        "response_time": None
-    } for p in processes]
 
-    new.sort(key=lambda x: x["arrival"])
-    ready = []
-    completed = []
-    current = None
+# =========================
+# MULTILEVEL QUEUE
+# per-queue policy, strict priority or weighted arbitration between queues
+# =========================
+@csrf_exempt
+@profiled
+@single_flight
+def multilevel_view(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
 
-    while new or ready or current:
+    with phase("parse"):
+        data = json.loads(request.body)
+
+    try:
+        processes = _processes(data)
+        mode = _mode(data, RUN_MODES)
+        if mode == "metrics":
+            processes = with_metrics(processes)
+        with phase("simulate"):
+            run = multilevel.run_multilevel(
+                processes,
+                data["queues"],
+                arbitration=data.get("arbitration", "priority"),
+                slice_=data.get("slice", 1),
+                blocked_queue=data.get("blocked_queue", "heap"),
+                devices=data.get("devices"),
+            )
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    with phase("build_response"):
+        result = _summarize(mode, run)
+        result["queues"] = multilevel.queue_report(run[1])
+    with phase("serialise"):
+        return JsonResponse(result)
 
-        for p in new[:]:
-            if p["arrival"] <= time:
-                heapq.heappush(ready, (p["priority"], tie, p))
-                tie += 1
-                new.remove(p)
 
-        if current:
-            heapq.heappush(ready, (current["priority"], tie, current))
-            tie += 1
-            current = None
+# =========================
+# PREEMPTIVE SCHEDULERS
+# SRTF / LRTF / PREEMPTIVE PRIORITY
+# =========================
+def preemptive_view(request, policy):
+    if request.method != "POST":
+        return JsonResponse({"error": "POST method required"}, status=405)
 
-        if ready:
-            _, _, p = heapq.heappop(ready)
+    with phase("parse"):
+        data = json.loads(request.body)
 
-            if p["response_time"] is None:
-                p["response_time"] = time - p["arrival"]
+    try:
+        processes = _processes(data)
+        mode = _mode(data)
+        if mode == "estimate":
+            result = _estimate(policy, data, processes)
+        else:
+            if mode == "metrics":
+                processes = with_metrics(processes)
+            with phase("simulate"):
+                run = run_preemptive(processes, policy)
+    except (KeyError, TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    if mode == "estimate":
+        with phase("serialise"):
+            return JsonResponse(result)
+
+    if mode == "full":
+        return build_response(*run)
+    with phase("build_response"):
+        result = _summarize(mode, run)
+    with phase("serialise"):
+        return JsonResponse(result)
+
+
+@csrf_exempt
+@profiled
+@single_flight
+def srtf_view(request):
+    return preemptive_view(request, "srtf")
 
-            start = time
-            p["remaining"] -= 1
-            p["burst_time"] += 1
-            time += 1
 
-            gantt.append({"pid": p["pid"], "start": start, "end": time})
+@csrf_exempt
+@profiled
+@single_flight
+def lrtf_view(request):
+    return preemptive_view(request, "lrtf")
 
-            if p["remaining"] == 0:
-                p["completion_time"] = time
-                completed.append(p)
-            else:
-                current = p
-        else:
-            time += 1
 
-    return build_response(gantt, completed, time)
+@csrf_exempt
+@profiled
+@single_flight
+def preemptive_priority_view(request):
+    return preemptive_view(request, "prtf")
 
 from collections import deque
 from django.http import JsonResponse
 import json
 
+@csrf_exempt
+@profiled
+@single_flight
 def fcfs_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -618,7 +780,10 @@ def fcfs_visualization_view(request):
     new.sort(key=lambda x: x["arrival"])
 
     ready = deque()
-    blocked = []           # (unblock_time, process)
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     # -------------------------
@@ -640,15 +805,13 @@ def fcfs_visualization_view(request):
         # -------------------------
         # BLOCKED → READY
         # -------------------------
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                ready.append(p)
-                timeline[time].append({
-                    "pid": p["pid"],
-                    "from": "BLOCKED",
-                    "to": "READY"
-                })
+        for p in blocked.pop_due(time):
+            ready.append(p)
+            timeline[time].append({
+                "pid": p["pid"],
+                "from": "BLOCKED",
+                "to": "READY"
+            })
 
         # -------------------------
         # NEW → READY
@@ -687,7 +850,7 @@ def fcfs_visualization_view(request):
                 # RUNNING → BLOCKED
                 if running["index"] < len(running["bursts"]):
                     io_time = running["bursts"][running["index"]]
-                    blocked.append((time + io_time + 1, running))
+                    blocked.push(time + io_time + 1, running)
                     timeline[time].append({
                         "pid": running["pid"],
                         "from": "RUNNING",
@@ -707,14 +870,19 @@ def fcfs_visualization_view(request):
 
         time += 1
 
-    return JsonResponse({"timeline": timeline}, safe=False)
+    with phase("serialise"):
+        return JsonResponse({"timeline": timeline}, safe=False)
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def sjf_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -735,7 +903,10 @@ def sjf_visualization_view(request):
     new.sort(key=lambda x: x["arrival"])
 
     ready = []                 # min-heap → (cpu_time, tie, process)
-    blocked = []               # (unblock_time, process)
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     # -------------------------
@@ -748,19 +919,17 @@ def sjf_visualization_view(request):
         # -------------------------
         # BLOCKED → READY
         # -------------------------
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                heapq.heappush(
-                    ready,
-                    (p["bursts"][p["index"]], tie, p)
-                )
-                tie += 1
-                timeline[time].append({
-                    "pid": p["pid"],
-                    "from": "BLOCKED",
-                    "to": "READY"
-                })
+        for p in blocked.pop_due(time):
+            heapq.heappush(
+                ready,
+                (p["bursts"][p["index"]], tie, p)
+            )
+            tie += 1
+            timeline[time].append({
+                "pid": p["pid"],
+                "from": "BLOCKED",
+                "to": "READY"
+            })
 
         # -------------------------
         # NEW → READY
@@ -804,7 +973,7 @@ def sjf_visualization_view(request):
                 # RUNNING → BLOCKED
                 if running["index"] < len(running["bursts"]):
                     io_time = running["bursts"][running["index"]]
-                    blocked.append((time + io_time + 1, running))
+                    blocked.push(time + io_time + 1, running)
 
                     timeline[time].append({
                         "pid": running["pid"],
@@ -829,16 +998,21 @@ def sjf_visualization_view(request):
         # -------------------------
         time += 1
 
-    return JsonResponse({
-        "timeline": timeline
-    }, safe=False)
+    with phase("serialise"):
+        return JsonResponse({
+            "timeline": timeline
+        }, safe=False)
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def ljf_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -859,7 +1033,10 @@ def ljf_visualization_view(request):
     new.sort(key=lambda x: x["arrival"])
 
     ready = []                 # max-heap → (-cpu_time, tie, process)
-    blocked = []               # (unblock_time, process)
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     # -------------------------
@@ -872,19 +1049,17 @@ def ljf_visualization_view(request):
         # -------------------------
         # BLOCKED → READY
         # -------------------------
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                heapq.heappush(
-                    ready,
-                    (-p["bursts"][p["index"]], tie, p)
-                )
-                tie += 1
-                timeline[time].append({
-                    "pid": p["pid"],
-                    "from": "BLOCKED",
-                    "to": "READY"
-                })
+        for p in blocked.pop_due(time):
+            heapq.heappush(
+                ready,
+                (-p["bursts"][p["index"]], tie, p)
+            )
+            tie += 1
+            timeline[time].append({
+                "pid": p["pid"],
+                "from": "BLOCKED",
+                "to": "READY"
+            })
 
         # -------------------------
         # NEW → READY
@@ -928,7 +1103,7 @@ def ljf_visualization_view(request):
                 # RUNNING → BLOCKED
                 if running["index"] < len(running["bursts"]):
                     io_time = running["bursts"][running["index"]]
-                    blocked.append((time + io_time + 1, running))
+                    blocked.push(time + io_time + 1, running)
 
                     timeline[time].append({
                         "pid": running["pid"],
@@ -953,9 +1128,10 @@ def ljf_visualization_view(request):
         # -------------------------
         time += 1
 
-    return JsonResponse({
-        "timeline": timeline
-    }, safe=False)
+    with phase("serialise"):
+        return JsonResponse({
+            "timeline": timeline
+        }, safe=False)
 
 
 import heapq
@@ -963,11 +1139,15 @@ from django.http import JsonResponse
 import json
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def srtf_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -975,17 +1155,22 @@ def srtf_visualization_view(request):
     tie = 0
 
     new = [{
+        "handle": i,
         "pid": p["pid"],
         "arrival": p["arrival"],
         "bursts": p["bursts"],
         "index": 0,
         "remaining": sum(p["bursts"][::2])
-    } for p in processes]
+    } for i, p in enumerate(processes)]
+    procs = list(new)
 
     new.sort(key=lambda x: x["arrival"])
 
-    ready = []           # (remaining, tie, p)
-    blocked = []
+    ready = IndexedHeap(len(procs))   # (remaining, tie) per handle
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     while new or ready or blocked or running:
@@ -993,30 +1178,28 @@ def srtf_visualization_view(request):
         timeline[time] = []
 
         # BLOCKED → READY
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                heapq.heappush(ready, (p["remaining"], tie, p))
-                tie += 1
-                timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
+        for p in blocked.pop_due(time):
+            ready.push(p["handle"], (p["remaining"], tie))
+            tie += 1
+            timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
 
         # NEW → READY
         for p in new[:]:
             if p["arrival"] == time:
                 new.remove(p)
-                heapq.heappush(ready, (p["remaining"], tie, p))
+                ready.push(p["handle"], (p["remaining"], tie))
                 tie += 1
                 timeline[time].append({"pid": p["pid"], "from": "NEW", "to": "READY"})
 
         # PREEMPT
         if running:
-            heapq.heappush(ready, (running["remaining"], tie, running))
+            ready.update(running["handle"], (running["remaining"], tie))
             tie += 1
             running = None
 
         # READY → RUNNING
         if ready:
-            _, _, running = heapq.heappop(ready)
+            running = procs[ready.peek()]
             timeline[time].append({"pid": running["pid"], "from": "READY", "to": "RUNNING"})
 
         # EXECUTE 1 SECOND
@@ -1025,19 +1208,25 @@ def srtf_visualization_view(request):
 
             if running["remaining"] == 0:
                 timeline[time].append({"pid": running["pid"], "from": "RUNNING", "to": "COMPLETED"})
+                ready.pop()
                 running = None
 
         time += 1
 
-    return JsonResponse({"timeline": timeline}, safe=False)
+    with phase("serialise"):
+        return JsonResponse({"timeline": timeline}, safe=False)
 
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def lrtf_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -1045,62 +1234,71 @@ def lrtf_visualization_view(request):
     tie = 0
 
     new = [{
+        "handle": i,
         "pid": p["pid"],
         "arrival": p["arrival"],
         "bursts": p["bursts"],
         "index": 0,
         "remaining": sum(p["bursts"][::2])
-    } for p in processes]
+    } for i, p in enumerate(processes)]
+    procs = list(new)
 
     new.sort(key=lambda x: x["arrival"])
 
-    ready = []           # (-remaining, tie, p)
-    blocked = []
+    ready = IndexedHeap(len(procs))   # (-remaining, tie) per handle
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     while new or ready or blocked or running:
 
         timeline[time] = []
 
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                heapq.heappush(ready, (-p["remaining"], tie, p))
-                tie += 1
-                timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
+        for p in blocked.pop_due(time):
+            ready.push(p["handle"], (-p["remaining"], tie))
+            tie += 1
+            timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
 
         for p in new[:]:
             if p["arrival"] == time:
                 new.remove(p)
-                heapq.heappush(ready, (-p["remaining"], tie, p))
+                ready.push(p["handle"], (-p["remaining"], tie))
                 tie += 1
                 timeline[time].append({"pid": p["pid"], "from": "NEW", "to": "READY"})
 
         if running:
-            heapq.heappush(ready, (-running["remaining"], tie, running))
+            ready.update(running["handle"], (-running["remaining"], tie))
             tie += 1
             running = None
 
         if ready:
-            _, _, running = heapq.heappop(ready)
+            running = procs[ready.peek()]
             timeline[time].append({"pid": running["pid"], "from": "READY", "to": "RUNNING"})
 
         if running:
             running["remaining"] -= 1
             if running["remaining"] == 0:
                 timeline[time].append({"pid": running["pid"], "from": "RUNNING", "to": "COMPLETED"})
+                ready.pop()
                 running = None
 
         time += 1
 
-    return JsonResponse({"timeline": timeline}, safe=False)
+    with phase("serialise"):
+        return JsonResponse({"timeline": timeline}, safe=False)
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def priority_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -1119,19 +1317,20 @@ def priority_visualization_view(request):
     new.sort(key=lambda x: x["arrival"])
 
     ready = []           # (priority, tie, p)
-    blocked = []
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     while new or ready or blocked or running:
 
         timeline[time] = []
 
-        for unblock_time, p in blocked[:]:
-            if unblock_time == time:
-                blocked.remove((unblock_time, p))
-                heapq.heappush(ready, (p["priority"], tie, p))
-                tie += 1
-                timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
+        for p in blocked.pop_due(time):
+            heapq.heappush(ready, (p["priority"], tie, p))
+            tie += 1
+            timeline[time].append({"pid": p["pid"], "from": "BLOCKED", "to": "READY"})
 
         for p in new[:]:
             if p["arrival"] == time:
@@ -1153,14 +1352,19 @@ def priority_visualization_view(request):
 
         time += 1
 
-    return JsonResponse({"timeline": timeline}, safe=False)
+    with phase("serialise"):
+        return JsonResponse({"timeline": timeline}, safe=False)
 
 
+@csrf_exempt
+@profiled
+@single_flight
 def prtf_visualization_view(request):
     if request.method != "POST":
         return JsonResponse({"error": "POST method required"}, status=405)
 
-    data = json.loads(request.body)
+    with phase("parse"):
+        data = json.loads(request.body)
     processes = data["processes"]
 
     time = 0
@@ -1168,16 +1372,21 @@ def prtf_visualization_view(request):
     tie = 0
 
     new = [{
+        "handle": i,
         "pid": p["pid"],
         "arrival": p["arrival"],
         "priority": p["priority"],
         "remaining": sum(p["bursts"][::2])
-    } for p in processes]
+    } for i, p in enumerate(processes)]
+    procs = list(new)
 
     new.sort(key=lambda x: x["arrival"])
 
-    ready = []           # (priority, tie, p)
-    blocked = []
+    ready = IndexedHeap(len(procs))   # (priority, tie) per handle
+    try:
+        blocked = make_blocked_queue(data.get("blocked_queue", "heap"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
     running = None
 
     while new or ready or blocked or running:
@@ -1187,25 +1396,27 @@ def prtf_visualization_view(request):
         for p in new[:]:
             if p["arrival"] == time:
                 new.remove(p)
-                heapq.heappush(ready, (p["priority"], tie, p))
+                ready.push(p["handle"], (p["priority"], tie))
                 tie += 1
                 timeline[time].append({"pid": p["pid"], "from": "NEW", "to": "READY"})
 
         if running:
-            heapq.heappush(ready, (running["priority"], tie, running))
+            ready.update(running["handle"], (running["priority"], tie))
             tie += 1
             running = None
 
         if ready:
-            _, _, running = heapq.heappop(ready)
+            running = procs[ready.peek()]
             timeline[time].append({"pid": running["pid"], "from": "READY", "to": "RUNNING"})
 
         if running:
             running["remaining"] -= 1
             if running["remaining"] == 0:
                 timeline[time].append({"pid": running["pid"], "from": "RUNNING", "to": "COMPLETED"})
+                ready.pop()
                 running = None
 
         time += 1
 
-    return JsonResponse({"timeline": timeline}, safe=False)
+    with phase("serialise"):
+        return JsonResponse({"timeline": timeline}, safe=False)
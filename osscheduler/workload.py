@@ -0,0 +1,184 @@
+"""
+Seeded synthetic workloads.
+
+A workload spec describes distributions rather than processes:
+
+    {
+        "arrival_rate": 0.5,                          # Poisson arrivals per time unit
+        "cpu_burst": {"dist": "exponential", "mean": 4},
+        "io_burst": {"dist": "uniform", "low": 1, "high": 6},
+        "io_ratio": 0.3,                              # share of processes doing I/O
+        "io_rounds": 2,                               # I/O bursts per such process
+        "priority_mix": {"0": 0.2, "1": 0.5, "2": 0.3}
+    }
+
+Burst and arrival times are rounded to integers (bursts >= 1) so that
+generated tables look like the ones entered in the visualizer.
+
+The scheduler endpoints take the same spec in place of "processes":
+
+    "generate": {"processes": 1000000, "seed": 42, "arrival_rate": 0.5, ...}
+
+synthesize() streams it into a ProcessTable chunk by chunk.
+"""
+import numpy as np
+
+from .process_table import ProcessTable
+
+
+DEFAULT_SPEC = {
+    "arrival_rate": 0.5,
+    "cpu_burst": {"dist": "exponential", "mean": 4},
+    "io_burst": {"dist": "exponential", "mean": 3},
+    "io_ratio": 0.0,
+    "io_rounds": 1,
+    "priority_mix": {"0": 1},
+}
+
+MAX_GENERATED = 2_000_000       # processes per generated request
+
+CHUNK = 1 << 16
+
+
+# =========================
+# DISTRIBUTIONS
+# =========================
+def sample(rng, dist, size):
+    kind = dist.get("dist", "exponential")
+
+    if kind == "constant":
+        values = np.full(size, float(dist["value"]))
+    elif kind == "exponential":
+        values = rng.exponential(dist["mean"], size)
+    elif kind == "uniform":
+        values = rng.uniform(dist["low"], dist["high"], size)
+    elif kind == "normal":
+        values = rng.normal(dist["mean"], dist["std"], size)
+    elif kind == "lognormal":
+        values = rng.lognormal(dist["mu"], dist["sigma"], size)
+    else:
+        raise ValueError(f"unknown distribution {kind!r}")
+
+    return np.maximum(np.rint(values), 1).astype(np.int64)
+
+
+def parse_spec(spec):
+    merged = {**DEFAULT_SPEC, **(spec or {})}
+
+    if merged["arrival_rate"] <= 0:
+        raise ValueError("arrival_rate must be positive")
+    if not 0 <= merged["io_ratio"] <= 1:
+        raise ValueError("io_ratio must be between 0 and 1")
+    if merged["io_rounds"] < 0:
+        raise ValueError("io_rounds must not be negative")
+
+    mix = merged["priority_mix"]
+    if isinstance(mix, list):
+        mix = dict(enumerate(mix))
+    levels = np.array([int(k) for k in mix], dtype=np.int64)
+    weights = np.array([float(w) for w in mix.values()])
+    if len(levels) == 0 or weights.sum() <= 0:
+        raise ValueError("priority_mix needs at least one positive weight")
+    merged["priority_levels"] = levels
+    merged["priority_weights"] = weights / weights.sum()
+
+    return merged
+
+
+def max_bursts(spec):
+    return 2 * spec["io_rounds"] + 1 if spec["io_ratio"] > 0 else 1
+
+
+# =========================
+# GENERATION
+# =========================
+def generate(spec, n, rng):
+    """
+    Draw n processes from a parsed spec.
+
+    Returns (arrival, priority, bursts, counts): bursts is an
+    (n, max_bursts(spec)) array whose row i holds counts[i] alternating
+    CPU/IO bursts, starting and ending with CPU. The first arrival is at
+    0. stream() generates a workload in chunks instead.
+    """
+    gaps = rng.exponential(1 / spec["arrival_rate"], n)
+    arrival = np.floor(np.cumsum(gaps)).astype(np.int64)
+    if n:
+        arrival -= arrival[0]
+
+    priority = rng.choice(spec["priority_levels"], size=n, p=spec["priority_weights"])
+    bursts, counts = _bursts(spec, n, rng, rng, rng)
+    return arrival, priority, bursts, counts
+
+
+def _bursts(spec, n, io_rng, cpu_rng, io_burst_rng):
+    width = max_bursts(spec)
+    bursts = np.zeros((n, width), dtype=np.int64)
+    counts = np.ones(n, dtype=np.int64)
+
+    if width == 1:
+        bursts[:, 0] = sample(cpu_rng, spec["cpu_burst"], n)
+    else:
+        does_io = io_rng.random(n) < spec["io_ratio"]
+        counts[does_io] = width
+        bursts[:, 0::2] = sample(cpu_rng, spec["cpu_burst"], (n, spec["io_rounds"] + 1))
+        bursts[:, 1::2] = sample(io_burst_rng, spec["io_burst"], (n, spec["io_rounds"]))
+
+    return bursts, counts
+
+
+def stream(spec, n, seed, chunk=CHUNK):
+    """
+    Draw n processes from a parsed spec in chunks of at most `chunk`.
+
+    Yields (arrival, priority, bursts, counts) with each process's bursts
+    back to back (see ProcessTable.from_chunks). Every column has its own
+    random stream and the arrival clock carries over between chunks, so
+    the workload depends only on the spec, n and seed, not on `chunk`.
+    """
+    gap_rng, priority_rng, io_rng, cpu_rng, io_burst_rng = (
+        np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(5)
+    )
+    width = max_bursts(spec)
+    clock = 0.0
+    origin = None
+
+    for done in range(0, n, chunk):
+        m = min(chunk, n - done)
+
+        gaps = gap_rng.exponential(1 / spec["arrival_rate"], m)
+        times = np.cumsum(np.concatenate(([clock], gaps)))[1:]
+        clock = times[-1]
+        arrival = np.floor(times).astype(np.int64)
+        if origin is None:
+            origin = arrival[0]
+        arrival -= origin
+
+        priority = priority_rng.choice(spec["priority_levels"], size=m, p=spec["priority_weights"])
+        bursts, counts = _bursts(spec, m, io_rng, cpu_rng, io_burst_rng)
+        flat = bursts[np.arange(width) < counts[:, None]]
+
+        yield arrival, priority.astype(np.int64), flat, counts
+
+
+def synthesize(spec, chunk=CHUNK):
+    """ProcessTable for a request's "generate" spec."""
+    if not isinstance(spec, dict):
+        raise ValueError("generate must be an object")
+    spec = dict(spec)
+    n = spec.pop("processes", None)
+    seed = spec.pop("seed", 0)
+    if type(n) is not int or not 0 < n <= MAX_GENERATED:
+        raise ValueError(f"generate.processes must be an integer from 1 to {MAX_GENERATED}")
+    if type(seed) is not int or seed < 0:
+        raise ValueError("generate.seed must be a non-negative integer")
+    return ProcessTable.from_chunks(stream(parse_spec(spec), n, seed, chunk))
+
+
+def to_processes(arrival, priority, bursts, counts, offset=0):
+    return [{
+        "pid": f"P{offset + i + 1}",
+        "arrival": int(arrival[i]),
+        "priority": int(priority[i]),
+        "bursts": bursts[i, :counts[i]].tolist(),
+    } for i in range(len(arrival))]
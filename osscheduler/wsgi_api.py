@@ -0,0 +1,19 @@
+"""
+WSGI config for the API-only server profile.
+
+Safe to load in the gunicorn master with --preload: nothing here opens a
+database connection, starts a thread or touches the filesystem.
+
+    gunicorn --preload osscheduler.wsgi_api
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'osscheduler.settings_api')
+
+application = get_wsgi_application()
+
+if os.environ.get('OSSCHEDULER_PRELOAD') == '1':
+    import osscheduler.views  # noqa: E402,F401
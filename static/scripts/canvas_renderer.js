@@ -0,0 +1,253 @@
+/* =====================================================
+   CANVAS SCHEDULE RENDERER
+   Draws the CPU Gantt lane and one state lane per process
+   on a single canvas. Only lanes and slices inside the
+   viewport are drawn, and all redraws and playback are
+   paced by requestAnimationFrame.
+
+   Mouse: wheel scrolls lanes, ctrl + wheel zooms time,
+   drag pans time.
+===================================================== */
+const LANE_HEIGHT = 18;
+const AXIS_HEIGHT = 22;
+const LABEL_WIDTH = 70;
+
+class CanvasScheduleRenderer {
+
+  constructor(canvas) {
+    this.canvas = canvas;
+    this.ctx = canvas.getContext("2d");
+    this.model = null;
+    this.t0 = 0;
+    this.t1 = 1;
+    this.firstLane = 0;
+    this.playhead = null;
+    this.playing = false;
+    this.pending = false;
+
+    canvas.addEventListener("wheel", e => this.onWheel(e), { passive: false });
+    canvas.addEventListener("mousedown", e => this.onDragStart(e));
+    window.addEventListener("resize", () => this.requestDraw());
+  }
+
+  load(model) {
+    this.model = model;
+    this.t0 = 0;
+    this.t1 = Math.max(model.totalTime, 1);
+    this.firstLane = 0;
+    this.playhead = null;
+    this.playing = false;
+    this.requestDraw();
+  }
+
+  /* ================= PLAYBACK ================= */
+  play(unitsPerSecond) {
+    if (!this.model) return;
+
+    const speed = unitsPerSecond || Math.max(this.model.totalTime / 20, 1);
+    let last = null;
+
+    this.playhead = 0;
+    this.playing = true;
+
+    const step = now => {
+      if (!this.playing) return;
+      if (last !== null) this.playhead += (now - last) / 1000 * speed;
+      last = now;
+
+      if (this.playhead >= this.model.totalTime) {
+        this.playhead = this.model.totalTime;
+        this.playing = false;
+      }
+
+      this.draw();
+      if (this.playing) requestAnimationFrame(step);
+    };
+
+    requestAnimationFrame(step);
+  }
+
+  stop() {
+    this.playing = false;
+  }
+
+  requestDraw() {
+    if (this.pending || this.playing) return;
+    this.pending = true;
+    requestAnimationFrame(() => {
+      this.pending = false;
+      this.draw();
+    });
+  }
+
+  /* ================= DRAWING ================= */
+  draw() {
+    const canvas = this.canvas;
+    const ctx = this.ctx;
+    const dpr = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+
+    if (canvas.width !== width * dpr || canvas.height !== height * dpr) {
+      canvas.width = width * dpr;
+      canvas.height = height * dpr;
+    }
+
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+
+    const m = this.model;
+    if (!m) return;
+
+    const plotWidth = width - LABEL_WIDTH;
+    const scale = plotWidth / (this.t1 - this.t0);
+    const x = t => LABEL_WIDTH + (t - this.t0) * scale;
+
+    this.drawAxis(ctx, width, scale, x);
+
+    // CPU lane: every slice, in time order
+    let y = AXIS_HEIGHT;
+    this.drawLabel(ctx, "CPU", y);
+    this.drawSlices(ctx, m.start, m.end, null, 0, m.start.length, y, x, i => (
+      m.lane[i] < 0 ? "#d0d4dc" : laneColor(m.lane[i])
+    ));
+    y += LANE_HEIGHT + 6;
+
+    // Process lanes: only those scrolled into view
+    const visible = Math.floor((height - y) / LANE_HEIGHT);
+    const lastLane = Math.min(m.pids.length, this.firstLane + visible);
+
+    for (let l = this.firstLane; l < lastLane; l++) {
+      this.drawLabel(ctx, m.pids[l], y);
+
+      // Waiting span from arrival to completion
+      const a = Math.max(m.arrival[l], this.t0);
+      const c = Math.min(m.completion[l], this.t1);
+      if (c > a) {
+        ctx.fillStyle = "#eef1f6";
+        ctx.fillRect(x(a), y + 3, Math.max((c - a) * scale, 1), LANE_HEIGHT - 6);
+      }
+
+      const color = laneColor(l);
+      this.drawSlices(ctx, m.start, m.end, m.order,
+        m.laneOffset[l], m.laneOffset[l + 1], y, x, () => color);
+
+      y += LANE_HEIGHT;
+    }
+
+    if (this.playhead !== null) {
+      ctx.strokeStyle = "#e55353";
+      ctx.beginPath();
+      ctx.moveTo(x(this.playhead), AXIS_HEIGHT);
+      ctx.lineTo(x(this.playhead), height);
+      ctx.stroke();
+    }
+  }
+
+  drawSlices(ctx, start, end, order, lo, hi, y, x, colorOf) {
+    const at = k => (order ? order[k] : k);
+
+    // First slice ending after t0 (ends are non-decreasing per lane)
+    let a = lo, b = hi;
+    while (a < b) {
+      const mid = (a + b) >> 1;
+      if (end[at(mid)] <= this.t0) a = mid + 1; else b = mid;
+    }
+
+    // Slices narrower than a pixel collapse onto the last pixel drawn
+    let lastPixel = -1;
+
+    for (let k = a; k < hi; k++) {
+      const i = at(k);
+      if (start[i] >= this.t1) break;
+
+      const x0 = x(Math.max(start[i], this.t0));
+      const x1 = x(Math.min(end[i], this.t1));
+      if (x1 - x0 < 1 && Math.floor(x0) === lastPixel) continue;
+      lastPixel = Math.floor(x0);
+
+      ctx.fillStyle = colorOf(i);
+      ctx.fillRect(x0, y + 2, Math.max(x1 - x0, 1), LANE_HEIGHT - 4);
+    }
+  }
+
+  drawLabel(ctx, text, y) {
+    ctx.fillStyle = "#333";
+    ctx.font = "11px Segoe UI, Arial, sans-serif";
+    ctx.textBaseline = "middle";
+    ctx.fillText(String(text), 4, y + LANE_HEIGHT / 2, LABEL_WIDTH - 8);
+  }
+
+  drawAxis(ctx, width, scale, x) {
+    const span = this.t1 - this.t0;
+    const step = Math.pow(10, Math.floor(Math.log10(span / 8 || 1))) || 1;
+    const first = Math.ceil(this.t0 / step) * step;
+
+    ctx.fillStyle = "#666";
+    ctx.strokeStyle = "#e3e6ec";
+    ctx.font = "10px Segoe UI, Arial, sans-serif";
+    ctx.textBaseline = "top";
+
+    for (let t = first; t <= this.t1; t += step) {
+      const px = x(t);
+      ctx.beginPath();
+      ctx.moveTo(px, AXIS_HEIGHT - 4);
+      ctx.lineTo(px, this.canvas.clientHeight);
+      ctx.stroke();
+      ctx.fillText(String(+t.toFixed(3)), px + 2, 4);
+    }
+  }
+
+  /* ================= INTERACTION ================= */
+  onWheel(e) {
+    if (!this.model) return;
+    e.preventDefault();
+
+    if (e.ctrlKey || e.metaKey) {
+      const rect = this.canvas.getBoundingClientRect();
+      const plotWidth = rect.width - LABEL_WIDTH;
+      const frac = Math.min(Math.max((e.clientX - rect.left - LABEL_WIDTH) / plotWidth, 0), 1);
+      const at = this.t0 + frac * (this.t1 - this.t0);
+      const factor = e.deltaY > 0 ? 1.25 : 0.8;
+      const span = Math.max((this.t1 - this.t0) * factor, 1e-6);
+
+      this.t0 = at - frac * span;
+      this.t1 = this.t0 + span;
+    } else {
+      const lanes = this.model.pids.length;
+      this.firstLane = Math.min(
+        Math.max(this.firstLane + Math.sign(e.deltaY) * 3, 0),
+        Math.max(lanes - 1, 0)
+      );
+    }
+
+    this.requestDraw();
+  }
+
+  onDragStart(e) {
+    if (!this.model) return;
+
+    const startX = e.clientX;
+    const t0 = this.t0;
+    const t1 = this.t1;
+    const perPixel = (t1 - t0) / (this.canvas.clientWidth - LABEL_WIDTH);
+
+    const move = ev => {
+      const dt = (ev.clientX - startX) * perPixel;
+      this.t0 = t0 - dt;
+      this.t1 = t1 - dt;
+      this.requestDraw();
+    };
+    const up = () => {
+      window.removeEventListener("mousemove", move);
+      window.removeEventListener("mouseup", up);
+    };
+
+    window.addEventListener("mousemove", move);
+    window.addEventListener("mouseup", up);
+  }
+}
+
+function laneColor(l) {
+  return `hsl(${(l * 137.508) % 360}, 62%, 56%)`;
+}
@@ -0,0 +1,87 @@
+/* =====================================================
+   RESPONSE PARSER (WEB WORKER)
+   Parses a scheduler response off the main thread and
+   hands back flat typed arrays for the canvas renderer.
+===================================================== */
+const MAX_TABLE_ROWS = 500;
+
+self.onmessage = e => {
+  const data = JSON.parse(new TextDecoder().decode(e.data));
+
+  /* ================= LANES (ONE PER PID) ================= */
+  const laneIndex = new Map();
+  const pids = [];
+  const laneOf = pid => {
+    let l = laneIndex.get(pid);
+    if (l === undefined) {
+      l = pids.length;
+      laneIndex.set(pid, l);
+      pids.push(pid);
+    }
+    return l;
+  };
+
+  const processes = data.processes || [];
+  processes.forEach(p => laneOf(p.pid));
+
+  /* ================= GANTT SLICES ================= */
+  const gantt = data.gantt || [];
+  const n = gantt.length;
+  const start = new Float64Array(n);
+  const end = new Float64Array(n);
+  const lane = new Int32Array(n);       // -1 = IDLE
+
+  for (let i = 0; i < n; i++) {
+    const g = gantt[i];
+    start[i] = g.start;
+    end[i] = g.end;
+    lane[i] = g.pid === "IDLE" ? -1 : laneOf(g.pid);
+  }
+
+  /* ================= PER-LANE INDEX =================
+     Stable counting sort by lane, so each lane's slices
+     stay in time order and can be binary searched.   */
+  const lanes = pids.length;
+  const laneOffset = new Int32Array(lanes + 1);
+  for (let i = 0; i < n; i++) {
+    if (lane[i] >= 0) laneOffset[lane[i] + 1]++;
+  }
+  for (let l = 0; l < lanes; l++) laneOffset[l + 1] += laneOffset[l];
+
+  const order = new Int32Array(laneOffset[lanes]);
+  const fill = laneOffset.slice(0, lanes);
+  for (let i = 0; i < n; i++) {
+    if (lane[i] >= 0) order[fill[lane[i]]++] = i;
+  }
+
+  /* ================= PER-PROCESS METRICS ================= */
+  const arrival = new Float64Array(lanes);
+  const completion = new Float64Array(lanes);
+  let totalCpu = 0;
+
+  processes.forEach(p => {
+    const l = laneIndex.get(p.pid);
+    arrival[l] = p.arrival;
+    completion[l] = p.completion_time;
+    totalCpu += p.burst_time;
+  });
+
+  const system = data.system || { total_time: n ? end[n - 1] : 0, throughput: 0 };
+
+  self.postMessage({
+    pids,
+    start, end, lane,
+    order, laneOffset,
+    arrival, completion,
+    totalCpu,
+    totalTime: system.total_time,
+    average: data.average,
+    system,
+    processCount: processes.length,
+    rows: processes.slice(0, MAX_TABLE_ROWS)
+  }, [
+    start.buffer, end.buffer, lane.buffer,
+    order.buffer, laneOffset.buffer,
+    arrival.buffer, completion.buffer
+  ]);
+};
@@ -97,7 +97,7 @@ document.getElementById("runSchedulerBtn").onclick = () => {
     processes.push(process);
   });
 
-  fetch(apiMap[algorithm], {
+  const request = fetch(apiMap[algorithm], {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
@@ -109,7 +109,21 @@ document.getElementById("runSchedulerBtn").onclick = () => {
       ) || 0,
       processes
     })
-  })
+  });
+
+  if (useCanvasRenderer(processes.length)) {
+    request
+      .then(res => res.arrayBuffer())
+      .then(parseInWorker)
+      .then(showCanvasSchedule)
+      .catch(err => console.error("Scheduler Error:", err));
+    return;
+  }
+
+  document.getElementById("canvasCard").style.display = "none";
+  canvasActive = false;
+
+  request
   .then(res => res.json())
   .then(data => {
 
@@ -238,9 +252,83 @@ document.getElementById("runSchedulerBtn").onclick = () => {
 
 
 
+/* =====================================================
+   CANVAS RENDERER (LARGE WORKLOADS)
+   Above LARGE_WORKLOAD processes the response is parsed
+   in a Web Worker and drawn on a canvas instead of
+   ApexCharts and one DOM node per process.
+===================================================== */
+const LARGE_WORKLOAD = 200;
+const scheduleCanvas = document.getElementById("scheduleCanvas");
+const canvasRenderer = new CanvasScheduleRenderer(scheduleCanvas);
+let parseWorker = null;
+let canvasActive = false;
+
+function useCanvasRenderer(processCount) {
+  const mode = document.getElementById("renderModeSelect").value;
+  return mode === "canvas" || (mode === "auto" && processCount > LARGE_WORKLOAD);
+}
+
+function parseInWorker(buffer) {
+  if (!parseWorker) parseWorker = new Worker(scheduleCanvas.dataset.worker);
+
+  return new Promise((resolve, reject) => {
+    parseWorker.onmessage = e => resolve(e.data);
+    parseWorker.onerror = reject;
+    parseWorker.postMessage(buffer, [buffer]);
+  });
+}
+
+function showCanvasSchedule(model) {
+  /* ================= METRICS TABLE (FIRST ROWS ONLY) ================= */
+  const metricsTbody = document.querySelector(".col.card table tbody");
+  const rows = document.createDocumentFragment();
+
+  model.rows.forEach(p => {
+    const tr = document.createElement("tr");
+    [p.pid, p.arrival, p.burst_time, p.completion_time, p.tat, p.wt, p.rt]
+      .forEach(v => {
+        const td = document.createElement("td");
+        td.textContent = v;
+        tr.appendChild(td);
+      });
+    rows.appendChild(tr);
+  });
+
+  metricsTbody.replaceChildren(rows);
+
+  /* ================= METRICS BOXES ================= */
+  const metricBoxes = document.querySelectorAll(".metrics-box");
+
+  metricBoxes[0].innerText = `Avg TAT: ${model.average.tat.toFixed(2)}`;
+  metricBoxes[1].innerText = `Avg WT: ${model.average.wt.toFixed(2)}`;
+  metricBoxes[2].innerText = `Avg RT: ${model.average.rt.toFixed(2)}`;
+  metricBoxes[3].innerText =
+    `CPU Utilization: ${((model.totalCpu / model.totalTime) * 100).toFixed(2)}%`;
+  metricBoxes[4].innerText =
+    `Throughput: ${model.system.throughput.toFixed(2)}`;
+  metricBoxes[5].innerText =
+    `Total Time: ${model.totalTime}`;
+
+  /* ================= CANVAS ================= */
+  if (ganttChart) ganttChart.destroy();
+  if (timelineChart) timelineChart.destroy();
+  ganttChart = timelineChart = null;
+
+  document.getElementById("canvasCard").style.display = "block";
+  canvasActive = true;
+  canvasRenderer.load(model);
+}
+
+
 function visualization() {
   const algorithm = document.getElementById("algorithmSelect").value;
 
+  if (canvasActive) {
+    canvasRenderer.play();
+    return;
+  }
+
   if (algorithm === "FCFS") {
     fcfs_visualization();
   } else if (algorithm === "SJF") {